@@ -0,0 +1,194 @@
+"""Offline throughput benchmark for ``PromptEvolutionEngine``.
+
+Drives the real engine, agents and ``PitchWriterDeps.search`` against the
+local stand-ins in ``benchmarks.fakes`` and reports generations/sec, calls
+per generation, p50/p95 latency per stage and peak memory for a grid of
+population sizes and generation counts.
+
+Usage::
+
+    python -m benchmarks.bench_engine --out benchmarks/results/HEAD.json
+    python -m benchmarks.bench_engine --compare benchmarks/results/base.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import copy
+import io
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from benchmarks.fakes import (  # noqa: E402
+    FakeSearchBackend,
+    LatencyModel,
+    StageStats,
+    judge_model,
+    mutator_model,
+    writer_model,
+)
+from pitch_evolve.agents.llm_as_judge import get_judge_agent, llm_as_judge_async  # noqa: E402
+from pitch_evolve.agents.llm_as_judge_mutator import (  # noqa: E402
+    get_mutator_agent,
+    llm_as_judge_mutator_async,
+)
+from pitch_evolve.agents.pitch_writer import PitchWriterDeps, get_pitch_writer_agent  # noqa: E402
+from pitch_evolve.agents.scheduler import ModelLimits, RequestScheduler, configure_scheduler  # noqa: E402
+from pitch_evolve.evolution import PromptEvolutionEngine  # noqa: E402
+from pitch_evolve.tools.search_cache import configure_search_cache  # noqa: E402
+from pitch_evolve.tools.web_search import set_async_search_client  # noqa: E402
+
+STAGES = ("generate", "evaluate", "mutate", "search",
+          "writer_request", "judge_request", "mutator_request")
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def timed(stats: StageStats, stage: str, fn):
+    async def wrapper(*args):
+        start = time.perf_counter()
+        try:
+            return await fn(*args)
+        finally:
+            stats.record(stage, time.perf_counter() - start)
+    return wrapper
+
+
+async def run_case(population: int, generations: int, concurrency: int,
+                   latency: float, seed: int) -> Dict[str, Any]:
+    stats = StageStats()
+    configure_search_cache()
+    configure_scheduler(RequestScheduler(default_limits=ModelLimits(
+        rpm=None, tpm=None, initial_concurrency=concurrency,
+        max_concurrency=concurrency)))
+    set_async_search_client(FakeSearchBackend(LatencyModel(latency, seed=seed + 3), stats))
+
+    writer = get_pitch_writer_agent()
+    deps = PitchWriterDeps()
+
+    async def generate(prompt: str) -> str:
+        result = await writer.run(prompt, deps=copy.deepcopy(deps))
+        return result.output.output
+
+    engine = PromptEvolutionEngine(
+        population=[f"Write a pitch for the Go community ({seed})."] * population,
+        generator=lambda p: p,
+        async_generator=timed(stats, "generate", generate),
+        async_evaluator=timed(stats, "evaluate", llm_as_judge_async),
+        async_mutator=timed(stats, "mutate", llm_as_judge_mutator_async),
+        concurrency=concurrency,
+        rng=random.Random(seed),
+    )
+    with tempfile.TemporaryDirectory() as output_dir, \
+            writer.override(model=writer_model(LatencyModel(latency, seed=seed), stats)), \
+            get_judge_agent().override(model=judge_model(LatencyModel(latency, seed=seed + 1), stats)), \
+            get_mutator_agent().override(model=mutator_model(LatencyModel(latency, seed=seed + 2), stats)), \
+            contextlib.redirect_stdout(io.StringIO()):
+        engine.output_dir = output_dir
+        tracemalloc.start()
+        start = time.perf_counter()
+        await engine.evolve_async(generations=generations)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    set_async_search_client(None)
+
+    return {
+        "population": population,
+        "generations": generations,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 4),
+        "generations_per_s": round(generations / elapsed, 4),
+        "peak_memory_mb": round(peak / 2**20, 3),
+        "final_score": round(engine.score_history[-1], 3),
+        "calls_per_generation": {
+            stage: round(stats.calls(stage) / generations, 2) for stage in STAGES
+        },
+        "latency_ms": {
+            stage: {
+                "p50": round(1000 * percentile(stats.latencies[stage], 0.50), 2),
+                "p95": round(1000 * percentile(stats.latencies[stage], 0.95), 2),
+            }
+            for stage in STAGES if stats.latencies[stage]
+        },
+    }
+
+
+def environment() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {"commit": commit, "python": sys.version.split()[0],
+            "platform": platform.platform()}
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Print the throughput change per case against a stored baseline."""
+    previous = {(c["population"], c["generations"]): c for c in baseline["cases"]}
+    print(f"{'pop':>4} {'gens':>5} {'base gen/s':>11} {'now gen/s':>10} {'change':>8}")
+    for case in current["cases"]:
+        old = previous.get((case["population"], case["generations"]))
+        if old is None:
+            continue
+        change = case["generations_per_s"] / old["generations_per_s"] - 1
+        print(f"{case['population']:>4} {case['generations']:>5} "
+              f"{old['generations_per_s']:>11.3f} {case['generations_per_s']:>10.3f} "
+              f"{change:>+8.1%}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--populations", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--generations", type=int, nargs="+", default=[2, 4])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.02,
+                        help="Median fake model/search latency in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="Write results JSON to this path")
+    parser.add_argument("--compare", help="Baseline results JSON to compare against")
+    args = parser.parse_args()
+
+    logging.getLogger("web_discovery").setLevel(logging.WARNING)
+    cases = []
+    for population in args.populations:
+        for generations in args.generations:
+            case = asyncio.run(run_case(population, generations, args.concurrency,
+                                        args.latency, args.seed))
+            cases.append(case)
+            print(f"pop={population:<3} gens={generations:<3} "
+                  f"{case['generations_per_s']:.3f} gen/s  "
+                  f"peak={case['peak_memory_mb']:.1f}MB  "
+                  f"calls/gen={case['calls_per_generation']}")
+
+    results = {"environment": environment(), "config": vars(args), "cases": cases}
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
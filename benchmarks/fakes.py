@@ -0,0 +1,158 @@
+"""Deterministic local stand-ins for the OpenAI models and Tavily search.
+
+Outputs depend only on the request content, so runs are reproducible;
+latencies are drawn from seeded log-normal distributions so throughput
+numbers reflect realistic overlap without touching the network.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelResponse,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from pitch_evolve.agents.scheduled_model import ScheduledModel
+
+
+def _digest(text: str) -> int:
+    return int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+
+
+@dataclass
+class LatencyModel:
+    """Log-normal latency with a given median (seconds) and spread."""
+
+    median: float = 0.05
+    sigma: float = 0.3
+    seed: int = 0
+    _rng: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._rng = random.Random(self.seed)
+
+    def sample(self) -> float:
+        return self.median * self._rng.lognormvariate(0.0, self.sigma)
+
+
+class StageStats:
+    """Call counts and latencies recorded per stage."""
+
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+
+    def record(self, stage: str, seconds: float) -> None:
+        self.latencies[stage].append(seconds)
+
+    def calls(self, stage: str) -> int:
+        return len(self.latencies[stage])
+
+
+def _user_prompt(messages: List[ModelMessage]) -> str:
+    for message in messages:
+        for part in message.parts:
+            if isinstance(part, UserPromptPart) and isinstance(part.content, str):
+                return part.content
+    return ""
+
+
+def _tool_returns(messages: List[ModelMessage]) -> int:
+    return sum(isinstance(p, ToolReturnPart) for m in messages for p in m.parts)
+
+
+def _final(info: AgentInfo, args: Dict[str, Any]) -> ModelResponse:
+    if info.output_tools:
+        return ModelResponse(parts=[ToolCallPart(info.output_tools[0].name, args)])
+    return ModelResponse(parts=[TextPart(json.dumps(args))])
+
+
+def writer_model(latency: LatencyModel, stats: StageStats, searches: int = 2) -> ScheduledModel:
+    """Pitch writer that issues ``searches`` tool calls and then answers."""
+
+    async def fake_writer(messages: List[ModelMessage], info: AgentInfo) -> ModelResponse:
+        start = time.perf_counter()
+        await asyncio.sleep(latency.sample())
+        prompt = _user_prompt(messages)
+        done = _tool_returns(messages)
+        stats.record("writer_request", time.perf_counter() - start)
+        if done < searches:
+            return ModelResponse(parts=[ToolCallPart("search", {
+                "query": f"{prompt[:40]} statistics {done}", "recency": "m",
+                "max_results": 3,
+            })])
+        seed = _digest(prompt)
+        words = " ".join(f"w{(seed >> i) % 97}" for i in range(40 + seed % 80))
+        return _final(info, {"topic": prompt[:30], "output": words, "sources": {}})
+
+    return ScheduledModel(FunctionModel(fake_writer), name="writer")
+
+
+def judge_model(latency: LatencyModel, stats: StageStats) -> ScheduledModel:
+    """Judge whose scores are a deterministic function of the pitch."""
+
+    async def fake_judge(messages: List[ModelMessage], info: AgentInfo) -> ModelResponse:
+        start = time.perf_counter()
+        await asyncio.sleep(latency.sample())
+        seed = _digest(_user_prompt(messages))
+        dims = ["creativity", "persuasiveness", "clarity",
+                "statistical_grounding", "thematic_relevance", "flow"]
+        scores = {d: 40 + (seed >> (3 * i)) % 60 for i, d in enumerate(dims)}
+        stats.record("judge_request", time.perf_counter() - start)
+        return _final(info, {"scores": scores})
+
+    return ScheduledModel(FunctionModel(fake_judge), name="judge")
+
+
+def mutator_model(latency: LatencyModel, stats: StageStats) -> ScheduledModel:
+    """Mutator that appends a deterministic instruction to the prompt."""
+
+    async def fake_mutator(messages: List[ModelMessage], info: AgentInfo) -> ModelResponse:
+        start = time.perf_counter()
+        await asyncio.sleep(latency.sample())
+        payload = _user_prompt(messages)
+        prompt = payload.split("### ORIGINAL PROMPT\n", 1)[-1].split("\n\n###", 1)[0]
+        stats.record("mutator_request", time.perf_counter() - start)
+        return _final(info, {"prompt": f"{prompt} Add detail {_digest(payload) % 1000}."})
+
+    return ScheduledModel(FunctionModel(fake_mutator), name="mutator")
+
+
+class FakeSearchBackend:
+    """Async Tavily stand-in returning deterministic multi-paragraph pages."""
+
+    def __init__(self, latency: LatencyModel, stats: StageStats) -> None:
+        self.latency = latency
+        self.stats = stats
+
+    async def search(self, query: str, *, max_results: int, time_range: str,
+                     include_raw_content: bool = True) -> Dict[str, Any]:
+        start = time.perf_counter()
+        await asyncio.sleep(self.latency.sample())
+        seed = _digest(query)
+        results = []
+        for i in range(max_results):
+            paragraphs = [
+                f"Paragraph {j} about {query} reports {(seed + i * j) % 1000} users."
+                for j in range(60)
+            ]
+            results.append({
+                "title": f"{query} #{i}",
+                "content": paragraphs[0],
+                "raw_content": "\n\n".join(paragraphs),
+                "url": f"https://example.com/{seed % 10000}/{i}",
+            })
+        self.stats.record("search", time.perf_counter() - start)
+        return {"results": results}
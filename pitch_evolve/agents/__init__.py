@@ -1,10 +1,23 @@
-from .pitch_writer import pitch_writer_agent, PitchWriterDeps, PitchWriterOutput
-from .llm_as_judge import llm_as_judge, JudgeDeps
-
-__all__ = [
-    "pitch_writer_agent",
-    "PitchWriterDeps",
-    "PitchWriterOutput",
-    "llm_as_judge",
-    "JudgeDeps",
-]
+"""Pitch writer, judge and mutator agents (built lazily on first use)."""
+
+import importlib
+
+_EXPORTS = {
+    "pitch_writer_agent": "pitch_evolve.agents.pitch_writer",
+    "PitchWriterDeps": "pitch_evolve.agents.pitch_writer",
+    "PitchWriterOutput": "pitch_evolve.agents.pitch_writer",
+    "llm_as_judge": "pitch_evolve.agents.llm_as_judge",
+    "JudgeDeps": "pitch_evolve.agents.llm_as_judge",
+    "llm_as_batch_judge": "pitch_evolve.agents.llm_as_judge",
+    "BatchJudgement": "pitch_evolve.agents.llm_as_judge",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(name)
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
-from typing import Optional
+import asyncio
+import functools
+from typing import TYPE_CHECKING, Any, List, Optional
 
 from pydantic import BaseModel, Field
-from pydantic_ai import Agent
+
+from pitch_evolve.agents.scheduler import PRIORITY_JUDGE, priority
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pydantic_ai import Agent
 
 
 class JudgeDeps(BaseModel):
@@ -43,20 +49,168 @@ class JudgeFeedback(BaseModel):
     scores: Optional[PitchScores] = None
 
 
-_judge_agent = Agent[JudgeDeps, JudgeFeedback](
-    "openai:gpt-4.1",
-    deps_type=JudgeDeps,
-    output_type=JudgeFeedback,
-    instructions=(
-        "You evaluate community pitches."
-        "Evaluate the pitch, providing a score from 0-100 for each of the items."
-        "Be critical and objective.  Do not just hand out high scores."
-    ),
-    model_settings={"temperature": 0.1},
-)
+class BatchPitchScores(BaseModel):
+    """Scores for one pitch of a batch, identified by its index."""
+
+    index: int = Field(..., description="0-based index of the pitch in the batch")
+    scores: PitchScores
+
+
+class BatchJudgeOutput(BaseModel):
+    """Agent output for a batch of pitches judged side by side."""
+
+    evaluations: List[BatchPitchScores] = Field(
+        ..., description="scores for every pitch in the batch")
+    ranking: List[int] = Field(
+        ..., description="pitch indices ordered from best to worst")
+
+
+class BatchJudgement(BaseModel):
+    """One ``JudgeFeedback`` per pitch (in input order) and a best-first ranking."""
+
+    feedback: List[JudgeFeedback]
+    ranking: List[int]
+
+
+@functools.lru_cache(maxsize=None)
+def get_judge_agent() -> "Agent[JudgeDeps, JudgeFeedback]":
+    """Build the judge agent on first use so importing this module stays cheap."""
+    from pydantic_ai import Agent
+
+    from pitch_evolve.agents.scheduled_model import ScheduledModel
+
+    return Agent[JudgeDeps, JudgeFeedback](
+        ScheduledModel("openai:gpt-4.1", name="judge"),
+        deps_type=JudgeDeps,
+        output_type=JudgeFeedback,
+        instructions=(
+            "You evaluate community pitches."
+            "Evaluate the pitch, providing a score from 0-100 for each of the items."
+            "Be critical and objective.  Do not just hand out high scores."
+        ),
+        model_settings={"temperature": 0.1},
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_batch_judge_agent() -> "Agent[JudgeDeps, BatchJudgeOutput]":
+    """Build the comparative (batched) judge agent on first use."""
+    from pydantic_ai import Agent
+
+    from pitch_evolve.agents.scheduled_model import ScheduledModel
+
+    return Agent[JudgeDeps, BatchJudgeOutput](
+        ScheduledModel("openai:gpt-4.1", name="judge"),
+        deps_type=JudgeDeps,
+        output_type=BatchJudgeOutput,
+        instructions=(
+            "You evaluate community pitches side by side. "
+            "You will receive several pitches, each under a '### PITCH <index>' heading. "
+            "Score every pitch from 0-100 on each of the items, using the other "
+            "pitches as reference points so the scores are consistent with each other, "
+            "then rank all pitches from best to worst by index. "
+            "Be critical and objective.  Do not just hand out high scores."
+        ),
+        model_settings={"temperature": 0.1},
+    )
+
+
+def __getattr__(name: str) -> Any:
+    if name == "_judge_agent":
+        return get_judge_agent()
+    raise AttributeError(name)
+
+
+def llm_as_judge(pitch: str, model: Optional[Any] = None) -> JudgeFeedback:
+    """Evaluate ``text`` using ``evaluation_prompt`` via the LLM judge agent.
+
+    ``model`` optionally swaps in a different (e.g. cheaper) judge model.
+    """
+
+    with priority(PRIORITY_JUDGE):
+        return get_judge_agent().run_sync(pitch, deps=JudgeDeps(), model=model)
+
+
+async def llm_as_judge_async(pitch: str, model: Optional[Any] = None) -> JudgeFeedback:
+    """Async counterpart of :func:`llm_as_judge` built on ``Agent.run``."""
+
+    with priority(PRIORITY_JUDGE):
+        return await get_judge_agent().run(pitch, deps=JudgeDeps(), model=model)
+
+
+def _batch_payload(pitches: List[str]) -> str:
+    return "\n\n".join(
+        f"### PITCH {index}\n{pitch}" for index, pitch in enumerate(pitches))
+
+
+def _judgement(output: BatchJudgeOutput, size: int) -> BatchJudgement:
+    """Map agent output back onto input order, tolerating gaps and bad indices.
+
+    Pitches the model did not score get empty feedback (scored 0 by the
+    engine), and are ranked after the ones it did.
+    """
+    scores = {e.index: e.scores for e in output.evaluations if 0 <= e.index < size}
+    ranking = list(dict.fromkeys(i for i in output.ranking if 0 <= i < size))
+    ranking += [i for i in range(size) if i not in ranking]
+    ranking.sort(key=lambda i: i not in scores)
+    return BatchJudgement(
+        feedback=[JudgeFeedback(scores=scores.get(i)) for i in range(size)],
+        ranking=ranking,
+    )
+
+
+def _merge(parts: List[BatchJudgement]) -> BatchJudgement:
+    """Concatenate per-batch judgements into one over all pitches.
+
+    Rankings from different batches are not directly comparable, so the
+    merged ranking orders pitches by average score and falls back to the
+    within-batch rank for ties.
+    """
+    feedback: List[JudgeFeedback] = []
+    order = {}
+    for part in parts:
+        offset = len(feedback)
+        for rank, index in enumerate(part.ranking):
+            order[offset + index] = rank
+        feedback.extend(part.feedback)
+
+    def key(i: int) -> Any:
+        scores = feedback[i].scores
+        return (-(scores.average() if scores else -1.0), order[i])
+
+    return BatchJudgement(feedback=feedback,
+                          ranking=sorted(range(len(feedback)), key=key))
+
+
+def _chunks(pitches: List[str], batch_size: Optional[int]) -> List[List[str]]:
+    size = batch_size or len(pitches) or 1
+    return [pitches[i:i + size] for i in range(0, len(pitches), size)]
+
+
+def llm_as_batch_judge(pitches: List[str],
+                       batch_size: Optional[int] = None) -> BatchJudgement:
+    """Judge ``pitches`` comparatively, ``batch_size`` pitches per request.
+
+    With ``batch_size`` unset all pitches go into a single request.
+    """
+    parts = []
+    for chunk in _chunks(pitches, batch_size):
+        with priority(PRIORITY_JUDGE):
+            result = get_batch_judge_agent().run_sync(
+                _batch_payload(chunk), deps=JudgeDeps())
+        parts.append(_judgement(result.output, len(chunk)))
+    return parts[0] if len(parts) == 1 else _merge(parts)
+
 
+async def llm_as_batch_judge_async(pitches: List[str],
+                                   batch_size: Optional[int] = None) -> BatchJudgement:
+    """Async counterpart of :func:`llm_as_batch_judge`; batches run concurrently."""
 
-def llm_as_judge(pitch: str) -> JudgeFeedback:
-    """Evaluate ``text`` using ``evaluation_prompt`` via the LLM judge agent."""
+    async def judge(chunk: List[str]) -> BatchJudgement:
+        with priority(PRIORITY_JUDGE):
+            result = await get_batch_judge_agent().run(
+                _batch_payload(chunk), deps=JudgeDeps())
+        return _judgement(result.output, len(chunk))
 
-    return _judge_agent.run_sync(pitch, deps=JudgeDeps())
+    parts = await asyncio.gather(*(judge(c) for c in _chunks(pitches, batch_size)))
+    return parts[0] if len(parts) == 1 else _merge(list(parts))
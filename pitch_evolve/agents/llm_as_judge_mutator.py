@@ -1,11 +1,15 @@
 from __future__ import annotations
 
-from typing import Optional
+import functools
+from typing import TYPE_CHECKING, Any, List, Optional, Tuple
 
 from pydantic import BaseModel, Field
-from pydantic_ai import Agent
 
 from pitch_evolve.agents.llm_as_judge import JudgeFeedback, PitchScores
+from pitch_evolve.agents.scheduler import PRIORITY_MUTATE, priority
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pydantic_ai import Agent
 
 
 class MutatorDeps(BaseModel):
@@ -17,35 +21,167 @@ class MutatedPrompt(BaseModel):
     prompt: str = Field(..., description="A rewritten prompt ready for reuse")
 
 
-_mutator_agent = Agent[MutatorDeps, MutatedPrompt](
-    "openai:gpt-4.1",
-    deps_type=MutatorDeps,
-    output_type=MutatedPrompt,
-    model_settings={
-        "temperature": 0.8,
-        "top_p": 0.9,
-        "presence_penalty": 0.4,
-    },
-    instructions=(
-        "You are an expert prompt-engineer.\n"
-        "Your goal: improve the **prompt** that generated a community-pitch so "
-        "future pitches score higher under the across dimensions: creativity, "
-        "persuasiveness, clarity, statistical grounding, thematic relevanc, flow.\n\n"
-        "You will receive:\n"
-        "1. The current prompt text.\n"
-        "2. The pitch that prompt produced.\n"
-        "3. Structured judge feedback:\n"
-        "   • per-dimension 0-100 scores\n"
-        "Guidelines:\n"
-        "• Analyse the feedback and identify concrete weaknesses across each of the dimensions.\n"
-        "• Rewrite or extend the *prompt* so it explicitly nudges the generator "
-        "to fix those weaknesses (e.g. ask for a statistic, demand a stronger "
-        "call-to-action, or whatever you feel will increase the overall score across dimensions for the next round).\n"
-        "• Preserve any good parts of the original prompt and all explicit requirements; do **not** rewrite the pitch itself.\n\n"
-        "Return ONLY the NEW PROMPT in the `prompt` field of the JSON schema."
-    ),
+class MutatedPrompts(BaseModel):
+    """Agent output: several distinct child prompts from one request."""
+    prompts: List[str] = Field(
+        ..., description="Rewritten prompts, each taking a different approach")
+
+
+# (feedback, pitch, prompt) of one parent, as passed to the mutator.
+Parent = Tuple[JudgeFeedback, str, str]
+
+_MODEL_SETTINGS = {
+    "temperature": 0.8,
+    "top_p": 0.9,
+    "presence_penalty": 0.4,
+}
+
+_OFFSPRING_INSTRUCTIONS = (
+    "You are an expert prompt-engineer.\n"
+    "Your goal: write several improved variants of the **prompt** that generated "
+    "a community-pitch so future pitches score higher on creativity, "
+    "persuasiveness, clarity, statistical grounding, thematic relevance and flow.\n\n"
+    "You will receive the current prompt, the pitch it produced, the judge "
+    "feedback and the number of variants to write.\n"
+    "Guidelines:\n"
+    "• Make every variant attack the weaknesses in the feedback differently "
+    "(e.g. one adds a statistic requirement, another a sharper call-to-action, "
+    "another restructures the pitch) so the variants are genuinely diverse.\n"
+    "• Preserve any good parts of the original prompt and all explicit requirements; "
+    "do **not** rewrite the pitch itself.\n\n"
+    "Return exactly the requested number of NEW PROMPTS in the `prompts` field."
+)
+
+_CROSSOVER_INSTRUCTIONS = (
+    "You are an expert prompt-engineer.\n"
+    "You will receive two parent prompts, the pitch each produced and the judge "
+    "feedback for each pitch, followed by the number of child prompts to write.\n"
+    "Guidelines:\n"
+    "• Use the per-dimension scores to identify which instructions of each parent "
+    "made its pitch strong.\n"
+    "• Write child prompts that combine the strongest instructions of both parents "
+    "into one coherent prompt, dropping instructions that the feedback suggests hurt.\n"
+    "• Vary how the children combine the parents so they are not near-duplicates.\n\n"
+    "Return exactly the requested number of NEW PROMPTS in the `prompts` field."
 )
 
+_COMPACTION_INSTRUCTIONS = (
+    "You are an expert prompt-engineer.\n"
+    "Your goal: make the **prompt** that generated a community-pitch as short as "
+    "possible without lowering the score of the pitches it produces.\n\n"
+    "You will receive the current prompt, the pitch it produced and the judge "
+    "feedback.\n"
+    "Guidelines:\n"
+    "• Keep every explicit requirement and every instruction the per-dimension "
+    "scores suggest is helping.\n"
+    "• Remove repetition, filler, hedging and instructions the feedback shows have "
+    "no effect; merge overlapping instructions into one.\n"
+    "• Never make the prompt longer.\n\n"
+    "Return ONLY the SHORTER PROMPT in the `prompt` field of the JSON schema."
+)
+
+
+@functools.lru_cache(maxsize=None)
+def get_mutator_agent() -> "Agent[MutatorDeps, MutatedPrompt]":
+    """Build the mutator agent on first use so importing this module stays cheap."""
+    from pydantic_ai import Agent
+
+    from pitch_evolve.agents.scheduled_model import ScheduledModel
+
+    return Agent[MutatorDeps, MutatedPrompt](
+        ScheduledModel("openai:gpt-4.1", name="mutator"),
+        deps_type=MutatorDeps,
+        output_type=MutatedPrompt,
+        model_settings=_MODEL_SETTINGS,
+        instructions=(
+            "You are an expert prompt-engineer.\n"
+            "Your goal: improve the **prompt** that generated a community-pitch so "
+            "future pitches score higher under the across dimensions: creativity, "
+            "persuasiveness, clarity, statistical grounding, thematic relevanc, flow.\n\n"
+            "You will receive:\n"
+            "1. The current prompt text.\n"
+            "2. The pitch that prompt produced.\n"
+            "3. Structured judge feedback:\n"
+            "   • per-dimension 0-100 scores\n"
+            "Guidelines:\n"
+            "• Analyse the feedback and identify concrete weaknesses across each of the dimensions.\n"
+            "• Rewrite or extend the *prompt* so it explicitly nudges the generator "
+            "to fix those weaknesses (e.g. ask for a statistic, demand a stronger "
+            "call-to-action, or whatever you feel will increase the overall score across dimensions for the next round).\n"
+            "• Preserve any good parts of the original prompt and all explicit requirements; do **not** rewrite the pitch itself.\n\n"
+            "Return ONLY the NEW PROMPT in the `prompt` field of the JSON schema."
+        ),
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_offspring_agent() -> "Agent[MutatorDeps, MutatedPrompts]":
+    """Build the multi-offspring mutator agent on first use."""
+    from pydantic_ai import Agent
+
+    from pitch_evolve.agents.scheduled_model import ScheduledModel
+
+    return Agent[MutatorDeps, MutatedPrompts](
+        ScheduledModel("openai:gpt-4.1", name="mutator"),
+        deps_type=MutatorDeps,
+        output_type=MutatedPrompts,
+        model_settings=_MODEL_SETTINGS,
+        instructions=_OFFSPRING_INSTRUCTIONS,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_crossover_agent() -> "Agent[MutatorDeps, MutatedPrompts]":
+    """Build the crossover agent on first use."""
+    from pydantic_ai import Agent
+
+    from pitch_evolve.agents.scheduled_model import ScheduledModel
+
+    return Agent[MutatorDeps, MutatedPrompts](
+        ScheduledModel("openai:gpt-4.1", name="mutator"),
+        deps_type=MutatorDeps,
+        output_type=MutatedPrompts,
+        model_settings=_MODEL_SETTINGS,
+        instructions=_CROSSOVER_INSTRUCTIONS,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_compaction_agent() -> "Agent[MutatorDeps, MutatedPrompt]":
+    """Build the prompt-compaction agent on first use."""
+    from pydantic_ai import Agent
+
+    from pitch_evolve.agents.scheduled_model import ScheduledModel
+
+    return Agent[MutatorDeps, MutatedPrompt](
+        ScheduledModel("openai:gpt-4.1", name="mutator"),
+        deps_type=MutatorDeps,
+        output_type=MutatedPrompt,
+        model_settings={"temperature": 0.3},
+        instructions=_COMPACTION_INSTRUCTIONS,
+    )
+
+
+def __getattr__(name: str) -> Any:
+    if name == "_mutator_agent":
+        return get_mutator_agent()
+    raise AttributeError(name)
+
+
+def _build_payload(feedback: JudgeFeedback, pitch: str, prompt: str) -> str:
+    """Render the mutator request for ``prompt``, its ``pitch`` and ``feedback``."""
+
+    # Build a single string payload; you could switch to structured
+    # function-calling if your infra supports it.
+    return (
+        "### ORIGINAL PROMPT\n"
+        f"{prompt}\n\n"
+        "### PITCH PRODUCED BY THE PROMPT\n"
+        f"{pitch}\n\n"
+        "### JUDGE FEEDBACK (JSON)\n"
+        f"{feedback.model_dump_json(indent=2)}"
+    )
+
 
 def llm_as_judge_mutator(
     feedback: JudgeFeedback,
@@ -61,16 +197,122 @@ def llm_as_judge_mutator(
         The improved prompt text to be used in the next generation.
     """
 
-    # Build a single string payload; you could switch to structured
-    # function-calling if your infra supports it.
-    payload = (
-        "### ORIGINAL PROMPT\n"
-        f"{prompt}\n\n"
-        "### PITCH PRODUCED BY THE PROMPT\n"
-        f"{pitch}\n\n"
-        "### JUDGE FEEDBACK (JSON)\n"
-        f"{feedback.model_dump_json(indent=2)}"
-    )
+    payload = _build_payload(feedback, pitch, prompt)
+    with priority(PRIORITY_MUTATE):
+        mutated = get_mutator_agent().run_sync(payload, deps=MutatorDeps())
+    return mutated.output.prompt
+
 
-    mutated = _mutator_agent.run_sync(payload, deps=MutatorDeps())
+async def llm_as_judge_mutator_async(
+    feedback: JudgeFeedback,
+    pitch: str,
+    prompt: str,
+) -> str:
+    """Async counterpart of :func:`llm_as_judge_mutator` built on ``Agent.run``."""
+
+    payload = _build_payload(feedback, pitch, prompt)
+    with priority(PRIORITY_MUTATE):
+        mutated = await get_mutator_agent().run(payload, deps=MutatorDeps())
     return mutated.output.prompt
+
+
+def _build_crossover_payload(parents: List[Parent], k: int) -> str:
+    """Render a crossover request for two (or more) ``parents``."""
+    sections = []
+    for label, (feedback, pitch, prompt) in zip("ABCDEFGH", parents):
+        sections.append(
+            f"### PARENT {label} PROMPT\n{prompt}\n\n"
+            f"### PARENT {label} PITCH\n{pitch}\n\n"
+            f"### PARENT {label} JUDGE FEEDBACK (JSON)\n"
+            f"{feedback.model_dump_json(indent=2)}"
+        )
+    return "\n\n".join(sections) + f"\n\n### NUMBER OF CHILD PROMPTS\n{k}"
+
+
+def fit_offspring(prompts: List[str], k: int) -> List[str]:
+    """Return at most ``k`` distinct, non-empty prompts from a model answer.
+
+    Short answers are not padded: the engine fills the missing children
+    with single mutations of the parent instead of duplicates.
+    """
+    return list(dict.fromkeys(p for p in prompts if p and p.strip()))[:k]
+
+
+def llm_as_judge_offspring(
+    feedback: JudgeFeedback,
+    pitch: str,
+    prompt: str,
+    k: int,
+) -> List[str]:
+    """Return up to ``k`` diverse mutations of ``prompt`` from a single request."""
+
+    payload = _build_payload(feedback, pitch, prompt) + \
+        f"\n\n### NUMBER OF PROMPTS\n{k}"
+    with priority(PRIORITY_MUTATE):
+        result = get_offspring_agent().run_sync(payload, deps=MutatorDeps())
+    return fit_offspring(result.output.prompts, k)
+
+
+async def llm_as_judge_offspring_async(
+    feedback: JudgeFeedback,
+    pitch: str,
+    prompt: str,
+    k: int,
+) -> List[str]:
+    """Async counterpart of :func:`llm_as_judge_offspring`."""
+
+    payload = _build_payload(feedback, pitch, prompt) + \
+        f"\n\n### NUMBER OF PROMPTS\n{k}"
+    with priority(PRIORITY_MUTATE):
+        result = await get_offspring_agent().run(payload, deps=MutatorDeps())
+    return fit_offspring(result.output.prompts, k)
+
+
+def llm_as_crossover(parents: List[Parent], k: int = 1) -> List[str]:
+    """Merge the strongest instructions of ``parents`` into up to ``k`` child prompts."""
+
+    payload = _build_crossover_payload(parents, k)
+    with priority(PRIORITY_MUTATE):
+        result = get_crossover_agent().run_sync(payload, deps=MutatorDeps())
+    return fit_offspring(result.output.prompts, k)
+
+
+async def llm_as_crossover_async(parents: List[Parent], k: int = 1) -> List[str]:
+    """Async counterpart of :func:`llm_as_crossover`."""
+
+    payload = _build_crossover_payload(parents, k)
+    with priority(PRIORITY_MUTATE):
+        result = await get_crossover_agent().run(payload, deps=MutatorDeps())
+    return fit_offspring(result.output.prompts, k)
+
+
+def _shorter(candidate: str, prompt: str) -> str:
+    """``candidate`` if it is a non-empty, shorter rewrite, else ``prompt``."""
+    candidate = (candidate or "").strip()
+    return candidate if candidate and len(candidate) < len(prompt) else prompt
+
+
+def llm_as_prompt_compactor(
+    feedback: JudgeFeedback,
+    pitch: str,
+    prompt: str,
+) -> str:
+    """Return a shorter rewrite of ``prompt`` that keeps what the feedback rewards."""
+
+    payload = _build_payload(feedback, pitch, prompt)
+    with priority(PRIORITY_MUTATE):
+        result = get_compaction_agent().run_sync(payload, deps=MutatorDeps())
+    return _shorter(result.output.prompt, prompt)
+
+
+async def llm_as_prompt_compactor_async(
+    feedback: JudgeFeedback,
+    pitch: str,
+    prompt: str,
+) -> str:
+    """Async counterpart of :func:`llm_as_prompt_compactor`."""
+
+    payload = _build_payload(feedback, pitch, prompt)
+    with priority(PRIORITY_MUTATE):
+        result = await get_compaction_agent().run(payload, deps=MutatorDeps())
+    return _shorter(result.output.prompt, prompt)
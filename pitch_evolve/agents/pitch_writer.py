@@ -1,8 +1,10 @@
-from __future__ import annotations
-from typing import Dict, Any, Optional
+import functools
+from typing import AsyncIterator, Dict, Any, Optional
 
-from pitch_evolve.tools.web_search import web_search
-from pydantic_ai import Agent, RunContext
+from pitch_evolve.metrics import get_metrics
+from pitch_evolve.tools.compaction import compact_results
+from pitch_evolve.tools.evidence import get_evidence_corpus
+from pitch_evolve.tools.web_search import cached_web_search, web_search_async
 from pydantic import BaseModel, Field
 from pitch_evolve.tools.file_tools import write_file
 from pitch_evolve.prompts import utils as prompt_utils
@@ -16,9 +18,16 @@ class PitchWriterOutput(BaseModel):
 
 
 class PitchWriterDeps(BaseModel):
-    query_budget: int = 5
-    max_results: int = 3
+    query_budget: int = Field(5, ge=0)
+    max_results: int = Field(3, ge=1)
     recency: str = "m"
+    # Per-result token budget for ``raw_content``; ``None`` keeps full pages.
+    raw_content_budget: Optional[int] = 400
+    # Only answer from the search cache (used for cheap low-fidelity runs).
+    cached_only: bool = False
+    # Answer searches from the prefetched evidence corpus first and only go
+    # to the network when it has nothing relevant.
+    use_evidence: bool = False
 
     async def search(self, query: str, recency: str, max_results: Optional[int] = None) -> Dict[str, Any]:
         """
@@ -27,7 +36,8 @@ class PitchWriterDeps(BaseModel):
         Parameters:
             query: The information query to search for
             recency: Timeframe filter ('day'/'d', 'week'/'w', 'month'/'m', 'year'/'y')
-            max_results: Number of results to return (default: 5)
+            max_results: Number of results to return (at most, and by
+                default, the deps' ``max_results``)
 
         Returns:
             A dictionary containing search results (or an empty list if the
@@ -43,45 +53,109 @@ class PitchWriterDeps(BaseModel):
             }
 
         self.query_budget -= 1
-        max_results = max_results or self.max_results
-
-        results = web_search(
-            query=query, recency=recency, max_results=max_results)
+        # Low-fidelity rungs lower ``self.max_results``; the model may not
+        # ask for more than that.
+        max_results = min(max_results or self.max_results, self.max_results)
+
+        corpus = get_evidence_corpus() if self.use_evidence else None
+        if corpus is not None:
+            local = corpus.search(query, max_results=max_results)
+            if local:
+                return {
+                    "results": local,
+                    "query_budget_remaining": self.query_budget,
+                }
+
+        if self.cached_only:
+            results = cached_web_search(query, recency, max_results) or []
+        else:
+            results = await web_search_async(
+                query=query, recency=recency, max_results=max_results)
+        if corpus is not None:
+            # Later candidates can reuse what this fallback search found.
+            corpus.add_results(results)
+        if self.raw_content_budget is not None:
+            results, stats = compact_results(
+                results, query, token_budget=self.raw_content_budget)
+            print(f"compacted raw_content: saved {stats.bytes_saved} bytes, "
+                  f"{stats.tokens_saved} tokens")
         return {
             "results": results,
             "query_budget_remaining": self.query_budget,
         }
 
 
-if Agent is not None:
+@functools.lru_cache(maxsize=None)
+def get_pitch_writer_agent() -> Any:
+    """Build the pitch writer agent on first use.
+
+    Importing pydantic-ai and reading ``pitcher.txt`` is deferred until a
+    pitch is actually requested. Returns ``None`` if pydantic-ai is missing.
+    """
+    try:
+        from pydantic_ai import Agent, RunContext
+    except ImportError:  # pragma: no cover - environment may lack pydantic_ai
+        return None
+
+    from pitch_evolve.agents.scheduled_model import ScheduledModel
+
     pitch_writer_agent = Agent[PitchWriterDeps, PitchWriterOutput](
-        "openai:gpt-4.1",
+        ScheduledModel("openai:gpt-4.1", name="writer"),
         deps_type=PitchWriterDeps,
         output_type=PitchWriterOutput,
         tools=[write_file],
         instructions=prompt_utils.load("pitch_evolve/prompts/pitcher.txt"),
         model_settings={"temperature": 0.7, "max_tokens": 4096},
     )
-else:  # pragma: no cover - environment may lack pydantic_ai
-    pitch_writer_agent = None
 
+    @pitch_writer_agent.tool
+    async def search(
+        ctx: RunContext[PitchWriterDeps],
+        query: str,
+        recency: str,
+        max_results: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Retrieve information from the web using Tavily's search engine.
+
+        Parameters:
+            query: The information query to search for
+            recency: Timeframe filter ('day'/'d', 'week'/'w', 'month'/'m', 'year'/'y')
+            max_results: Number of results to return (default and maximum
+                set by the run)
+
+        Returns:
+            Collection of search results or None if search fails
+        """
+        with get_metrics().span("search"):
+            return await ctx.deps.search(query, recency=recency, max_results=max_results)
+
+    return pitch_writer_agent
 
-@pitch_writer_agent.tool
-async def search(
-    ctx: RunContext[PitchWriterDeps],
-    query: str,
-    recency: str,
-    max_results: int = 5,
-) -> Dict[str, Any]:
-    """
-    Retrieve information from the web using Tavily's search engine.
 
-    Parameters:
-        query: The information query to search for
-        recency: Timeframe filter ('day'/'d', 'week'/'w', 'month'/'m', 'year'/'y')
-        max_results: Number of results to return (default: 5)
+async def stream_pitch(prompt: str, deps: PitchWriterDeps,
+                       debounce_by: Optional[float] = 0.05) -> AsyncIterator[PitchWriterOutput]:
+    """Yield the pitch writer's output as it streams in.
 
-    Returns:
-        Collection of search results or None if search fails
+    Each item is the partial ``PitchWriterOutput`` received so far; the last
+    one is complete. Leaving the loop early cancels the model request.
     """
-    return await ctx.deps.search(query, recency=recency, max_results=max_results)
+    from pydantic import ValidationError
+
+    agent = get_pitch_writer_agent()
+    if agent is None:
+        yield PitchWriterOutput(topic=prompt, output=prompt)
+        return
+    async with agent.run_stream(prompt, deps=deps) as result:
+        async for message, last in result.stream_structured(debounce_by=debounce_by):
+            try:
+                yield await result.validate_structured_output(message, allow_partial=not last)
+            except ValidationError:
+                if last:
+                    raise
+
+
+def __getattr__(name: str) -> Any:
+    if name == "pitch_writer_agent":
+        return get_pitch_writer_agent()
+    raise AttributeError(name)
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, List, Optional
+
+from pydantic_ai.messages import ModelMessage, ModelResponse
+from pydantic_ai.models import KnownModelName, Model, ModelRequestParameters, StreamedResponse
+from pydantic_ai.models.wrapper import WrapperModel
+from pydantic_ai.settings import ModelSettings
+from pydantic_ai.usage import Usage
+
+from pitch_evolve.agents.scheduler import RequestScheduler, get_scheduler
+from pitch_evolve.agents.usage import get_usage_tracker
+from pitch_evolve.tools.compaction import count_tokens
+
+
+def estimate_tokens(messages: List[ModelMessage],
+                    model_settings: Optional[ModelSettings]) -> int:
+    """Rough token estimate for a request: ~4 characters per token plus output."""
+    prompt_chars = sum(len(str(part)) for m in messages for part in m.parts)
+    max_output = (model_settings or {}).get("max_tokens") or 1024
+    return prompt_chars // 4 + max_output
+
+
+def _part_text(part: Any) -> str:
+    content = getattr(part, "content", None)
+    if isinstance(content, str):
+        return content
+    if hasattr(part, "args_as_json_str"):
+        return part.args_as_json_str()
+    return str(content if content is not None else part)
+
+
+def estimate_stream_usage(messages: List[ModelMessage], response: ModelResponse) -> Usage:
+    """Usage of a stream cut off before its final chunk.
+
+    Counts the prompt and the response text received so far.
+    """
+    request_tokens = count_tokens("".join(_part_text(p) for m in messages for p in m.parts))
+    response_tokens = count_tokens("".join(_part_text(p) for p in response.parts))
+    return Usage(requests=1, request_tokens=request_tokens, response_tokens=response_tokens,
+                 total_tokens=request_tokens + response_tokens)
+
+
+class ScheduledModel(WrapperModel):
+    """Model wrapper that routes every request through the shared scheduler.
+
+    The token usage of each response is recorded under ``name`` in the
+    process-wide usage tracker.
+    """
+
+    def __init__(self, wrapped: Model | KnownModelName,
+                 scheduler: Optional[RequestScheduler] = None,
+                 name: str = "agent") -> None:
+        super().__init__(wrapped)
+        self.scheduler = scheduler
+        self.name = name
+
+    def _scheduler(self) -> RequestScheduler:
+        return self.scheduler or get_scheduler()
+
+    async def request(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> ModelResponse:
+        response = await self._scheduler().run(
+            self.model_name,
+            lambda: self.wrapped.request(
+                messages, model_settings, model_request_parameters),
+            tokens=estimate_tokens(messages, model_settings),
+        )
+        get_usage_tracker().record(self.name, self.model_name, response.usage)
+        return response
+
+    @asynccontextmanager
+    async def request_stream(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> AsyncIterator[StreamedResponse]:
+        async with self._scheduler().slot(
+            self.model_name, tokens=estimate_tokens(messages, model_settings)
+        ):
+            async with self.wrapped.request_stream(
+                messages, model_settings, model_request_parameters
+            ) as response_stream:
+                try:
+                    yield response_stream
+                finally:
+                    usage = response_stream.usage()
+                    if not usage.response_tokens:
+                        # Usage arrives with the final chunk, so a stream
+                        # cancelled part-way reports none; estimate it.
+                        usage = estimate_stream_usage(messages, response_stream.get())
+                    get_usage_tracker().record(self.name, self.model_name, usage)
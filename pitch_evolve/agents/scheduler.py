@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import contextvars
+import heapq
+import itertools
+import random
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Lower values are served first: judging candidates that are already in
+# flight beats mutating survivors, which beats starting new generations.
+PRIORITY_JUDGE = 0
+PRIORITY_MUTATE = 1
+PRIORITY_GENERATE = 2
+
+request_priority: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "request_priority", default=PRIORITY_GENERATE)
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+@contextlib.contextmanager
+def priority(level: int) -> Iterator[None]:
+    """Run model requests made inside the block at ``level`` priority."""
+    token = request_priority.set(level)
+    try:
+        yield
+    finally:
+        request_priority.reset(token)
+
+
+@dataclass
+class ModelLimits:
+    """Rate limits and concurrency bounds for one model."""
+
+    rpm: Optional[float] = 500
+    tpm: Optional[float] = 30_000
+    max_concurrency: int = 16
+    min_concurrency: int = 1
+    initial_concurrency: int = 4
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at ``per_minute``."""
+
+    def __init__(self, per_minute: float) -> None:
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.tokens = per_minute
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Take ``amount`` tokens and return how long to wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity,
+                              self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= min(amount, self.capacity)
+            return max(0.0, -self.tokens / self.rate)
+
+    def adjust(self, amount: float) -> None:
+        """Charge (or refund, if negative) ``amount`` after the fact."""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens - amount)
+
+
+@dataclass
+class _ModelState:
+    limits: ModelLimits
+    limit: float = 0.0
+    active: int = 0
+    waiters: List[Tuple[int, int, asyncio.AbstractEventLoop, asyncio.Future]] = field(
+        default_factory=list)
+    requests: Optional[TokenBucket] = None
+    tokens: Optional[TokenBucket] = None
+    latency: Optional[float] = None
+    throttled: int = 0
+    completed: int = 0
+
+    def __post_init__(self) -> None:
+        self.limit = float(self.limits.initial_concurrency)
+        if self.limits.rpm:
+            self.requests = TokenBucket(self.limits.rpm)
+        if self.limits.tpm:
+            self.tokens = TokenBucket(self.limits.tpm)
+
+
+class RequestScheduler:
+    """Central gate for every model request made by the agents.
+
+    Each model gets request and token buckets, and an adaptive concurrency
+    limit that grows additively on success and halves on throttling (or
+    shrinks on latency spikes). Waiting requests are admitted by priority,
+    and throttled or failed requests are retried with jittered backoff.
+    The scheduler works across event loops and threads, so ``run_sync``
+    callers and async callers share the same limits.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, ModelLimits]] = None,
+        default_limits: Optional[ModelLimits] = None,
+        retries: int = 5,
+        backoff: float = 1.0,
+        latency_spike: float = 3.0,
+    ) -> None:
+        self.limits = dict(limits or {})
+        self.default_limits = default_limits or ModelLimits()
+        self.retries = retries
+        self.backoff = backoff
+        self.latency_spike = latency_spike
+        self._states: Dict[str, _ModelState] = {}
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+
+    def state(self, model: str) -> _ModelState:
+        with self._lock:
+            if model not in self._states:
+                self._states[model] = _ModelState(
+                    self.limits.get(model, self.default_limits))
+            return self._states[model]
+
+    async def run(self, model: str, call: Callable[[], Awaitable[T]],
+                  tokens: float = 0) -> T:
+        """Run ``call`` against ``model`` once limits allow, retrying throttles."""
+        state = self.state(model)
+        for attempt in range(self.retries + 1):
+            await self._acquire(state)
+            try:
+                await self._throttle(state, tokens)
+                start = time.monotonic()
+                result = await call()
+            except Exception as exc:
+                status = getattr(exc, "status_code", None)
+                if status not in RETRY_STATUS or attempt == self.retries:
+                    raise
+                self._on_throttle(state)
+                delay = self.backoff * (2 ** attempt)
+            else:
+                self._on_success(state, time.monotonic() - start)
+                usage = getattr(result, "usage", None)
+                actual = getattr(usage, "total_tokens", None)
+                if state.tokens is not None and actual:
+                    state.tokens.adjust(actual - tokens)
+                return result
+            finally:
+                self._release(state)
+            await asyncio.sleep(delay + random.uniform(0, delay))
+        raise RuntimeError("unreachable")  # pragma: no cover
+
+    @asynccontextmanager
+    async def slot(self, model: str, tokens: float = 0) -> AsyncIterator[None]:
+        """Hold a concurrency slot for a streamed request (no retries)."""
+        state = self.state(model)
+        await self._acquire(state)
+        try:
+            await self._throttle(state, tokens)
+            start = time.monotonic()
+            yield
+            self._on_success(state, time.monotonic() - start)
+        finally:
+            self._release(state)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                model: {
+                    "concurrency_limit": round(s.limit, 2),
+                    "active": s.active,
+                    "queued": len(s.waiters),
+                    "throttled": s.throttled,
+                    "completed": s.completed,
+                }
+                for model, s in self._states.items()
+            }
+
+    async def _acquire(self, state: _ModelState) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if state.active < int(state.limit) and not state.waiters:
+                state.active += 1
+                return
+            future = loop.create_future()
+            heapq.heappush(state.waiters,
+                           (request_priority.get(), next(self._seq), loop, future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if future.done() and not future.cancelled():
+                    # We were admitted just as we got cancelled.
+                    state.active -= 1
+                state.waiters = [w for w in state.waiters if w[3] is not future]
+                heapq.heapify(state.waiters)
+            self._wake(state)
+            raise
+
+    def _release(self, state: _ModelState) -> None:
+        with self._lock:
+            state.active -= 1
+        self._wake(state)
+
+    def _wake(self, state: _ModelState) -> None:
+        with self._lock:
+            while state.waiters and state.active < int(state.limit):
+                _, _, loop, future = heapq.heappop(state.waiters)
+                if future.done():
+                    continue
+                state.active += 1
+                loop.call_soon_threadsafe(_admit, future)
+
+    async def _throttle(self, state: _ModelState, tokens: float) -> None:
+        wait = 0.0
+        if state.requests is not None:
+            wait = state.requests.reserve(1)
+        if state.tokens is not None and tokens:
+            wait = max(wait, state.tokens.reserve(tokens))
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def _on_success(self, state: _ModelState, latency: float) -> None:
+        with self._lock:
+            state.completed += 1
+            spike = (state.latency is not None
+                     and latency > self.latency_spike * state.latency)
+            state.latency = latency if state.latency is None else (
+                0.8 * state.latency + 0.2 * latency)
+            if spike:
+                state.limit = max(state.limits.min_concurrency, state.limit * 0.9)
+            else:
+                state.limit = min(state.limits.max_concurrency,
+                                  state.limit + 1.0 / max(state.limit, 1.0))
+        self._wake(state)
+
+    def _on_throttle(self, state: _ModelState) -> None:
+        with self._lock:
+            state.throttled += 1
+            state.limit = max(state.limits.min_concurrency, state.limit / 2)
+
+
+def _admit(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+_scheduler = RequestScheduler()
+
+
+def get_scheduler() -> RequestScheduler:
+    """Return the process-wide scheduler shared by all agents."""
+    return _scheduler
+
+
+def configure_scheduler(scheduler: RequestScheduler) -> RequestScheduler:
+    """Replace the process-wide scheduler, e.g. with custom per-model limits."""
+    global _scheduler
+    _scheduler = scheduler
+    return _scheduler
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import json
+import threading
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+# USD per million (input, output) tokens.
+MODEL_PRICES = {
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+}
+
+usage_scope: contextvars.ContextVar[Dict[str, Any]] = contextvars.ContextVar(
+    "usage_scope", default={})
+usage_meter: contextvars.ContextVar[Optional[List["UsageRecord"]]] = contextvars.ContextVar(
+    "usage_meter", default=None)
+
+
+@contextlib.contextmanager
+def scope(**labels: Any) -> Iterator[None]:
+    """Attribute model usage inside the block to ``labels`` (e.g. generation)."""
+    token = usage_scope.set({**usage_scope.get(), **labels})
+    try:
+        yield
+    finally:
+        usage_scope.reset(token)
+
+
+@contextlib.contextmanager
+def meter() -> Iterator[List["UsageRecord"]]:
+    """Collect the usage records of the model requests made inside the block."""
+    records: List[UsageRecord] = []
+    token = usage_meter.set(records)
+    try:
+        yield records
+    finally:
+        usage_meter.reset(token)
+
+
+def price(model: str, request_tokens: int, response_tokens: int) -> float:
+    """Return the USD cost of a request, or 0 for models without a price."""
+    name = model.split(":", 1)[-1]
+    input_price, output_price = MODEL_PRICES.get(name, (0.0, 0.0))
+    return (request_tokens * input_price + response_tokens * output_price) / 1e6
+
+
+# Record labels whose totals survive eviction of old records.
+_KEPT_TOTALS = ("agent", "model")
+
+
+@dataclass
+class UsageRecord:
+    agent: str
+    model: str
+    request_tokens: int
+    response_tokens: int
+    cost: float
+    generation: Optional[int] = None
+    candidate: Optional[int] = None
+    fidelity: Optional[str] = None
+
+    @property
+    def total_tokens(self) -> int:
+        return self.request_tokens + self.response_tokens
+
+
+def _accumulate(bucket: Dict[str, float], record: UsageRecord) -> None:
+    bucket["calls"] += 1
+    bucket["tokens"] += record.total_tokens
+    bucket["cost"] += record.cost
+
+
+class UsageTracker:
+    """Collects token usage and cost for every model request.
+
+    With ``max_records`` only the newest records are kept; totals and
+    per-agent / per-model aggregates still cover every request, while other
+    breakdowns cover the kept records. Records are also passed on to
+    ``parent``, e.g. a server-wide tracker above per-job ones.
+    """
+
+    def __init__(self, max_records: Optional[int] = None,
+                 parent: Optional["UsageTracker"] = None) -> None:
+        self.records: List[UsageRecord] = []
+        self.max_records = max_records
+        self.parent = parent
+        self._evicted: Dict[str, Dict[Any, Dict[str, float]]] = {
+            label: defaultdict(lambda: {"calls": 0, "tokens": 0, "cost": 0.0})
+            for label in _KEPT_TOTALS}
+        self._lock = threading.Lock()
+
+    def record(self, agent: str, model: str, usage: Any) -> UsageRecord:
+        labels = usage_scope.get()
+        request_tokens = getattr(usage, "request_tokens", None) or 0
+        response_tokens = getattr(usage, "response_tokens", None) or 0
+        entry = UsageRecord(
+            agent=labels.get("agent", agent),
+            model=model,
+            request_tokens=request_tokens,
+            response_tokens=response_tokens,
+            cost=price(model, request_tokens, response_tokens),
+            generation=labels.get("generation"),
+            candidate=labels.get("candidate"),
+            fidelity=labels.get("fidelity"),
+        )
+        self.add(entry)
+        metered = usage_meter.get()
+        if metered is not None:
+            metered.append(entry)
+        return entry
+
+    def add(self, entry: UsageRecord) -> None:
+        with self._lock:
+            self.records.append(entry)
+            if self.max_records is not None and len(self.records) > self.max_records:
+                for old in self.records[:len(self.records) - self.max_records]:
+                    for label, totals in self._evicted.items():
+                        _accumulate(totals[getattr(old, label)], old)
+                del self.records[:len(self.records) - self.max_records]
+        if self.parent is not None:
+            self.parent.add(entry)
+
+    @property
+    def total_tokens(self) -> int:
+        with self._lock:
+            evicted = sum(t["tokens"] for t in self._evicted["agent"].values())
+            return evicted + sum(r.total_tokens for r in self.records)
+
+    @property
+    def total_cost(self) -> float:
+        with self._lock:
+            evicted = sum(t["cost"] for t in self._evicted["agent"].values())
+            return evicted + sum(r.cost for r in self.records)
+
+    def totals_by(self, label: str) -> Dict[Any, Dict[str, float]]:
+        """Aggregate tokens, cost and calls by a record field, e.g. ``agent`` or ``generation``."""
+        totals: Dict[Any, Dict[str, float]] = defaultdict(
+            lambda: {"calls": 0, "tokens": 0, "cost": 0.0})
+        with self._lock:
+            records = list(self.records)
+            for key, evicted in self._evicted.get(label, {}).items():
+                totals[key] = dict(evicted)
+        for r in records:
+            _accumulate(totals[getattr(r, label)], r)
+        return dict(totals)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "total_tokens": self.total_tokens,
+            "total_cost": round(self.total_cost, 6),
+            "by_agent": self.totals_by("agent"),
+            "by_generation": {str(k): v for k, v in self.totals_by("generation").items()},
+        }
+
+    def write(self, path: str) -> None:
+        with self._lock:
+            records = [asdict(r) for r in self.records]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({**self.summary(), "records": records}, f, indent=2)
+
+
+_tracker = UsageTracker()
+_scoped_tracker: contextvars.ContextVar[Optional[UsageTracker]] = contextvars.ContextVar(
+    "scoped_tracker", default=None)
+
+
+def get_usage_tracker() -> UsageTracker:
+    """Return the usage tracker fed by every scheduled model.
+
+    That is the one installed by :func:`tracking` in the current context,
+    else the process-wide tracker.
+    """
+    return _scoped_tracker.get() or _tracker
+
+
+@contextlib.contextmanager
+def tracking(tracker: UsageTracker) -> Iterator[UsageTracker]:
+    """Record the model usage inside the block (and its tasks) in ``tracker``."""
+    token = _scoped_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _scoped_tracker.reset(token)
+
+
+def configure_usage_tracker(tracker: UsageTracker) -> UsageTracker:
+    global _tracker
+    _tracker = tracker
+    return _tracker
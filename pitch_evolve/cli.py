@@ -1,16 +1,48 @@
-from .evolution import PromptEvolutionEngine
-from .agents.pitch_writer import pitch_writer_agent, PitchWriterDeps
+from .evolution import CandidateArchive, FitnessCache, PromptEvolutionEngine
+from .evolution.cache import agent_fingerprint
+from .evolution.budget import BudgetGovernor
+from .evolution.fidelity import FidelityLevel
+from .evolution.journal import RunJournal
+from .evolution.surrogate import SurrogateModel
+from .agents.scheduler import ModelLimits, RequestScheduler, configure_scheduler, get_scheduler
+from .agents.pitch_writer import get_pitch_writer_agent, PitchWriterDeps, stream_pitch
+from .agents.llm_as_judge_mutator import get_mutator_agent
+from .agents.llm_as_judge import (
+    get_judge_agent,
+    llm_as_batch_judge,
+    llm_as_judge,
+    llm_as_judge_async,
+)
+from .metrics import get_metrics, serve_metrics
+from .tools.evidence import configure_evidence_corpus, evidence_queries, prefetch_evidence
+from .tools.search_cache import configure_search_cache, get_search_cache
 import argparse
+import asyncio
 import copy
+import csv
+import functools
+import json
 
-import matplotlib.pyplot as plt
 import os
-import logfire
+import time
+import uuid
 from pathlib import Path
+from typing import List, Optional
 
+DEFAULT_ARCHIVE = os.path.join("output", "archive.sqlite")
 
-logfire.configure(token=os.getenv("LOGFIRE_API_KEY"))
-logfire.instrument_openai()
+# Upper bounds on what one service job may ask for.
+MAX_JOB_POPULATION = 32
+MAX_JOB_GENERATIONS = 20
+MAX_JOB_CONCURRENCY = 16
+
+
+def configure_telemetry() -> None:
+    """Set up logfire; imported here so ``--help`` and parsing stay fast."""
+    import logfire
+
+    logfire.configure(token=os.getenv("LOGFIRE_API_KEY"))
+    logfire.instrument_openai()
 
 
 def read_prompt_from_file(file_path: str) -> str:
@@ -21,8 +53,34 @@ def read_prompt_from_file(file_path: str) -> str:
     return path.read_text().strip()
 
 
-def run_pitch(prompt: str, deps: PitchWriterDeps) -> None:
-    """Generate a single pitch and print the JSON output."""
+async def stream_pitch_to_stdout(prompt: str, deps: PitchWriterDeps) -> None:
+    """Print the pitch as it streams in, then its sources and timings."""
+    start = time.perf_counter()
+    first_token = None
+    shown = 0
+    final = None
+    async for final in stream_pitch(prompt, deps):
+        if len(final.output) > shown:
+            if first_token is None:
+                first_token = time.perf_counter() - start
+            print(final.output[shown:], end="", flush=True)
+            shown = len(final.output)
+    print()
+    if final is not None:
+        print(json.dumps({"topic": final.topic, "sources": final.sources}, indent=2))
+    print(f"first token after {first_token or 0.0:.2f}s, "
+          f"done after {time.perf_counter() - start:.2f}s")
+
+
+def run_pitch(prompt: str, deps: PitchWriterDeps, stream: bool = False) -> None:
+    """Generate a single pitch and print the JSON output.
+
+    With ``stream`` the pitch text is printed as it arrives instead.
+    """
+    if stream:
+        asyncio.run(stream_pitch_to_stdout(prompt, deps))
+        return
+    pitch_writer_agent = get_pitch_writer_agent()
     if pitch_writer_agent is None:
         print({"topic": prompt, "output": prompt, "sources": {}})
         return
@@ -31,19 +89,262 @@ def run_pitch(prompt: str, deps: PitchWriterDeps) -> None:
     print(result.output.model_dump_json(indent=2))
 
 
-def run_evolution(prompt: str, deps: PitchWriterDeps, generations: int, population: int) -> None:
-    """Run prompt evolution and plot average scores."""
+def parse_fidelity(spec: str) -> dict:
+    """Parse a ``QUERY_BUDGET:MAX_RESULTS:KEEP[:MODEL]`` fidelity rung."""
+    parts = spec.split(":", 3)
+    if len(parts) < 3:
+        raise argparse.ArgumentTypeError(
+            f"expected QUERY_BUDGET:MAX_RESULTS:KEEP[:MODEL], got {spec!r}")
+    try:
+        rung = {"query_budget": int(parts[0]), "max_results": int(parts[1]),
+                "keep": float(parts[2])}
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+    if not 0 < rung["keep"] <= 1:
+        raise argparse.ArgumentTypeError(f"KEEP must be in (0, 1], got {parts[2]}")
+    rung["model"] = parts[3] if len(parts) == 4 else None
+    return rung
+
+
+def build_fidelity_schedule(rungs: List[dict], deps: PitchWriterDeps) -> List[FidelityLevel]:
+    """Turn parsed ``--fidelity`` rungs into low-fidelity engine levels.
+
+    Each rung writes pitches with a reduced query budget and result count,
+    answers searches from the cache only and, if a model is given, uses it
+    for both the writer and the judge.
+    """
+    pitch_writer_agent = get_pitch_writer_agent()
+    levels = []
+    for n, rung in enumerate(rungs):
+        rung_deps = deps.model_copy(update={
+            "query_budget": rung["query_budget"],
+            "max_results": rung["max_results"],
+            "cached_only": True,
+        })
+        writer_model = judge_model = None
+        if rung["model"]:
+            from .agents.scheduled_model import ScheduledModel
+
+            writer_model = ScheduledModel(rung["model"], name="writer")
+            judge_model = ScheduledModel(rung["model"], name="judge")
+
+        def generate(p: str, deps: PitchWriterDeps = rung_deps, model=writer_model) -> str:
+            if pitch_writer_agent is None:
+                return p
+            result = pitch_writer_agent.run_sync(
+                p, deps=copy.deepcopy(deps), model=model)
+            return result.output.output
+
+        async def generate_async(p: str, deps: PitchWriterDeps = rung_deps,
+                                 model=writer_model) -> str:
+            if pitch_writer_agent is None:
+                return p
+            result = await pitch_writer_agent.run(
+                p, deps=copy.deepcopy(deps), model=model)
+            return result.output.output
+
+        levels.append(FidelityLevel(
+            name=f"rung{n + 1}",
+            keep=rung["keep"],
+            generator=generate,
+            async_generator=generate_async,
+            evaluator=functools.partial(llm_as_judge, model=judge_model),
+            async_evaluator=functools.partial(llm_as_judge_async, model=judge_model),
+        ))
+    return levels
+
+
+def write_pareto_front(front: List[dict], path: str) -> None:
+    """Write the Pareto front as CSV when ``path`` ends in .csv, else JSON."""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if path.endswith(".csv"):
+            writer = csv.DictWriter(
+                f, fieldnames=["score", "prompt_tokens", "latency_s", "writer_tokens", "prompt"])
+            writer.writeheader()
+            writer.writerows(front)
+        else:
+            json.dump(front, f, indent=2)
+
+
+def run_evolution(prompt: str, deps: PitchWriterDeps, generations: int, population: int,
+                  concurrency: int = 1, cache: Optional[FitnessCache] = None,
+                  resume: bool = False, budget: Optional[BudgetGovernor] = None,
+                  judge_batch_size: int = 0, crossover_rate: float = 0.0,
+                  fidelity: Optional[List[dict]] = None, samples: int = 1,
+                  min_samples: int = 2, confidence: float = 0.9,
+                  similarity_threshold: Optional[float] = None,
+                  min_diversity: float = 0.0, selection: str = "score",
+                  compaction_rate: float = 0.0,
+                  pareto_out: Optional[str] = None,
+                  archive: Optional[CandidateArchive] = None,
+                  seed_from_archive: bool = False, steady_state: bool = False,
+                  surrogate_keep: Optional[float] = None,
+                  surrogate_min_correlation: float = 0.3, stream: bool = False,
+                  max_pitch_chars: Optional[int] = None,
+                  generation_timeout: Optional[float] = None,
+                  cache_mutations: bool = False) -> None:
+    """Run prompt evolution and plot average scores.
+
+    With ``resume`` the run continues from the journal in the output
+    directory, replaying completed calls instead of issuing them again.
+    A ``judge_batch_size`` above 1 judges pitches comparatively in batches,
+    and ``fidelity`` rungs (see :func:`parse_fidelity`) race candidates at
+    low fidelity before promoting the best to full evaluation. With
+    ``samples`` above 1 each prompt is scored by up to that many pitches,
+    stopping early once it is clearly in or out of the survivor set.
+    ``similarity_threshold`` collapses near-duplicate prompts before
+    evaluation and ``min_diversity`` mutates duplicates when the population
+    collapses. ``selection="pareto"`` trades score against prompt length,
+    latency and writer tokens; the final front is written to ``pareto_out``.
+    Every candidate is recorded in ``archive``; ``seed_from_archive`` starts
+    from the best archived prompts of earlier runs with the same base prompt.
+    With ``steady_state`` the run has no generation barriers: ``concurrency``
+    workers evaluate ``generations * population`` candidates, reported in
+    windows of ``population`` evaluations. ``surrogate_keep`` enables a
+    learned surrogate that fully evaluates only that fraction of new prompts
+    once its rank correlation with the judge reaches ``surrogate_min_correlation``.
+    A generation whose pitch exceeds ``max_pitch_chars`` or that runs past
+    ``generation_timeout`` seconds fails; with ``stream`` it is cancelled as
+    soon as it overruns instead of after the full completion.
+    Mutations bypass ``cache`` unless ``cache_mutations`` is set.
+    """
+    pitch_writer_agent = get_pitch_writer_agent()
+    pitch_sources: dict = {}
 
     def generate(p: str) -> str:
         if pitch_writer_agent is None:
             return p
-        return pitch_writer_agent.run_sync(p, deps=copy.deepcopy(deps)).output.output
+        output = pitch_writer_agent.run_sync(p, deps=copy.deepcopy(deps)).output
+        pitch_sources[output.output] = output.sources
+        return output.output
+
+    async def generate_async(p: str) -> str:
+        if pitch_writer_agent is None:
+            return p
+        result = await pitch_writer_agent.run(p, deps=copy.deepcopy(deps))
+        pitch_sources[result.output.output] = result.output.sources
+        return result.output.output
+
+    async def stream_generate(p: str):
+        output = None
+        async for output in stream_pitch(p, copy.deepcopy(deps)):
+            yield output.output
+        if output is not None:
+            pitch_sources[output.output] = output.sources
+
+    seeds = [prompt] * population
+    if archive is not None and seed_from_archive:
+        seeds = archive.seed_population(prompt, population)
+        print(f"archive: seeded {sum(s != prompt for s in seeds)}/{population} "
+              f"prompts from earlier runs")
 
     engine = PromptEvolutionEngine(
-        population=[prompt for _ in range(population)],
+        population=seeds,
         generator=generate,
+        async_generator=generate_async,
+        concurrency=concurrency,
+        cache=cache,
+        cache_variation=cache_mutations,
+        budget=budget,
+        batch_evaluator=llm_as_batch_judge if judge_batch_size > 1 else None,
+        judge_batch_size=max(judge_batch_size, 1),
+        crossover_rate=crossover_rate,
+        fidelity_schedule=build_fidelity_schedule(fidelity or [], deps),
+        max_fitness_samples=samples,
+        min_fitness_samples=min_samples,
+        fitness_confidence=confidence,
+        similarity_threshold=similarity_threshold,
+        min_diversity=min_diversity,
+        selection=selection,
+        compaction_rate=compaction_rate,
+        archive=archive,
+        run_id=archive.start_run(prompt, {
+            "generations": generations, "population": population,
+            "selection": selection, "seeded": seed_from_archive,
+        }) if archive is not None else None,
+        pitch_sources=pitch_sources,
+        surrogate=SurrogateModel() if surrogate_keep is not None else None,
+        surrogate_keep=surrogate_keep if surrogate_keep is not None else 0.5,
+        surrogate_min_correlation=surrogate_min_correlation,
+        stream_generator=stream_generate if stream else None,
+        max_pitch_chars=max_pitch_chars,
+        generation_timeout=generation_timeout,
+        cache_context={
+            "generate": {
+                **agent_fingerprint(pitch_writer_agent),
+                "deps": deps.model_dump(),
+            },
+        },
     )
-    engine.evolve(generations=generations)
+    for level, rung in zip(engine.fidelity_schedule, fidelity or []):
+        engine.cache_context[f"generate:{level.name}"] = {
+            **engine.cache_context["generate"], "rung": rung}
+        engine.cache_context[f"evaluate:{level.name}"] = {
+            **agent_fingerprint(get_judge_agent()), "model": rung["model"]}
+    engine.journal = RunJournal(
+        os.path.join(engine.output_dir, "journal.jsonl"), resume=resume)
+    remaining = generations - engine.resume()
+    try:
+        if steady_state:
+            asyncio.run(engine.evolve_steady_state(
+                evaluations=remaining * population, window=population))
+        elif concurrency > 1:
+            asyncio.run(engine.evolve_async(generations=remaining))
+        else:
+            engine.evolve(generations=remaining)
+    finally:
+        engine.journal.close()
+
+    if engine.aborted_generations:
+        print(f"aborted {len(engine.aborted_generations)} over-budget generations")
+    if engine.throughput_history:
+        last = engine.throughput_history[-1]
+        print(f"steady-state: {last['evaluations']} evaluations at "
+              f"{last['overall_evals_per_s']} evals/s")
+    correlations = [r["spearman"] for r in engine.surrogate_history
+                    if r["spearman"] is not None]
+    if engine.surrogate_history:
+        skipped = sum(r["skipped"] for r in engine.surrogate_history)
+        print(f"surrogate: skipped {skipped} full evaluations; rank correlation by "
+              f"generation {correlations or 'n/a'}")
+    if engine.sampling_history:
+        drawn = sum(r["samples"] for r in engine.sampling_history)
+        fixed = sum(r["fixed_samples"] for r in engine.sampling_history)
+        print(f"sampling: drew {drawn} samples vs {fixed} for fixed-N sampling")
+    if engine.dedup_history:
+        skipped = sum(r["exact_duplicates"] + r["near_duplicates"]
+                      for r in engine.dedup_history)
+        injected = sum(r["injected"] for r in engine.dedup_history)
+        print(f"dedup: skipped {skipped} duplicate evaluations, "
+              f"injected {injected} diversity mutations")
+    if engine.fidelity_history:
+        saved = sum(r["calls_saved"] for r in engine.fidelity_history)
+        tokens = sum(r["tokens_saved"] for r in engine.fidelity_history)
+        print(f"fidelity: saved {saved} calls and {tokens} tokens vs flat evaluation")
+    front = engine.pareto_front()
+    if selection == "pareto" or pareto_out:
+        print(f"pareto front: {len(front)} non-dominated prompts")
+        for r in front:
+            latency = "?" if r["latency_s"] is None else f"{r['latency_s']:.2f}s"
+            tokens = "?" if r["writer_tokens"] is None else f"{r['writer_tokens']:.0f}"
+            print(f"  score={r['score']:.1f} prompt_tokens={r['prompt_tokens']} "
+                  f"latency={latency} writer_tokens={tokens}")
+    if pareto_out:
+        write_pareto_front(front, pareto_out)
+    if archive is not None:
+        best = archive.top(1, run_id=engine.run_id)
+        print(f"archive: run {engine.run_id} recorded to {archive.path}"
+              + (f"; best mean score {best[0]['mean_score']:.1f}" if best else ""))
+    if deps.use_evidence:
+        from .tools.evidence import get_evidence_corpus
+
+        print(f"evidence corpus: {get_evidence_corpus().stats()}")
+    print(f"search cache: {get_search_cache().stats()}")
+    print(f"scheduler: {get_scheduler().stats()}")
+    print("stage latency (seconds):")
+    print(get_metrics().format_summary())
+
+    import matplotlib.pyplot as plt
 
     plt.plot(range(1, len(engine.score_history) + 1),
              engine.score_history, marker="o")
@@ -54,6 +355,268 @@ def run_evolution(prompt: str, deps: PitchWriterDeps, generations: int, populati
     plt.savefig("evolution_scores.png")
 
 
+def build_island_engine(deps: PitchWriterDeps, concurrency: int, rpm: float, tpm: float,
+                        island: int, population: List[str],
+                        archive_path: Optional[str] = None, run_id: Optional[str] = None,
+                        max_tokens: Optional[int] = None,
+                        max_cost: Optional[float] = None) -> PromptEvolutionEngine:
+    """Engine for one island, run inside its worker process.
+
+    Each island gets its own scheduler, so ``rpm`` and ``tpm`` are that
+    island's share of the model limits; ``max_tokens`` and ``max_cost`` are
+    its share of the budget. Candidates are recorded under ``run_id`` in the
+    archive at ``archive_path``, which every island opens for itself.
+    """
+    configure_scheduler(RequestScheduler(default_limits=ModelLimits(
+        rpm=rpm, tpm=tpm, max_concurrency=max(concurrency, 1) * 2,
+        initial_concurrency=max(concurrency, 1),
+    )))
+    pitch_writer_agent = get_pitch_writer_agent()
+    pitch_sources: dict = {}
+
+    def generate(p: str) -> str:
+        if pitch_writer_agent is None:
+            return p
+        output = pitch_writer_agent.run_sync(p, deps=copy.deepcopy(deps)).output
+        pitch_sources[output.output] = output.sources
+        return output.output
+
+    async def generate_async(p: str) -> str:
+        if pitch_writer_agent is None:
+            return p
+        result = await pitch_writer_agent.run(p, deps=copy.deepcopy(deps))
+        pitch_sources[result.output.output] = result.output.sources
+        return result.output.output
+
+    budget = None
+    if max_tokens is not None or max_cost is not None:
+        budget = BudgetGovernor(max_tokens=max_tokens, max_cost=max_cost)
+    return PromptEvolutionEngine(
+        population=population,
+        generator=generate,
+        async_generator=generate_async,
+        concurrency=concurrency,
+        budget=budget,
+        archive=CandidateArchive(archive_path) if archive_path else None,
+        run_id=run_id,
+        pitch_sources=pitch_sources,
+        output_dir=os.path.join("output", f"island-{island}"),
+        cache_context={"generate": {
+            **agent_fingerprint(pitch_writer_agent), "deps": deps.model_dump()}},
+    )
+
+
+def run_island_evolution(prompt: str, deps: PitchWriterDeps, generations: int,
+                         population: int, islands: int, migration_interval: int,
+                         migrants: int, concurrency: int = 1, rpm: float = 500,
+                         tpm: float = 30_000, migration_dir: Optional[str] = None,
+                         island_ids: Optional[List[int]] = None,
+                         migration_run: Optional[str] = None,
+                         archive: Optional[CandidateArchive] = None,
+                         seed_from_archive: bool = False,
+                         max_tokens: Optional[int] = None,
+                         max_cost: Optional[float] = None) -> None:
+    """Evolve ``islands`` populations in worker processes with ring migration.
+
+    Every ``migration_interval`` generations each island sends its best
+    ``migrants`` prompts to the next. ``rpm``, ``tpm``, ``max_tokens`` and
+    ``max_cost`` are split evenly between the islands. With ``migration_dir``
+    migrants travel through that shared directory, so ``island_ids`` can
+    spread one ring over machines that all pass the same ``migration_run``
+    (a fresh id by default). All islands record to one ``archive`` run.
+    """
+    from .evolution.islands import DirectoryTransport, run_islands
+
+    local = island_ids if island_ids is not None else list(range(islands))
+    seeds = [prompt] * population
+    run_id = None
+    if archive is not None:
+        if seed_from_archive:
+            seeds = archive.seed_population(prompt, population)
+            print(f"archive: seeded {sum(s != prompt for s in seeds)}/{population} "
+                  f"prompts from earlier runs")
+        run_id = archive.start_run(prompt, {
+            "generations": generations, "population": population, "islands": islands,
+            "seeded": seed_from_archive,
+        })
+    run = run_islands(
+        functools.partial(
+            build_island_engine, deps, concurrency, rpm / islands, tpm / islands,
+            archive_path=archive.path if archive is not None else None, run_id=run_id,
+            max_tokens=max_tokens // islands if max_tokens is not None else None,
+            max_cost=max_cost / islands if max_cost is not None else None),
+        seeds, islands=islands, generations=generations,
+        migration_interval=migration_interval, migrants=migrants,
+        transport=DirectoryTransport(migration_dir, migration_run or uuid.uuid4().hex[:12])
+        if migration_dir else None,
+        island_ids=local,
+    )
+    for result in run.islands:
+        accepted = sum(m["accepted"] for m in result["migrations"])
+        print(f"island {result['island']}: best score {result['best_score']:.1f}, "
+              f"accepted {accepted} migrants")
+    print(f"islands: merged diversity by generation {[round(d, 2) for d in run.diversity]}")
+    print(f"best prompt (score {run.best_score:.1f}): {run.best_prompt}")
+    os.makedirs("output", exist_ok=True)
+    with open(os.path.join("output", "islands.json"), "w", encoding="utf-8") as f:
+        json.dump({"score_history": run.score_history, "diversity": run.diversity,
+                   "best_prompt": run.best_prompt, "best_score": run.best_score,
+                   "islands": run.islands}, f, indent=2)
+
+    import matplotlib.pyplot as plt
+
+    for result in run.islands:
+        plt.plot(range(1, len(result["score_history"]) + 1), result["score_history"],
+                 alpha=0.4, label=f"island {result['island']}")
+    plt.plot(range(1, len(run.score_history) + 1), run.score_history,
+             marker="o", color="black", label="all islands")
+    plt.xlabel("Generation")
+    plt.ylabel("Average score")
+    plt.title("Pitch quality over generations")
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig("evolution_scores.png")
+
+
+def job_deps(defaults: PitchWriterDeps, params: dict) -> PitchWriterDeps:
+    """``defaults`` with a job's ``recency``, ``max_results`` and ``query_budget``.
+
+    The overrides are validated, so bad values raise ``ValueError``.
+    """
+    return PitchWriterDeps.model_validate({**defaults.model_dump(), **{
+        k: params[k] for k in ("recency", "max_results", "query_budget") if k in params}})
+
+
+def job_sizes(params: dict) -> dict:
+    """An evolve job's ``population``, ``generations`` and ``concurrency``.
+
+    Raises ``ValueError`` for values that are not positive integers or that
+    exceed the ``MAX_JOB_*`` caps.
+    """
+    sizes = {}
+    for key, default, cap in (("population", 4, MAX_JOB_POPULATION),
+                              ("generations", 3, MAX_JOB_GENERATIONS),
+                              ("concurrency", 4, MAX_JOB_CONCURRENCY)):
+        value = params.get(key, default)
+        if isinstance(value, bool) or not isinstance(value, int) or not 1 <= value <= cap:
+            raise ValueError(f"{key!r} must be an integer in 1..{cap}")
+        sizes[key] = value
+    return sizes
+
+
+def validate_job_params(defaults: PitchWriterDeps):
+    """A ``PitchService`` validator for the jobs of ``build_job_handlers``."""
+    def validate(kind: str, params: dict) -> None:
+        job_deps(defaults, params)
+        if kind == "evolve":
+            job_sizes(params)
+    return validate
+
+
+def build_job_handlers(defaults: PitchWriterDeps) -> dict:
+    """Async ``pitch`` and ``evolve`` job handlers sharing warm agents.
+
+    Jobs take a ``prompt`` and may override ``recency``, ``max_results`` and
+    ``query_budget``; evolve jobs also take ``generations``, ``population``
+    and ``concurrency`` (see ``job_sizes`` for their caps).
+    """
+    pitch_writer_agent = get_pitch_writer_agent()
+
+    async def pitch_job(params: dict) -> dict:
+        prompt = params["prompt"]
+        if pitch_writer_agent is None:
+            return {"topic": prompt, "output": prompt, "sources": {}}
+        result = await pitch_writer_agent.run(prompt, deps=job_deps(defaults, params))
+        return result.output.model_dump()
+
+    async def evolve_job(params: dict) -> dict:
+        deps = job_deps(defaults, params)
+        sizes = job_sizes(params)
+
+        def generate(p: str) -> str:
+            if pitch_writer_agent is None:
+                return p
+            return pitch_writer_agent.run_sync(p, deps=copy.deepcopy(deps)).output.output
+
+        async def generate_async(p: str) -> str:
+            if pitch_writer_agent is None:
+                return p
+            result = await pitch_writer_agent.run(p, deps=copy.deepcopy(deps))
+            return result.output.output
+
+        engine = PromptEvolutionEngine(
+            population=[params["prompt"]] * sizes["population"],
+            generator=generate,
+            async_generator=generate_async,
+            concurrency=sizes["concurrency"],
+            output_dir=os.path.join("output", "jobs", params["job_id"]),
+            cache_context={"generate": {
+                **agent_fingerprint(pitch_writer_agent), "deps": deps.model_dump()}},
+        )
+        await engine.evolve_async(generations=sizes["generations"])
+        return {
+            "best_prompt": engine.population[0],
+            "score_history": engine.score_history,
+            "output_dir": engine.output_dir,
+        }
+
+    return {"pitch": pitch_job, "evolve": evolve_job}
+
+
+async def serve(deps: PitchWriterDeps, workers: int, max_queue: int, host: str,
+                port: int, socket_path: Optional[str] = None) -> None:
+    """Serve pitch and evolve jobs over HTTP until interrupted."""
+    from .agents.usage import UsageTracker, configure_usage_tracker
+    from .metrics import MetricsRegistry, configure_metrics
+    from .service import MAX_RECORDS, PitchService
+
+    # A server runs indefinitely, so keep only recent records and spans.
+    configure_usage_tracker(UsageTracker(max_records=MAX_RECORDS))
+    configure_metrics(MetricsRegistry(max_spans=MAX_RECORDS))
+    # Build every agent up front so the first job does not pay for it.
+    get_judge_agent()
+    get_mutator_agent()
+    service = PitchService(build_job_handlers(deps), workers=workers, max_queue=max_queue,
+                           validate=validate_job_params(deps))
+    server = await service.listen(host=host, port=port, socket_path=socket_path)
+    where = socket_path or f"http://{host}:{port}"
+    print(f"serving on {where}: POST /jobs, GET /jobs/<id>, /status, /metrics "
+          f"({workers} workers, queue of {max_queue})")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def show_archive(archive: CandidateArchive, top: int, run_id: Optional[str] = None,
+                 lineage: bool = False, as_json: bool = False) -> None:
+    """Print the archive's best prompts (optionally with lineage) or its runs."""
+    if top <= 0:
+        rows: list = archive.runs()
+    else:
+        rows = archive.top(top, run_id=run_id)
+        if lineage:
+            for row in rows:
+                row["lineage"] = [a["prompt_hash"][:12] for a in archive.lineage(row["prompt"])]
+    if as_json:
+        print(json.dumps(rows, indent=2, default=str))
+        return
+    if top <= 0:
+        for r in rows:
+            best = "-" if r["best_score"] is None else f"{r['best_score']:.1f}"
+            print(f"{r['run_id']}  candidates={r['candidates']}  best={best}  "
+                  f"base={r['base_prompt'][:60]!r}")
+        return
+    for rank, r in enumerate(rows, 1):
+        print(f"#{rank} mean={r['mean_score']:.1f} best={r['best_score']:.1f} "
+              f"n={r['evaluations']} run={r['run_id']} gen={r['generation']} "
+              f"op={r['operator'] or 'seed'} hash={r['prompt_hash'][:12]}")
+        if lineage:
+            print(f"   lineage: {' <- '.join(r['lineage'])}")
+        print(f"   {r['prompt']}")
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Pitch-Evolve CLI")
     sub = parser.add_subparsers(dest="command")
@@ -68,6 +631,49 @@ def main() -> None:
                            default=3, help="Number of search results")
     pitch_cmd.add_argument("--query-budget", type=int,
                            default=5, help="Number of web queries allowed")
+    pitch_cmd.add_argument("--search-cache", metavar="PATH",
+                           help="JSON file persisting search results between runs")
+    pitch_cmd.add_argument("--raw-content-budget", type=int, default=400,
+                           help="Tokens of page text kept per search result (0 keeps full pages)")
+    pitch_cmd.add_argument("--evidence", action="store_true",
+                           help="Prefetch a shared evidence corpus and search it before the web")
+    pitch_cmd.add_argument("--evidence-query", action="append", metavar="QUERY",
+                           help="Query used to build the evidence corpus (repeatable)")
+    pitch_cmd.add_argument("--stream", action="store_true",
+                           help="Print the pitch as it is generated")
+
+    serve_cmd = sub.add_parser(
+        "serve", help="Serve pitch and evolve jobs with warm agents")
+    serve_cmd.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    serve_cmd.add_argument("--port", type=int, default=8765, help="TCP port to listen on")
+    serve_cmd.add_argument("--socket", metavar="PATH",
+                           help="Listen on a Unix socket instead of TCP")
+    serve_cmd.add_argument("--workers", type=int, default=2,
+                           help="Jobs processed concurrently")
+    serve_cmd.add_argument("--max-queue", type=int, default=100,
+                           help="Queued jobs accepted before submissions get HTTP 429")
+    serve_cmd.add_argument("--recency", default="m", help="Default search recency filter")
+    serve_cmd.add_argument("--max-results", type=int, default=3,
+                           help="Default number of search results")
+    serve_cmd.add_argument("--query-budget", type=int, default=5,
+                           help="Default number of web queries allowed per pitch")
+    serve_cmd.add_argument("--rpm", type=float, default=500,
+                           help="Requests per minute allowed per model")
+    serve_cmd.add_argument("--tpm", type=float, default=30_000,
+                           help="Tokens per minute allowed per model")
+
+    archive_cmd = sub.add_parser(
+        "archive", help="Query the cross-run candidate archive")
+    archive_cmd.add_argument("--archive", default=DEFAULT_ARCHIVE, metavar="PATH",
+                             help="SQLite archive file")
+    archive_cmd.add_argument("--top", type=int, default=10,
+                             help="Number of best prompts to show (0 lists runs instead)")
+    archive_cmd.add_argument("--run", metavar="RUN_ID",
+                             help="Only show candidates from this run")
+    archive_cmd.add_argument("--lineage", action="store_true",
+                             help="Show each prompt's ancestry")
+    archive_cmd.add_argument("--json", action="store_true",
+                             help="Print results as JSON")
 
     evo_cmd = sub.add_parser(
         "evolve", help="Evolve a prompt over multiple rounds")
@@ -84,8 +690,119 @@ def main() -> None:
                          default=3, help="Number of search results")
     evo_cmd.add_argument("--query-budget", type=int,
                          default=5, help="Number of web queries allowed")
+    evo_cmd.add_argument("--search-cache", metavar="PATH",
+                         help="JSON file persisting search results between runs")
+    evo_cmd.add_argument("--raw-content-budget", type=int, default=400,
+                         help="Tokens of page text kept per search result (0 keeps full pages)")
+    evo_cmd.add_argument("--evidence", action="store_true",
+                         help="Prefetch a shared evidence corpus and search it before the web")
+    evo_cmd.add_argument("--evidence-query", action="append", metavar="QUERY",
+                         help="Query used to build the evidence corpus (repeatable)")
+    evo_cmd.add_argument("--concurrency", type=int, default=1,
+                         help="Candidates evaluated in parallel (>1 uses the async engine)")
+    evo_cmd.add_argument("--steady-state", action="store_true",
+                         help="Dispatch a new mutant as soon as any evaluation finishes "
+                              "instead of waiting for whole generations")
+    evo_cmd.add_argument("--islands", type=int, default=1,
+                         help="Independent populations evolved in parallel worker processes")
+    evo_cmd.add_argument("--migration-interval", type=int, default=2,
+                         help="Generations between migrations of top prompts between islands")
+    evo_cmd.add_argument("--migrants", type=int, default=1,
+                         help="Top prompts each island sends to the next per migration")
+    evo_cmd.add_argument("--migration-dir", metavar="PATH",
+                         help="Shared directory carrying migrants, e.g. between machines")
+    evo_cmd.add_argument("--island-ids", type=lambda v: [int(i) for i in v.split(",")],
+                         metavar="IDS",
+                         help="Comma-separated islands run on this machine (with --migration-dir)")
+    evo_cmd.add_argument("--migration-run", metavar="ID",
+                         help="Run id shared by every machine of one ring (with --island-ids)")
+    evo_cmd.add_argument("--stream", action="store_true",
+                         help="Stream pitches so over-budget generations can be cancelled early")
+    evo_cmd.add_argument("--max-pitch-chars", type=int, default=None,
+                         help="Cancel a generation once its pitch exceeds this many characters")
+    evo_cmd.add_argument("--generation-timeout", type=float, default=None, metavar="SECONDS",
+                         help="Cancel a generation still running after this many seconds")
+    evo_cmd.add_argument("--judge-batch", type=int, default=0,
+                         help="Pitches judged side by side per judge call (0 judges one at a time)")
+    evo_cmd.add_argument("--crossover-rate", type=float, default=0.0,
+                         help="Share of refill slots produced by crossing two survivors")
+    evo_cmd.add_argument("--fidelity", type=parse_fidelity, action="append",
+                         metavar="QB:MR:KEEP[:MODEL]",
+                         help="Add a low-fidelity rung (query budget, max results, fraction "
+                              "promoted, optional cheaper model); repeat for more rungs")
+    evo_cmd.add_argument("--samples", type=int, default=1,
+                         help="Max pitches sampled per prompt; >1 enables adaptive sampling")
+    evo_cmd.add_argument("--min-samples", type=int, default=2,
+                         help="Pitches sampled per prompt before early stopping is considered")
+    evo_cmd.add_argument("--confidence", type=float, default=0.9,
+                         help="Confidence level used to stop sampling a prompt early")
+    evo_cmd.add_argument("--similarity-threshold", type=float, default=None,
+                         help="TF-IDF cosine above which prompts share one evaluation (e.g. 0.9)")
+    evo_cmd.add_argument("--min-diversity", type=float, default=0.0,
+                         help="Minimum share of distinct prompts; duplicates beyond it are mutated")
+    evo_cmd.add_argument("--surrogate-keep", type=float, default=None, metavar="F",
+                         help="Pre-screen new prompts with a learned surrogate and fully "
+                              "evaluate only the best F of them")
+    evo_cmd.add_argument("--surrogate-min-correlation", type=float, default=0.3,
+                         help="Rank correlation with the judge required before screening")
+    evo_cmd.add_argument("--selection", choices=["score", "pareto"], default="score",
+                         help="Rank survivors by score alone or by Pareto front over score, "
+                              "prompt tokens, latency and writer tokens")
+    evo_cmd.add_argument("--compaction-rate", type=float, default=0.0,
+                         help="Share of refill slots produced by compacting a survivor's prompt")
+    evo_cmd.add_argument("--pareto-out", metavar="PATH",
+                         help="Write the final Pareto front to PATH (.csv or JSON)")
+    evo_cmd.add_argument("--archive", default=DEFAULT_ARCHIVE, metavar="PATH",
+                         help="SQLite archive recording every candidate across runs")
+    evo_cmd.add_argument("--no-archive", action="store_true",
+                         help="Do not record this run in the archive")
+    evo_cmd.add_argument("--seed-from-archive", action="store_true",
+                         help="Start from the best archived prompts for the same base prompt")
+    evo_cmd.add_argument("--metrics-port", type=int, default=None, metavar="PORT",
+                         help="Serve Prometheus metrics on http://127.0.0.1:PORT/metrics")
+    evo_cmd.add_argument("--rpm", type=float, default=500,
+                         help="Requests per minute allowed per model")
+    evo_cmd.add_argument("--tpm", type=float, default=30_000,
+                         help="Tokens per minute allowed per model")
+    evo_cmd.add_argument("--max-tokens", type=int, default=None,
+                         help="Token budget for the run; degrades gracefully near it")
+    evo_cmd.add_argument("--max-cost", type=float, default=None,
+                         help="USD budget for the run; degrades gracefully near it")
+    evo_cmd.add_argument("--resume", action="store_true",
+                         help="Continue an interrupted run from its journal")
+    evo_cmd.add_argument("--cache", metavar="PATH",
+                         help="SQLite file caching pitches and verdicts across runs")
+    evo_cmd.add_argument("--cache-samples", type=int, default=1,
+                         help="Distinct samples kept per cached prompt before reuse")
+    evo_cmd.add_argument("--cache-max-age", type=float, default=None,
+                         help="Seconds before a cached result expires")
+    evo_cmd.add_argument("--cache-mutations", action="store_true",
+                         help="Also reuse cached mutations (a surviving prompt then always "
+                              "yields the same child unless --cache-samples is above 1)")
 
     args = parser.parse_args()
+    if args.command == "archive":
+        if not os.path.exists(args.archive):
+            parser.error(f"no archive at {args.archive}")
+        show_archive(CandidateArchive(args.archive), args.top, run_id=args.run,
+                     lineage=args.lineage, as_json=args.json)
+        return
+    configure_telemetry()
+
+    if args.command == "serve":
+        configure_scheduler(RequestScheduler(default_limits=ModelLimits(
+            rpm=args.rpm, tpm=args.tpm,
+            max_concurrency=max(args.workers, 1) * 4,
+            initial_concurrency=max(args.workers, 1),
+        )))
+        deps = PitchWriterDeps(max_results=args.max_results,
+                               query_budget=args.query_budget, recency=args.recency)
+        try:
+            asyncio.run(serve(deps, args.workers, args.max_queue, args.host, args.port,
+                              socket_path=args.socket))
+        except KeyboardInterrupt:
+            pass
+        return
 
     if args.command is None:
         args.command = "pitch"
@@ -94,8 +811,12 @@ def main() -> None:
         max_results=args.max_results,
         query_budget=args.query_budget,
         recency=args.recency,
+        raw_content_budget=args.raw_content_budget or None,
     )
 
+    if args.search_cache:
+        configure_search_cache(path=args.search_cache)
+
     # Determine the prompt text
     prompt = None
     if args.prompt_file:
@@ -106,10 +827,104 @@ def main() -> None:
     if not prompt:
         parser.error("Either --prompt or --prompt-file must be provided")
 
+    if args.evidence:
+        corpus = asyncio.run(prefetch_evidence(
+            args.evidence_query or evidence_queries(prompt),
+            recency=args.recency, max_results=args.max_results))
+        configure_evidence_corpus(corpus)
+        deps.use_evidence = True
+        print(f"evidence corpus: {corpus.stats()}")
+
     if args.command == "evolve":
-        run_evolution(prompt, deps, args.generations, args.population)
+        if args.steady_state:
+            conflicts = [flag for flag, used in (
+                ("--fidelity", bool(args.fidelity)),
+                ("--samples", args.samples > 1),
+                ("--similarity-threshold", args.similarity_threshold is not None),
+                ("--min-diversity", args.min_diversity > 0),
+                ("--selection pareto", args.selection != "score"),
+                ("--judge-batch", args.judge_batch > 1),
+                ("--compaction-rate", args.compaction_rate > 0),
+                ("--surrogate-keep", args.surrogate_keep is not None),
+            ) if used]
+            if conflicts:
+                parser.error(f"--steady-state cannot be combined with {', '.join(conflicts)}")
+        if args.metrics_port is not None:
+            serve_metrics(args.metrics_port)
+            print(f"metrics: serving http://127.0.0.1:{args.metrics_port}/metrics")
+        if args.island_ids is not None:
+            if not args.migration_dir or not args.migration_run:
+                parser.error("--island-ids needs --migration-dir and --migration-run")
+            if (len(set(args.island_ids)) != len(args.island_ids)
+                    or any(not 0 <= k < args.islands for k in args.island_ids)):
+                parser.error(f"--island-ids must be unique and in 0..{args.islands - 1}")
+        if args.islands > 1:
+            conflicts = [flag for flag, used in (
+                ("--steady-state", args.steady_state),
+                ("--cache", args.cache is not None),
+                ("--resume", args.resume),
+                ("--stream", args.stream),
+                ("--max-pitch-chars", args.max_pitch_chars is not None),
+                ("--generation-timeout", args.generation_timeout is not None),
+                ("--judge-batch", args.judge_batch > 1),
+                ("--crossover-rate", args.crossover_rate > 0),
+                ("--fidelity", bool(args.fidelity)),
+                ("--samples", args.samples > 1),
+                ("--similarity-threshold", args.similarity_threshold is not None),
+                ("--min-diversity", args.min_diversity > 0),
+                ("--surrogate-keep", args.surrogate_keep is not None),
+                ("--selection pareto", args.selection != "score"),
+                ("--compaction-rate", args.compaction_rate > 0),
+                ("--pareto-out", args.pareto_out is not None),
+                ("--cache-mutations", args.cache_mutations),
+            ) if used]
+            if conflicts:
+                parser.error(f"--islands cannot be combined with {', '.join(conflicts)}")
+            run_island_evolution(prompt, deps, args.generations, args.population,
+                                 args.islands, args.migration_interval, args.migrants,
+                                 concurrency=args.concurrency, rpm=args.rpm, tpm=args.tpm,
+                                 migration_dir=args.migration_dir,
+                                 island_ids=args.island_ids,
+                                 migration_run=args.migration_run,
+                                 archive=None if args.no_archive
+                                 else CandidateArchive(args.archive),
+                                 seed_from_archive=args.seed_from_archive,
+                                 max_tokens=args.max_tokens, max_cost=args.max_cost)
+            return
+        configure_scheduler(RequestScheduler(default_limits=ModelLimits(
+            rpm=args.rpm,
+            tpm=args.tpm,
+            max_concurrency=max(args.concurrency, 1) * 2,
+            initial_concurrency=max(args.concurrency, 1),
+        )))
+        cache = FitnessCache(
+            path=args.cache,
+            max_age=args.cache_max_age,
+            max_samples=args.cache_samples,
+        )
+        run_evolution(prompt, deps, args.generations, args.population,
+                      concurrency=args.concurrency, cache=cache,
+                      resume=args.resume, judge_batch_size=args.judge_batch,
+                      crossover_rate=args.crossover_rate,
+                      fidelity=args.fidelity, samples=args.samples,
+                      min_samples=args.min_samples, confidence=args.confidence,
+                      similarity_threshold=args.similarity_threshold,
+                      min_diversity=args.min_diversity,
+                      selection=args.selection,
+                      compaction_rate=args.compaction_rate,
+                      pareto_out=args.pareto_out,
+                      archive=None if args.no_archive else CandidateArchive(args.archive),
+                      seed_from_archive=args.seed_from_archive,
+                      steady_state=args.steady_state,
+                      surrogate_keep=args.surrogate_keep,
+                      surrogate_min_correlation=args.surrogate_min_correlation,
+                      stream=args.stream, max_pitch_chars=args.max_pitch_chars,
+                      generation_timeout=args.generation_timeout,
+                      cache_mutations=args.cache_mutations,
+                      budget=BudgetGovernor(max_tokens=args.max_tokens,
+                                            max_cost=args.max_cost))
     else:
-        run_pitch(prompt, deps)
+        run_pitch(prompt, deps, stream=args.stream)
 
 
 if __name__ == "__main__":
@@ -1,3 +1,6 @@
 from .engine import PromptEvolutionEngine
+from .archive import CandidateArchive
+from .cache import FitnessCache
+from .journal import RunJournal
 
-__all__ = ["PromptEvolutionEngine"]
+__all__ = ["PromptEvolutionEngine", "CandidateArchive", "FitnessCache", "RunJournal"]
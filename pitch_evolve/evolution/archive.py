@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Sequence
+
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS runs ("
+    "run_id TEXT PRIMARY KEY, started REAL, base_prompt TEXT, config TEXT)",
+    "CREATE TABLE IF NOT EXISTS candidates ("
+    "id INTEGER PRIMARY KEY AUTOINCREMENT, run_id TEXT, generation INTEGER, "
+    "prompt_hash TEXT, prompt TEXT, pitch TEXT, score REAL, scores TEXT, "
+    "sources TEXT, parents TEXT, operator TEXT, created REAL)",
+    "CREATE INDEX IF NOT EXISTS candidates_prompt ON candidates(prompt_hash)",
+    "CREATE INDEX IF NOT EXISTS candidates_score ON candidates(score)",
+    "CREATE INDEX IF NOT EXISTS candidates_run ON candidates(run_id, generation)",
+)
+
+
+class CandidateArchive:
+    """SQLite archive of every candidate evaluated across ``evolve`` runs.
+
+    Each row holds a prompt, the pitch it produced, the judge's
+    per-dimension scores, the pitch's sources and the prompt's lineage
+    (parent prompt hashes and the operator that produced it), so later runs
+    can look up and start from the best prompts found so far.
+    """
+
+    def __init__(self, path: str = ":memory:") -> None:
+        self.path = path
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        for statement in _SCHEMA:
+            self._db.execute(statement)
+        self._db.commit()
+
+    def start_run(self, base_prompt: str, config: Optional[Dict[str, Any]] = None) -> str:
+        """Register a new run and return its id."""
+        run_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO runs VALUES (?, ?, ?, ?)",
+                (run_id, time.time(), base_prompt, json.dumps(config or {}, default=str)))
+            self._db.commit()
+        return run_id
+
+    def record(self, run_id: Optional[str], generation: int, prompt: str, pitch: str,
+               score: float, feedback: Any = None, sources: Any = None,
+               parents: Sequence[str] = (), operator: Optional[str] = None) -> None:
+        """Store one evaluated candidate; ``parents`` are parent prompts."""
+        scores = getattr(feedback, "scores", None)
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO candidates (run_id, generation, prompt_hash, prompt, pitch, "
+                "score, scores, sources, parents, operator, created) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, generation, prompt_hash(prompt), prompt, pitch, score,
+                 scores.model_dump_json() if scores is not None else None,
+                 json.dumps(sources or {}, default=str),
+                 json.dumps([prompt_hash(p) for p in parents]), operator, time.time()))
+            self._db.commit()
+
+    def top(self, k: int = 10, run_id: Optional[str] = None,
+            base_prompt: Optional[str] = None) -> List[Dict[str, Any]]:
+        """The ``k`` distinct prompts with the highest mean score.
+
+        Optionally restricted to one run or to runs started from
+        ``base_prompt``. Each entry carries the pitch, scores and sources of
+        the prompt's best evaluation.
+        """
+        where, params = [], []
+        if run_id is not None:
+            where.append("c.run_id = ?")
+            params.append(run_id)
+        if base_prompt is not None:
+            where.append("c.run_id IN (SELECT run_id FROM runs WHERE base_prompt = ?)")
+            params.append(base_prompt)
+        # SQLite fills bare columns from the row holding MAX(score).
+        sql = (
+            "SELECT c.prompt_hash, c.prompt, MAX(c.score) AS best_score, "
+            "AVG(c.score) AS mean_score, COUNT(*) AS evaluations, c.pitch, c.scores, "
+            "c.sources, c.parents, c.operator, c.run_id, c.generation FROM candidates c"
+            + (" WHERE " + " AND ".join(where) if where else "")
+            + " GROUP BY c.prompt_hash ORDER BY mean_score DESC, best_score DESC LIMIT ?"
+        )
+        with self._lock:
+            rows = self._db.execute(sql, (*params, k)).fetchall()
+        return [self._row(r) for r in rows]
+
+    def lineage(self, prompt: str) -> List[Dict[str, Any]]:
+        """``prompt`` followed by its first-parent ancestors back to the root."""
+        chain, seen = [], set()
+        digest: Optional[str] = prompt_hash(prompt)
+        while digest and digest not in seen:
+            seen.add(digest)
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT prompt_hash, prompt, MAX(score) AS best_score, AVG(score) AS "
+                    "mean_score, COUNT(*) AS evaluations, pitch, scores, sources, parents, "
+                    "operator, run_id, generation FROM candidates WHERE prompt_hash = ?",
+                    (digest,)).fetchone()
+            if row is None or row["prompt_hash"] is None:
+                break
+            entry = self._row(row)
+            chain.append(entry)
+            digest = entry["parents"][0] if entry["parents"] else None
+        return chain
+
+    def runs(self) -> List[Dict[str, Any]]:
+        """Every run with its candidate count and best score, newest first."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT r.run_id, r.started, r.base_prompt, COUNT(c.id) AS candidates, "
+                "MAX(c.score) AS best_score FROM runs r "
+                "LEFT JOIN candidates c ON c.run_id = r.run_id "
+                "GROUP BY r.run_id ORDER BY r.started DESC").fetchall()
+        return [dict(r) for r in rows]
+
+    def seed_population(self, base_prompt: str, size: int) -> List[str]:
+        """Best prior prompts of runs started from ``base_prompt``.
+
+        Padded with ``base_prompt`` when the archive has fewer than ``size``
+        distinct prompts for it.
+        """
+        seeds = [r["prompt"] for r in self.top(size, base_prompt=base_prompt)]
+        return seeds + [base_prompt] * (size - len(seeds))
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    @staticmethod
+    def _row(row: sqlite3.Row) -> Dict[str, Any]:
+        entry = dict(row)
+        entry["scores"] = json.loads(entry["scores"]) if entry["scores"] else None
+        entry["sources"] = json.loads(entry["sources"] or "{}")
+        entry["parents"] = json.loads(entry["parents"] or "[]")
+        return entry
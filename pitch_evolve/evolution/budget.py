@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from pitch_evolve.agents.usage import UsageTracker, get_usage_tracker
+
+
+@dataclass
+class BudgetGovernor:
+    """Keeps an evolution run inside a token and/or dollar budget.
+
+    Before each generation the governor projects the cost of evaluating
+    and mutating the population from the previous generation's usage. If
+    the projection does not fit in what is left, it first drops mutation,
+    then shrinks the population, and finally stops the run.
+    """
+
+    max_tokens: Optional[int] = None
+    max_cost: Optional[float] = None
+    tracker: UsageTracker = field(default_factory=get_usage_tracker)
+    events: List[str] = field(default_factory=list)
+
+    def _remaining(self) -> Dict[str, float]:
+        remaining = {}
+        if self.max_tokens is not None:
+            remaining["tokens"] = self.max_tokens - self.tracker.total_tokens
+        if self.max_cost is not None:
+            remaining["cost"] = self.max_cost - self.tracker.total_cost
+        return remaining
+
+    def exhausted(self) -> bool:
+        return any(v <= 0 for v in self._remaining().values())
+
+    def plan(self, generation: int, population_size: int) -> Tuple[int, bool]:
+        """Return ``(population_size, allow_mutation)`` for ``generation``.
+
+        A population size of 0 means the budget cannot cover another
+        generation and the run should stop.
+        """
+        remaining = self._remaining()
+        if not remaining:
+            return population_size, True
+        if self.exhausted():
+            self._note(f"generation {generation}: budget exhausted, stopping")
+            return 0, False
+
+        last = self.tracker.totals_by("generation").get(generation - 1)
+        if last is None:
+            return population_size, True
+        by_agent = _last_generation_by_agent(self.tracker, generation - 1)
+        mutation = by_agent.get("mutator", {"tokens": 0, "cost": 0.0})
+        previous_size = max(1, len({
+            r.candidate for r in self.tracker.records
+            if r.generation == generation - 1 and r.agent != "mutator"
+            and r.candidate is not None
+        }))
+
+        size, allow_mutation = population_size, True
+        for unit, left in remaining.items():
+            per_candidate = (last[unit] - mutation[unit]) / previous_size
+            projected_mutation = mutation[unit] * population_size / previous_size
+            if per_candidate * population_size + projected_mutation > left:
+                allow_mutation = False
+            if per_candidate:
+                size = min(size, int(left // per_candidate))
+
+        if not allow_mutation:
+            self._note(f"generation {generation}: skipping mutation to save budget")
+        if size < population_size:
+            self._note(f"generation {generation}: shrinking population "
+                       f"{population_size} -> {size}")
+        return max(size, 0), allow_mutation
+
+    def _note(self, message: str) -> None:
+        print(f"budget: {message}")
+        self.events.append(message)
+
+
+def _last_generation_by_agent(tracker: UsageTracker,
+                              generation: int) -> Dict[str, Dict[str, float]]:
+    totals: Dict[str, Dict[str, float]] = {}
+    for r in tracker.records:
+        if r.generation != generation:
+            continue
+        bucket = totals.setdefault(r.agent, {"tokens": 0, "cost": 0.0})
+        bucket["tokens"] += r.total_tokens
+        bucket["cost"] += r.cost
+    return totals
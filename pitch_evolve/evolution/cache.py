@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+def make_key(kind: str, *parts: Any, context: Any = None) -> str:
+    """Return a content hash for a cached call.
+
+    ``kind`` names the stage (``"generate"``, ``"evaluate"``, ``"mutate"``),
+    ``parts`` are the call inputs and ``context`` identifies the agent that
+    served it, typically its model name and model settings.
+    """
+    material = json.dumps([kind, [_text(p) for p in parts], context],
+                          sort_keys=True, default=str)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def agent_fingerprint(agent: Any) -> Dict[str, Any]:
+    """Identify a pydantic-ai agent by model name and model settings."""
+    model = getattr(agent, "model", None)
+    return {
+        "model": str(getattr(model, "model_name", model)),
+        "settings": dict(getattr(agent, "model_settings", None) or {}),
+    }
+
+
+def _text(value: Any) -> Any:
+    if hasattr(value, "model_dump_json"):
+        return value.model_dump_json()
+    return value
+
+
+class FitnessCache:
+    """Two-level cache for generation results, judge verdicts and mutations.
+
+    An in-memory LRU sits in front of an optional SQLite store so results
+    survive across runs. Each key holds up to ``max_samples`` values: the
+    first ``max_samples`` lookups of a key compute fresh results and later
+    lookups rotate through the stored samples. Values are pickled on disk,
+    so only point ``path`` at a file you trust.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = 1024,
+        max_disk_entries: Optional[int] = None,
+        max_age: Optional[float] = None,
+        max_samples: int = 1,
+    ) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.max_age = max_age
+        self.max_samples = max(1, max_samples)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._memory: "OrderedDict[str, tuple[float, List[Any]]]" = OrderedDict()
+        self._cursor: Dict[str, int] = {}
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, created REAL, accessed REAL, value BLOB)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS cache_accessed ON cache(accessed)")
+            self._db.commit()
+            self.prune()
+
+    # -- storage -----------------------------------------------------------
+    def get(self, key: str) -> Optional[List[Any]]:
+        """Return the stored samples for ``key`` or ``None`` if absent/expired."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created, samples = entry
+                if self._expired(created, now):
+                    del self._memory[key]
+                    self.evictions += 1
+                else:
+                    self._memory.move_to_end(key)
+                    return samples
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                "SELECT created, value FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            created, blob = row
+            if self._expired(created, now):
+                self._db.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._db.commit()
+                self.evictions += 1
+                return None
+            self._db.execute(
+                "UPDATE cache SET accessed = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            samples = pickle.loads(blob)
+            self._remember(key, created, samples)
+            return samples
+
+    def put(self, key: str, value: Any) -> None:
+        """Append ``value`` to the samples stored under ``key``."""
+        now = time.time()
+        samples = list(self.get(key) or [])
+        samples.append(value)
+        samples = samples[-self.max_samples:]
+        with self._lock:
+            created = self._memory[key][0] if key in self._memory else now
+            self._remember(key, created, samples)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO cache (key, created, accessed, value) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, created, now, pickle.dumps(samples)),
+                )
+                self._db.commit()
+                if self.max_disk_entries is not None:
+                    self._prune_size()
+
+    def prune(self) -> None:
+        """Drop expired entries and enforce ``max_disk_entries`` on disk."""
+        if self._db is None:
+            return
+        with self._lock:
+            if self.max_age is not None:
+                cur = self._db.execute(
+                    "DELETE FROM cache WHERE created < ?",
+                    (time.time() - self.max_age,),
+                )
+                self.evictions += max(cur.rowcount, 0)
+            if self.max_disk_entries is not None:
+                self._prune_size()
+            self._db.commit()
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    # -- lookups -----------------------------------------------------------
+    def lookup(self, key: str) -> Tuple[bool, Any]:
+        """Return ``(True, sample)`` if ``key`` is fully sampled, else ``(False, None)``.
+
+        Counts as a hit or a miss; on a miss the caller is expected to
+        compute the value and :meth:`put` it.
+        """
+        samples = self.get(key) or []
+        if len(samples) >= self.max_samples:
+            self.hits += 1
+            return True, self._pick(key, samples)
+        self.misses += 1
+        return False, None
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Return a cached sample for ``key`` or compute and store a new one."""
+        found, value = self.lookup(key)
+        if found:
+            return value
+        value = compute()
+        self.put(key, value)
+        return value
+
+    async def aget_or_compute(
+        self, key: str, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Async :meth:`get_or_compute` that coalesces concurrent misses.
+
+        While a key already has enough samples in flight, further callers
+        wait for one of those results instead of issuing another call.
+        """
+        samples = self.get(key) or []
+        if len(samples) >= self.max_samples:
+            self.hits += 1
+            return self._pick(key, samples)
+        pending = self._pending.get(key, [])
+        if pending and len(samples) + len(pending) >= self.max_samples:
+            self.hits += 1
+            return await asyncio.shield(pending[len(samples) % len(pending)])
+
+        self.misses += 1
+        pending = self._pending.setdefault(key, [])
+        future = asyncio.get_running_loop().create_future()
+        # Nobody may be waiting; retrieve the exception so it is not logged.
+        future.add_done_callback(
+            lambda f: f.cancelled() or f.exception())
+        pending.append(future)
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            pending.remove(future)
+            if not pending:
+                self._pending.pop(key, None)
+        self.put(key, value)
+        future.set_result(value)
+        return value
+
+    # -- metrics -----------------------------------------------------------
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+            "entries": len(self._memory),
+        }
+
+    # -- internals ---------------------------------------------------------
+    def _expired(self, created: float, now: float) -> bool:
+        return self.max_age is not None and now - created > self.max_age
+
+    def _remember(self, key: str, created: float, samples: List[Any]) -> None:
+        self._memory[key] = (created, samples)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _prune_size(self) -> None:
+        cur = self._db.execute(
+            "DELETE FROM cache WHERE key NOT IN ("
+            "SELECT key FROM cache ORDER BY accessed DESC LIMIT ?)",
+            (self.max_disk_entries,),
+        )
+        self.evictions += max(cur.rowcount, 0)
+
+    def _pick(self, key: str, samples: List[Any]) -> Any:
+        cursor = self._cursor.get(key, 0)
+        self._cursor[key] = cursor + 1
+        return samples[cursor % len(samples)]
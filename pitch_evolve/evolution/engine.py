@@ -1,16 +1,168 @@
 from __future__ import annotations
 
+import asyncio
+import math
 import random
+import time
 from dataclasses import dataclass, field
-from typing import Callable, List
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple, Union,
+)
 import os
 
-from pitch_evolve.agents.llm_as_judge import JudgeFeedback, llm_as_judge
-from pitch_evolve.agents.llm_as_judge_mutator import llm_as_judge_mutator
+from pitch_evolve.agents.llm_as_judge import (
+    BatchJudgement,
+    JudgeFeedback,
+    get_batch_judge_agent,
+    get_judge_agent,
+    llm_as_batch_judge,
+    llm_as_batch_judge_async,
+    llm_as_judge,
+    llm_as_judge_async,
+)
+from pitch_evolve.agents.llm_as_judge_mutator import (
+    fit_offspring,
+    get_compaction_agent,
+    get_crossover_agent,
+    get_mutator_agent,
+    get_offspring_agent,
+    llm_as_crossover,
+    llm_as_crossover_async,
+    llm_as_judge_mutator,
+    llm_as_judge_mutator_async,
+    llm_as_judge_offspring,
+    llm_as_judge_offspring_async,
+    llm_as_prompt_compactor,
+    llm_as_prompt_compactor_async,
+)
+from pitch_evolve.agents import usage
+from pitch_evolve.evolution.budget import BudgetGovernor
+from pitch_evolve.evolution.cache import FitnessCache, agent_fingerprint, make_key
+from pitch_evolve.evolution import sampling
+from pitch_evolve.evolution.archive import CandidateArchive
+from pitch_evolve.evolution.fidelity import FidelityLevel, fidelity_report
+from pitch_evolve.evolution.pareto import non_dominated_fronts, nsga2_order
+from pitch_evolve.evolution.sampling import FitnessStats
+from pitch_evolve.evolution.similarity import SimilarityIndex
+from pitch_evolve.evolution.surrogate import SurrogateModel, spearman
+from pitch_evolve.evolution.journal import (
+    RunJournal,
+    rng_state_from_json,
+    rng_state_to_json,
+)
+from pitch_evolve.metrics import get_metrics
+from pitch_evolve.tools.compaction import count_tokens
 
 
 GeneratorFn = Callable[[str], str]
 EvaluatorFn = Callable[[str], JudgeFeedback]
+MutatorFn = Callable[[JudgeFeedback, str, str], str]
+AsyncGeneratorFn = Callable[[str], Awaitable[str]]
+AsyncEvaluatorFn = Callable[[str], Awaitable[JudgeFeedback]]
+AsyncMutatorFn = Callable[[JudgeFeedback, str, str], Awaitable[str]]
+# Yields the pitch generated so far, growing with every item.
+StreamGeneratorFn = Callable[[str], AsyncIterator[str]]
+# Judge several pitches in one call; returns a ``BatchJudgement`` or a list
+# of ``JudgeFeedback`` in input order.
+BatchEvaluatorFn = Callable[[List[str]], Any]
+AsyncBatchEvaluatorFn = Callable[[List[str]], Awaitable[Any]]
+# Return ``k`` children of one parent / of several parents from one call.
+OffspringFn = Callable[[JudgeFeedback, str, str, int], List[str]]
+AsyncOffspringFn = Callable[[JudgeFeedback, str, str, int], Awaitable[List[str]]]
+CrossoverFn = Callable[[List[Tuple[Any, str, str]], int], List[str]]
+AsyncCrossoverFn = Callable[[List[Tuple[Any, str, str]], int], Awaitable[List[str]]]
+
+# (prompt, score, pitch, feedback)
+Scored = Tuple[str, float, str, Any]
+# Either a prompt carried over unchanged, the (feedback, pitch, prompt)
+# arguments of a pending mutator call, a pair of such parents to cross or a
+# parent to compact.
+Parent = Tuple[Any, str, str]
+
+
+class Compaction(NamedTuple):
+    """Plan entry: rewrite ``parent``'s prompt to be shorter."""
+
+    parent: Parent
+
+
+PlanEntry = Union[str, Parent, Tuple[Parent, Parent], Compaction]
+
+
+class GenerationAborted(Exception):
+    """Raised to cancel a streaming generation that overran its budget."""
+
+
+def _unwrap(feedback_result: Any) -> Any:
+    """Return the judge output from an agent run result (or the value itself)."""
+    return getattr(feedback_result, "output", feedback_result)
+
+
+def _unwrap_batch(result: Any, size: int) -> BatchJudgement:
+    """Return a batch evaluator result as a :class:`BatchJudgement`.
+
+    Evaluators returning a bare feedback list are ranked by average score.
+    """
+    output = _unwrap(result)
+    feedback = list(getattr(output, "feedback", output))
+    if len(feedback) != size:
+        raise ValueError(
+            f"batch evaluator returned {len(feedback)} results for {size} pitches")
+    ranking = getattr(output, "ranking", None)
+    if ranking is None:
+        ranking = sorted(range(size), key=lambda n: -(
+            feedback[n].scores.average() if getattr(feedback[n], "scores", None) else 0.0))
+    return BatchJudgement(feedback=feedback, ranking=ranking)
+
+
+# Stages that breed new prompts; see ``PromptEvolutionEngine._cache_for``.
+_VARIATION_KINDS = {"mutate", "offspring", "crossover", "compact"}
+
+
+def _generate_parts(prompt: str, sample: int) -> Tuple[Any, ...]:
+    """Cache key parts for the ``sample``-th pitch drawn from ``prompt``."""
+    return (prompt,) if sample == 0 else (prompt, sample)
+
+
+def _is_crossover(entry: PlanEntry) -> bool:
+    return not isinstance(entry, str) and len(entry) == 2
+
+
+def _parent_prompt(entry: PlanEntry) -> str:
+    """The prompt kept in place of ``entry`` when it is not realised."""
+    if isinstance(entry, str):
+        return entry
+    if isinstance(entry, Compaction):
+        return entry.parent[2]
+    return entry[0][2] if _is_crossover(entry) else entry[2]
+
+
+def _stage(kind: str) -> str:
+    """Metrics stage of a cached call ``kind`` (e.g. ``evaluate:low`` -> judge)."""
+    base = kind.split(":", 1)[0]
+    return {"generate": "generate", "evaluate": "judge"}.get(base, "mutate")
+
+
+def _generation(pitch: str, elapsed: float, records: List[Any]) -> Dict[str, Any]:
+    """A generated pitch with its measured cost, cached together."""
+    return {"pitch": pitch, "latency_s": elapsed,
+            "writer_tokens": sum(r.total_tokens for r in records)}
+
+
+def _objective_points(records: List[Dict[str, Any]]) -> List[Tuple[float, ...]]:
+    """Objectives to maximise: score and the negated costs.
+
+    An unknown cost is taken as the mean of the known ones, so a prompt
+    without a measured generation neither wins nor loses on it.
+    """
+    means = {}
+    for name in ("latency_s", "writer_tokens"):
+        known = [r[name] for r in records if r[name] is not None]
+        means[name] = sum(known) / len(known) if known else 0.0
+    return [(r["score"], -r["prompt_tokens"],
+             -(r["latency_s"] if r["latency_s"] is not None else means["latency_s"]),
+             -(r["writer_tokens"] if r["writer_tokens"] is not None else means["writer_tokens"]))
+            for r in records]
 
 
 @dataclass
@@ -20,72 +172,1245 @@ class PromptEvolutionEngine:
     population: List[str]
     generator: GeneratorFn
     evaluator: EvaluatorFn = llm_as_judge
+    mutator: MutatorFn = llm_as_judge_mutator
     tournament_size: int = 2
     mutation_rate: float = 0.5
     history: List[List[str]] = field(default_factory=list)
     score_history: List[float] = field(default_factory=list)
     output_dir: str = "output"
+    async_generator: Optional[AsyncGeneratorFn] = None
+    async_evaluator: Optional[AsyncEvaluatorFn] = None
+    async_mutator: Optional[AsyncMutatorFn] = None
+    concurrency: int = 4
+    cache: Optional[FitnessCache] = None
+    # Extra key material per stage ("generate", "evaluate", "mutate"), e.g.
+    # the model name and settings of the agent behind each callable.
+    cache_context: Dict[str, Any] = field(default_factory=dict)
+    # Also reuse cached mutations, offspring, crossovers and compactions
+    # (useful with a multi-sample cache or to replay a run cheaply).
+    cache_variation: bool = False
+    journal: Optional[RunJournal] = None
+    rng: random.Random = field(default_factory=random.Random)
+    budget: Optional[BudgetGovernor] = None
+    # When set, pitches are judged ``judge_batch_size`` at a time by one
+    # comparative judge call instead of one call per pitch.
+    batch_evaluator: Optional[BatchEvaluatorFn] = None
+    async_batch_evaluator: Optional[AsyncBatchEvaluatorFn] = None
+    judge_batch_size: int = 8
+    # Each batch-judged pitch's place in its batch's ranking, from 1.0 for
+    # the best down to 1/n; breaks ties between equal average scores.
+    batch_ranks: Dict[str, float] = field(default_factory=dict)
+    # Produce several children per mutator call. Identical pending
+    # mutations are grouped and requested with one call for ``k`` children.
+    # Defaults to the built-in multi-offspring agent when ``mutator`` is the
+    # built-in single-child one.
+    offspring_mutator: Optional[OffspringFn] = None
+    async_offspring_mutator: Optional[AsyncOffspringFn] = None
+    # Probability that a refill slot is a crossover of two survivors.
+    crossover_rate: float = 0.0
+    crossover: Optional[CrossoverFn] = None
+    async_crossover: Optional[AsyncCrossoverFn] = None
+    # Successive-halving rungs run before full-fidelity evaluation; only the
+    # candidates promoted through every rung are judged at full fidelity.
+    fidelity_schedule: List[FidelityLevel] = field(default_factory=list)
+    fidelity_history: List[Dict[str, Any]] = field(default_factory=list)
+    # Adaptive repeated sampling: with ``max_fitness_samples`` above 1 each
+    # prompt is scored by the mean of several pitches, sampling more only
+    # while its survivor status is uncertain at ``fitness_confidence``.
+    max_fitness_samples: int = 1
+    min_fitness_samples: int = 2
+    fitness_confidence: float = 0.9
+    fitness_stats: Dict[str, FitnessStats] = field(default_factory=dict)
+    sampling_history: List[Dict[str, Any]] = field(default_factory=list)
+    # Prompts at least this TF-IDF cosine-similar to an earlier one share its
+    # evaluation instead of being generated and judged again (None disables).
+    similarity_threshold: Optional[float] = None
+    # Minimum share of distinct prompts in the next population; below it,
+    # duplicate carry-overs are mutated to restore diversity.
+    min_diversity: float = 0.0
+    dedup_history: List[Dict[str, Any]] = field(default_factory=list)
+    # "pareto" ranks survivors by NSGA-II over judge score, prompt tokens,
+    # generation latency and writer tokens instead of by score alone.
+    selection: str = "score"
+    # Probability that a refill slot is a shorter rewrite of a survivor;
+    # defaults to the built-in compaction agent.
+    compaction_rate: float = 0.0
+    compactor: Optional[MutatorFn] = None
+    async_compactor: Optional[AsyncMutatorFn] = None
+    # Mean latency and writer tokens of each prompt's uncached generations,
+    # and the latest objectives of every evaluated prompt.
+    generation_costs: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    objectives: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # Every scored candidate is stored in ``archive`` under ``run_id`` with its
+    # pitch, scores, sources (``pitch_sources``, filled by the generator) and
+    # lineage (parents and operator of each prompt bred this run).
+    archive: Optional[CandidateArchive] = None
+    run_id: Optional[str] = None
+    pitch_sources: Dict[str, Any] = field(default_factory=dict)
+    lineage: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # One entry per ``evolve_steady_state`` window: evaluations and evals/sec.
+    throughput_history: List[Dict[str, Any]] = field(default_factory=list)
+    # A surrogate trained on judge scores pre-screens prompts that have never
+    # been evaluated: only the best ``surrogate_keep`` fraction of them is
+    # fully evaluated, once the surrogate has ``surrogate_min_samples``
+    # scores and its last rank correlation reached ``surrogate_min_correlation``.
+    surrogate: Optional[SurrogateModel] = None
+    surrogate_keep: float = 0.5
+    surrogate_min_samples: int = 8
+    surrogate_min_correlation: float = 0.3
+    surrogate_history: List[Dict[str, Any]] = field(default_factory=list)
+    # With ``stream_generator`` pitches are streamed, and a generation that
+    # grows past ``max_pitch_chars`` or runs longer than ``generation_timeout``
+    # seconds is cancelled. Its candidate fails with an empty pitch that is
+    # never sent to the judge. Without streaming the timeout still bounds
+    # async generations and over-long pitches still fail.
+    stream_generator: Optional[StreamGeneratorFn] = None
+    max_pitch_chars: Optional[int] = None
+    generation_timeout: Optional[float] = None
+    aborted_generations: List[Dict[str, Any]] = field(default_factory=list)
+
+    def resume(self) -> int:
+        """Restore state from the last checkpoint in ``journal``.
+
+        Returns the number of generations already completed. Calls the
+        journal recorded after that checkpoint are replayed by the next
+        :meth:`evolve` / :meth:`evolve_async` instead of being re-issued.
+        """
+        if self.journal is None or not self.journal.checkpoints:
+            return 0
+        checkpoints = self.journal.checkpoints
+        self.history = [list(c["population"]) for c in checkpoints]
+        self.score_history = [c["score"] for c in checkpoints]
+        self.population = list(checkpoints[-1]["population"])
+        self.rng.setstate(rng_state_from_json(checkpoints[-1]["rng_state"]))
+        return len(checkpoints)
 
     def evolve(self, generations: int = 1) -> List[str]:
         """Run prompt evolution for a number of generations."""
         os.makedirs(self.output_dir, exist_ok=True)
-        for i in range(generations):
-            scored = []
-            for prompt in self.population:
-                pitch = self.generator(prompt)
-                feedback_result = self.evaluator(pitch)
-                feedback = getattr(feedback_result, "output", feedback_result)
-                score = (
-                    feedback.scores.average() if getattr(feedback, "scores", None) else 0.0
-                )
-                scored.append((prompt, score, pitch, feedback))
-
-            avg_score = sum(s for _, s, _, _ in scored) / \
-                len(scored) if scored else 0.0
-            self.score_history.append(avg_score)
-
-            # log all of the scores for this generation:
-            for z in scored:
-                print(f"score:{z[1]}, prompt:{z[0]}\n")
-
-            scored.sort(key=lambda x: x[1], reverse=True)
-            best_prompt, _, best_pitch, _ = scored[0]
-            survivors = scored[: self.tournament_size]
-            new_population = [best_prompt]  # include best prompt
-
-            # TODO: implement elitism
-            for parent_prompt, _, parent_pitch, parent_feedback in survivors:
-                if random.random() < self.mutation_rate:
-                    new_population.append(
-                        llm_as_judge_mutator(
-                            parent_feedback, parent_pitch, parent_prompt)
-                    )
+        start = len(self.history)
+        for i in range(start, start + generations):
+            allow_mutation = self._plan_budget(i)
+            if allow_mutation is None:
+                break
+            candidates, duplicates = self._collapse(i, list(enumerate(self.population)))
+            candidates, screen = self._screen(candidates)
+            rungs = []
+            for level in self.fidelity_schedule:
+                rung = []
+                for j, prompt in candidates:
+                    with usage.scope(generation=i + 1, candidate=j, fidelity=level.name):
+                        rung.append(self._rung(level, prompt))
+                rungs.append(len(candidates))
+                candidates = self._promote(level, candidates, rung)
+            if self.max_fitness_samples > 1:
+                scored = self._evaluate_adaptive(i, candidates)
+            else:
+                scored = self._evaluate_candidates(i, candidates)
+            self._report_fidelity(i, rungs, len(candidates))
+            self._fit_surrogate(i, scored, screen)
+            scored = self._expand(candidates, scored, duplicates)
+
+            with get_metrics().span("select", generation=i + 1):
+                plan, best_pitch = self._select(scored, allow_mutation)
+            new_population = list(plan)
+            for entry, slots in self._offspring_requests(plan):
+                with usage.scope(generation=i + 1, candidate=slots[0]):
+                    children = self._realise(entry, len(slots))
+                self._note_lineage(entry, children)
+                for j, child in zip(slots, children):
+                    new_population[j] = child
+            self._advance(i, new_population, best_pitch)
+        return self.population
+
+    async def evolve_async(self, generations: int = 1) -> List[str]:
+        """Asynchronous :meth:`evolve` that fans out work across the population.
+
+        Generation, judging and mutation for every candidate run concurrently,
+        with at most ``concurrency`` candidates in flight at once. Selection is
+        identical to :meth:`evolve`, so ``history`` and ``score_history`` have
+        the same shape regardless of which entry point is used.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        semaphore = asyncio.Semaphore(max(1, self.concurrency))
+
+        async def rung(i: int, j: int, level: FidelityLevel, prompt: str) -> Scored:
+            async with semaphore:
+                with usage.scope(generation=i + 1, candidate=j, fidelity=level.name):
+                    return await self._rung_async(level, prompt)
+
+        async def realise(i: int, entry: PlanEntry, slots: List[int]) -> None:
+            async with semaphore:
+                with usage.scope(generation=i + 1, candidate=slots[0]):
+                    children = await self._realise_async(entry, len(slots))
+            self._note_lineage(entry, children)
+            for j, child in zip(slots, children):
+                new_population[j] = child
+
+        start = len(self.history)
+        for i in range(start, start + generations):
+            allow_mutation = self._plan_budget(i)
+            if allow_mutation is None:
+                break
+            candidates, duplicates = self._collapse(i, list(enumerate(self.population)))
+            candidates, screen = self._screen(candidates)
+            rungs = []
+            for level in self.fidelity_schedule:
+                results = list(await asyncio.gather(*(
+                    rung(i, j, level, p) for j, p in candidates
+                )))
+                rungs.append(len(candidates))
+                candidates = self._promote(level, candidates, results)
+            if self.max_fitness_samples > 1:
+                scored = await self._evaluate_adaptive_async(i, candidates, semaphore)
+            else:
+                scored = await self._evaluate_candidates_async(i, candidates, semaphore)
+            self._report_fidelity(i, rungs, len(candidates))
+            self._fit_surrogate(i, scored, screen)
+            scored = self._expand(candidates, scored, duplicates)
+
+            with get_metrics().span("select", generation=i + 1):
+                plan, best_pitch = self._select(scored, allow_mutation)
+            new_population = list(plan)
+            await asyncio.gather(*(
+                realise(i, entry, slots)
+                for entry, slots in self._offspring_requests(plan)
+            ))
+            self._advance(i, new_population, best_pitch)
+        return self.population
+
+    async def evolve_steady_state(self, evaluations: int,
+                                  window: Optional[int] = None) -> List[str]:
+        """Evolve without generation barriers.
+
+        ``concurrency`` workers each evaluate a candidate, insert it into the
+        evaluated pool (replacing the worst member once the pool holds
+        ``len(population)`` prompts) and immediately breed the next one from
+        a tournament over the pool, so no worker waits for the slowest
+        candidate. Every ``window`` evaluations (default: the population
+        size) ``history`` gets the pool best-first and ``score_history`` the
+        window's mean score, matching one generation of :meth:`evolve`;
+        throughput is recorded in ``throughput_history``. Each window is
+        checkpointed in ``journal`` so the run can be resumed.
+
+        Fidelity rungs, adaptive sampling, near-duplicate collapsing,
+        diversity repair, Pareto selection, batch judging, compaction and
+        surrogate screening work on whole generations and raise
+        ``ValueError`` here.
+        """
+        unsupported = self.steady_state_conflicts()
+        if unsupported:
+            raise ValueError(
+                f"steady-state evolution does not support {', '.join(unsupported)}")
+        os.makedirs(self.output_dir, exist_ok=True)
+        capacity = len(self.population)
+        window = max(1, window or capacity)
+        queue = list(self.population)
+        pool: List[Scored] = []
+        scores: List[float] = []
+        ready = asyncio.Event()
+        state = {"dispatched": 0, "done": 0, "stopped": False,
+                 "start": time.perf_counter(), "window_start": time.perf_counter()}
+        first_window = len(self.history)
+
+        async def candidate(n: int) -> str:
+            if queue:
+                return queue.pop(0)
+            await ready.wait()
+            entry = self._breed(pool)
+            children = await self._realise_async(entry, 1)
+            self._note_lineage(entry, children)
+            return children[0]
+
+        async def worker() -> None:
+            while state["dispatched"] < evaluations and not state["stopped"]:
+                n = state["dispatched"]
+                state["dispatched"] += 1
+                with usage.scope(generation=first_window + n // window + 1, candidate=n):
+                    prompt = await candidate(n)
+                    pitch = await self._generate_async(prompt)
+                    scored = self._score(prompt, pitch, await self._evaluate_async(pitch))
+                self._insert(pool, scored, capacity)
+                ready.set()
+                scores.append(scored[1])
+                state["done"] += 1
+                if len(scores) == window:
+                    self._close_window(pool, scores, state)
+
+        await asyncio.gather(*(worker() for _ in range(max(1, self.concurrency))))
+        if scores:
+            self._close_window(pool, scores, state)
+        return self.population
+
+    def steady_state_conflicts(self) -> List[str]:
+        """Configured options that need generation barriers."""
+        options = {
+            "fidelity_schedule": bool(self.fidelity_schedule),
+            "max_fitness_samples": self.max_fitness_samples > 1,
+            "similarity_threshold": self.similarity_threshold is not None,
+            "min_diversity": self.min_diversity > 0,
+            "selection": self.selection != "score",
+            "batch_evaluator": self._batched(),
+            "compaction_rate": self.compaction_rate > 0,
+            "surrogate": self.surrogate is not None,
+        }
+        return [name for name, enabled in options.items() if enabled]
+
+    def _breed(self, pool: List[Scored]) -> PlanEntry:
+        """A mutation of a tournament winner, or with ``crossover_rate`` a cross."""
+        can_cross = (self.crossover_rate > 0 and len(pool) >= 2
+                     and (self._crossover_fn() is not None
+                          or self.async_crossover is not None))
+        if can_cross and self.rng.random() < self.crossover_rate:
+            first = self._tournament(pool)
+            second = self._tournament([z for z in pool if z is not first])
+            return tuple((z[3], z[2], z[0]) for z in (first, second))
+        prompt, _, pitch, feedback = self._tournament(pool)
+        return (feedback, pitch, prompt)
+
+    def _tournament(self, pool: List[Scored]) -> Scored:
+        contenders = self.rng.sample(pool, min(max(1, self.tournament_size), len(pool)))
+        return max(contenders, key=lambda z: z[1])
+
+    def _insert(self, pool: List[Scored], scored: Scored, capacity: int) -> None:
+        """Add ``scored`` to the pool, replacing the worst member when full."""
+        self._record_objectives([scored])
+        self._archive([scored])
+        if any(z[0] == scored[0] for z in pool):
+            return
+        if len(pool) < capacity:
+            pool.append(scored)
+            return
+        worst = min(range(len(pool)), key=lambda n: pool[n][1])
+        if scored[1] >= pool[worst][1]:
+            pool[worst] = scored
+
+    def _close_window(self, pool: List[Scored], scores: List[float],
+                      state: Dict[str, Any]) -> None:
+        """Record one window of steady-state evaluations like a generation."""
+        i = len(self.history)
+        now = time.perf_counter()
+        ranked = sorted(pool, key=lambda z: z[1], reverse=True)
+        self.score_history.append(sum(scores) / len(scores))
+        self._advance(i, [z[0] for z in ranked], ranked[0][2])
+        report = {
+            "window": i + 1,
+            "evaluations": state["done"],
+            "window_evaluations": len(scores),
+            "evals_per_s": round(len(scores) / max(now - state["window_start"], 1e-9), 3),
+            "overall_evals_per_s": round(state["done"] / max(now - state["start"], 1e-9), 3),
+            "mean_score": self.score_history[-1],
+            "best_score": ranked[0][1],
+        }
+        self.throughput_history.append(report)
+        print(f"steady-state: window {i + 1} ({state['done']} evaluations) "
+              f"{report['evals_per_s']} evals/s, overall {report['overall_evals_per_s']} "
+              f"evals/s; mean score {report['mean_score']:.1f}, best {report['best_score']:.1f}")
+        scores.clear()
+        state["window_start"] = now
+        if self.budget is not None and not self._plan_budget(i + 1):
+            state["stopped"] = True
+
+    def _evaluate_candidates(self, i: int, candidates: List[Tuple[int, str]],
+                             samples: Optional[List[int]] = None) -> List[Scored]:
+        """Generate and judge ``(index, prompt)`` candidates at full fidelity.
+
+        ``samples`` numbers the draw for each candidate so repeated samples
+        of a prompt get fresh pitches instead of cached ones.
+        """
+        samples = samples or [0] * len(candidates)
+        scored = []
+        pitches = []
+        for (j, prompt), sample in zip(candidates, samples):
+            with usage.scope(generation=i + 1, candidate=j):
+                pitch = self._generate(prompt, sample)
+                if self._batched():
+                    pitches.append(pitch)
+                    continue
+                feedback = self._judge(pitch)
+            scored.append(self._score(prompt, pitch, feedback))
+        if self._batched():
+            with usage.scope(generation=i + 1):
+                feedbacks = self._evaluate_batch(pitches)
+            scored = [self._score(prompt, pitch, feedback) for (_, prompt), pitch, feedback
+                      in zip(candidates, pitches, feedbacks)]
+        return scored
+
+    async def _evaluate_candidates_async(self, i: int, candidates: List[Tuple[int, str]],
+                                         semaphore: asyncio.Semaphore,
+                                         samples: Optional[List[int]] = None) -> List[Scored]:
+        """Async :meth:`_evaluate_candidates`."""
+        samples = samples or [0] * len(candidates)
+
+        async def evaluate(j: int, prompt: str, sample: int) -> Scored:
+            async with semaphore:
+                with usage.scope(generation=i + 1, candidate=j):
+                    pitch = await self._generate_async(prompt, sample)
+                    feedback_result = await self._evaluate_async(pitch)
+            return self._score(prompt, pitch, feedback_result)
+
+        async def generate(j: int, prompt: str, sample: int) -> str:
+            async with semaphore:
+                with usage.scope(generation=i + 1, candidate=j):
+                    return await self._generate_async(prompt, sample)
+
+        if not self._batched():
+            return list(await asyncio.gather(*(
+                evaluate(j, p, n) for (j, p), n in zip(candidates, samples))))
+        pitches = list(await asyncio.gather(*(
+            generate(j, p, n) for (j, p), n in zip(candidates, samples))))
+        with usage.scope(generation=i + 1):
+            feedbacks = await self._evaluate_batch_async(pitches, semaphore)
+        return [self._score(prompt, pitch, feedback) for (_, prompt), pitch, feedback
+                in zip(candidates, pitches, feedbacks)]
+
+    def _evaluate_adaptive(self, i: int,
+                           candidates: List[Tuple[int, str]]) -> List[Scored]:
+        """Sample each distinct prompt until its survivor status is clear.
+
+        Every prompt gets ``min_fitness_samples`` draws; after that only
+        prompts whose confidence interval still straddles the survivor
+        cut-off are sampled again, up to ``max_fitness_samples``. Statistics
+        accumulate in ``fitness_stats`` across generations.
+        """
+        prompts, first = self._distinct(candidates)
+        drawn = 0
+        pending = self._needs_samples(prompts)
+        while pending:
+            samples = [self.fitness_stats[p].n for p in pending]
+            scored = self._evaluate_candidates(
+                i, [(first[p], p) for p in pending], samples)
+            self._add_samples(scored)
+            drawn += len(scored)
+            pending = self._needs_samples(prompts)
+        return self._sampled(i, candidates, prompts, drawn)
+
+    async def _evaluate_adaptive_async(self, i: int, candidates: List[Tuple[int, str]],
+                                       semaphore: asyncio.Semaphore) -> List[Scored]:
+        """Async :meth:`_evaluate_adaptive`; each round is sampled concurrently."""
+        prompts, first = self._distinct(candidates)
+        drawn = 0
+        pending = self._needs_samples(prompts)
+        while pending:
+            samples = [self.fitness_stats[p].n for p in pending]
+            scored = await self._evaluate_candidates_async(
+                i, [(first[p], p) for p in pending], semaphore, samples)
+            self._add_samples(scored)
+            drawn += len(scored)
+            pending = self._needs_samples(prompts)
+        return self._sampled(i, candidates, prompts, drawn)
+
+    def _distinct(self, candidates: List[Tuple[int, str]]) -> Tuple[List[str], Dict[str, int]]:
+        first: Dict[str, int] = {}
+        for j, prompt in candidates:
+            first.setdefault(prompt, j)
+            self.fitness_stats.setdefault(prompt, FitnessStats())
+        return list(first), first
+
+    def _needs_samples(self, prompts: List[str]) -> List[str]:
+        stats = [self.fitness_stats[p] for p in prompts]
+        open_ = set(sampling.undecided(stats, self.tournament_size,
+                                       sampling.z_score(self.fitness_confidence)))
+        return [p for n, (p, s) in enumerate(zip(prompts, stats))
+                if s.n < min(self.min_fitness_samples, self.max_fitness_samples)
+                or (n in open_ and s.n < self.max_fitness_samples)]
+
+    def _add_samples(self, scored: List[Scored]) -> None:
+        for prompt, score, pitch, feedback in scored:
+            self.fitness_stats[prompt].add(score, pitch, feedback)
+
+    def _sampled(self, i: int, candidates: List[Tuple[int, str]],
+                 prompts: List[str], drawn: int) -> List[Scored]:
+        """Score candidates by their sample means and report sampling cost."""
+        report = {
+            "generation": i + 1,
+            "prompts": len(prompts),
+            "samples": drawn,
+            "fixed_samples": len(prompts) * self.max_fitness_samples,
+        }
+        self.sampling_history.append(report)
+        print(f"sampling: generation {i + 1} drew {drawn} samples for "
+              f"{len(prompts)} prompts (fixed-N would draw {report['fixed_samples']})")
+        scored = []
+        for _, prompt in candidates:
+            s = self.fitness_stats[prompt]
+            scored.append((prompt, s.mean, s.pitch, s.feedback))
+        return scored
+
+    def _rung(self, level: FidelityLevel, prompt: str) -> Scored:
+        """Generate and judge ``prompt`` at ``level``'s fidelity."""
+        if level.generator is None:
+            pitch = self._generate(prompt)
+        else:
+            pitch = self._cached(f"generate:{level.name}", (prompt,),
+                                 lambda: level.generator(prompt))
+        if level.evaluator is None:
+            feedback = self._judge(pitch)
+        else:
+            feedback = self._cached(f"evaluate:{level.name}", (pitch,),
+                                    lambda: _unwrap(level.evaluator(pitch)))
+        return self._score(prompt, pitch, feedback)
+
+    async def _rung_async(self, level: FidelityLevel, prompt: str) -> Scored:
+        """Async :meth:`_rung`."""
+        if level.generator is None and level.async_generator is None:
+            pitch = await self._generate_async(prompt)
+        else:
+            async def generate() -> str:
+                if level.async_generator is not None:
+                    return await level.async_generator(prompt)
+                return await asyncio.to_thread(level.generator, prompt)
+            pitch = await self._acached(f"generate:{level.name}", (prompt,), generate)
+        if level.evaluator is None and level.async_evaluator is None:
+            feedback = await self._evaluate_async(pitch)
+        else:
+            async def evaluate() -> Any:
+                if level.async_evaluator is not None:
+                    return _unwrap(await level.async_evaluator(pitch))
+                return _unwrap(await asyncio.to_thread(level.evaluator, pitch))
+            feedback = await self._acached(f"evaluate:{level.name}", (pitch,), evaluate)
+        return self._score(prompt, pitch, feedback)
+
+    def _promote(self, level: FidelityLevel, candidates: List[Tuple[int, str]],
+                 scored: List[Scored]) -> List[Tuple[int, str]]:
+        """Keep the best ``level.keep`` fraction of ``candidates``.
+
+        At least ``tournament_size`` candidates are promoted so selection
+        always has full-fidelity survivors to choose from.
+        """
+        keep = max(1, self.tournament_size, math.ceil(level.keep * len(candidates)))
+        order = sorted(range(len(scored)), key=lambda n: scored[n][1], reverse=True)
+        promoted = sorted(order[:keep])
+        print(f"fidelity {level.name}: promoted {len(promoted)}/{len(candidates)}")
+        return [candidates[n] for n in promoted]
+
+    def _report_fidelity(self, i: int, rungs: List[int], promoted: int) -> None:
+        if not self.fidelity_schedule:
+            return
+        report = fidelity_report(usage.get_usage_tracker(), i + 1,
+                                 len(self.population), rungs, promoted)
+        self.fidelity_history.append(report)
+        print(f"fidelity: generation {i + 1} judged {promoted}/{report['population']} "
+              f"at full fidelity; saved {report['evaluations_saved']} full evaluations, "
+              f"{report['calls_saved']} calls and {report['tokens_saved']} tokens "
+              f"vs flat evaluation")
+
+    def _screen(self, candidates: List[Tuple[int, str]]
+                ) -> Tuple[List[Tuple[int, str]], Dict[str, Any]]:
+        """Drop the never-evaluated prompts the surrogate rates worst.
+
+        Returns the candidates to evaluate and the screening record (the
+        surrogate's prediction for every prompt and how many were skipped)
+        that :meth:`_fit_surrogate` compares with the judge. At least
+        ``tournament_size`` candidates are kept.
+        """
+        if self.surrogate is None:
+            return candidates, {}
+        prompts = list(dict.fromkeys(p for _, p in candidates))
+        screen = {"predicted": dict(zip(prompts, self.surrogate.predict(prompts))),
+                  "skipped": 0}
+        trusted = [r["spearman"] for r in self.surrogate_history if r["spearman"] is not None]
+        if (self.surrogate.n < self.surrogate_min_samples or not trusted
+                or trusted[-1] < self.surrogate_min_correlation):
+            return candidates, screen
+        new = [n for n, (_, p) in enumerate(candidates) if p not in self.objectives]
+        keep = max(math.ceil(self.surrogate_keep * len(new)),
+                   self.tournament_size - (len(candidates) - len(new)))
+        ranked = sorted(new, key=lambda n: screen["predicted"][candidates[n][1]],
+                        reverse=True)
+        dropped = set(ranked[max(0, keep):])
+        if dropped:
+            print(f"surrogate: skipped {len(dropped)}/{len(new)} new prompts "
+                  f"predicted to score lowest")
+        screen["skipped"] = len(dropped)
+        return [c for n, c in enumerate(candidates) if n not in dropped], screen
+
+    def _fit_surrogate(self, i: int, scored: List[Scored], screen: Dict[str, Any]) -> None:
+        """Track the surrogate's rank correlation with the judge, then train it.
+
+        Both use only prompts judged for the first time, so the correlation
+        is measured on prompts the surrogate has never seen.
+        """
+        if self.surrogate is None:
+            return
+        judged = dict((prompt, score) for prompt, score, _, _ in scored)
+        new = [p for p in judged if p not in self.objectives]
+        correlation = None
+        if self.surrogate.n and len(new) >= 2:
+            correlation = round(spearman([screen["predicted"][p] for p in new],
+                                         [judged[p] for p in new]), 3)
+        report = {
+            "generation": i + 1,
+            "trained_on": self.surrogate.n,
+            "evaluated": len(judged),
+            "skipped": screen["skipped"],
+            "spearman": correlation,
+        }
+        self.surrogate_history.append(report)
+        if correlation is not None:
+            print(f"surrogate: generation {i + 1} rank correlation {correlation} over "
+                  f"{len(new)} new prompts (trained on {report['trained_on']} scores)")
+        self.surrogate.update(new, [judged[p] for p in new])
+
+    def _plan_budget(self, i: int) -> Optional[bool]:
+        """Apply the budget governor before generation ``i``.
+
+        Shrinks the population if needed and returns whether mutation is
+        allowed, or ``None`` when the budget cannot cover another generation.
+        """
+        if self.budget is None:
+            return True
+        size, allow_mutation = self.budget.plan(i + 1, len(self.population))
+        if size <= 0:
+            return None
+        self.population = self.population[:size]
+        return allow_mutation
+
+    def _cache_context(self, kind: str) -> Any:
+        """Key material identifying the agent behind ``kind``.
+
+        Defaults to the judge/mutator agents' model and settings when the
+        built-in callables are in use, resolved lazily on first lookup.
+        """
+        if kind not in self.cache_context:
+            if kind == "evaluate" and self._batched():
+                if (self.batch_evaluator is llm_as_batch_judge
+                        and self.async_batch_evaluator is None):
+                    # Comparative scores depend on the batch, so batched
+                    # judgements never mix with single-pitch ones.
+                    self.cache_context[kind] = {
+                        "batch": agent_fingerprint(get_batch_judge_agent()),
+                        "batch_size": self.judge_batch_size,
+                    }
+            elif (kind == "evaluate" and self.evaluator is llm_as_judge
+                    and self.async_evaluator is None):
+                self.cache_context[kind] = agent_fingerprint(get_judge_agent())
+            elif (kind == "mutate" and self.mutator is llm_as_judge_mutator
+                    and self.async_mutator is None):
+                self.cache_context[kind] = agent_fingerprint(get_mutator_agent())
+            elif (kind == "offspring" and self.async_offspring_mutator is None
+                    and self._offspring_fn() is llm_as_judge_offspring):
+                self.cache_context[kind] = agent_fingerprint(get_offspring_agent())
+            elif (kind == "crossover" and self.async_crossover is None
+                    and self._crossover_fn() is llm_as_crossover):
+                self.cache_context[kind] = agent_fingerprint(get_crossover_agent())
+            elif (kind == "compact" and self.compactor is None
+                    and self.async_compactor is None):
+                self.cache_context[kind] = agent_fingerprint(get_compaction_agent())
+        return self.cache_context.get(kind)
+
+    def _cache_for(self, kind: str) -> Optional[FitnessCache]:
+        """The cache serving ``kind``; variation calls bypass it by default.
+
+        A survivor's mutation inputs repeat every generation, so a cached
+        mutation would give the same child each time and stall its lineage.
+        The journal still records them for resuming.
+        """
+        if kind.split(":", 1)[0] in _VARIATION_KINDS and not self.cache_variation:
+            return None
+        return self.cache
+
+    def _cached(self, kind: str, parts: Tuple[Any, ...],
+                compute: Callable[[], Any]) -> Any:
+        def timed() -> Any:
+            with get_metrics().span(_stage(kind)):
+                return compute()
+
+        cache = self._cache_for(kind)
+        if cache is None and self.journal is None:
+            return timed()
+        key = make_key(kind, *parts, context=self._cache_context(kind))
+        if self.journal is not None:
+            found, value = self.journal.replay(key)
+            if found:
+                return value
+        if cache is not None:
+            value = cache.get_or_compute(key, timed)
+        else:
+            value = timed()
+        if self.journal is not None:
+            self.journal.record_call(kind, key, value)
+        return value
+
+    async def _acached(self, kind: str, parts: Tuple[Any, ...],
+                       compute: Callable[[], Awaitable[Any]]) -> Any:
+        async def timed() -> Any:
+            with get_metrics().span(_stage(kind)):
+                return await compute()
+
+        cache = self._cache_for(kind)
+        if cache is None and self.journal is None:
+            return await timed()
+        key = make_key(kind, *parts, context=self._cache_context(kind))
+        if self.journal is not None:
+            found, value = self.journal.replay(key)
+            if found:
+                return value
+        if cache is not None:
+            value = await cache.aget_or_compute(key, timed)
+        else:
+            value = await timed()
+        if self.journal is not None:
+            self.journal.record_call(kind, key, value)
+        return value
+
+    def _batched(self) -> bool:
+        return self.batch_evaluator is not None or self.async_batch_evaluator is not None
+
+    def _pending_judgements(self, pitches: List[str]) -> Tuple[List[Any], Dict[str, List[int]]]:
+        """Group ``pitches`` by unique pitch for judging.
+
+        Returns the feedback list (``None`` where still missing) and a map
+        from each pitch that needs judging to its positions in ``pitches``.
+        Empty pitches (aborted generations) fail without being judged.
+        """
+        feedbacks: List[Any] = [None] * len(pitches)
+        todo: Dict[str, List[int]] = {}
+        for n, pitch in enumerate(pitches):
+            if not pitch:
+                feedbacks[n] = JudgeFeedback()
+            else:
+                todo.setdefault(pitch, []).append(n)
+        return feedbacks, todo
+
+    def _judge_batches(self, todo: Dict[str, List[int]]) -> List[List[str]]:
+        pitches = list(todo)
+        size = max(1, self.judge_batch_size)
+        return [pitches[k:k + size] for k in range(0, len(pitches), size)]
+
+    def _record_judgements(self, feedbacks: List[Any], todo: Dict[str, List[int]],
+                           chunk: List[str], judgement: BatchJudgement) -> None:
+        for rank, index in enumerate(judgement.ranking):
+            self.batch_ranks[chunk[index]] = (len(chunk) - rank) / len(chunk)
+        for pitch, feedback in zip(chunk, judgement.feedback):
+            for n in todo[pitch]:
+                feedbacks[n] = feedback
+
+    def _evaluate_batch(self, pitches: List[str]) -> List[Any]:
+        """Judge ``pitches`` with ``batch_evaluator``, ``judge_batch_size`` per call.
+
+        Engines given only ``async_batch_evaluator`` run it to completion for
+        each batch. Duplicate pitches are judged once. Verdicts are cached and journaled
+        per batch: scores are relative to the other pitches in the batch, so
+        a pitch's verdict is only reused when its whole batch recurs.
+        """
+        feedbacks, todo = self._pending_judgements(pitches)
+        for chunk in self._judge_batches(todo):
+            judgement = self._cached("evaluate", ("batch", *chunk), lambda: _unwrap_batch(
+                self.batch_evaluator(chunk) if self.batch_evaluator is not None
+                else asyncio.run(self.async_batch_evaluator(chunk)), len(chunk)))
+            self._record_judgements(feedbacks, todo, chunk, judgement)
+        return feedbacks
+
+    async def _evaluate_batch_async(self, pitches: List[str],
+                                    semaphore: asyncio.Semaphore) -> List[Any]:
+        """Async :meth:`_evaluate_batch`; batches are judged concurrently."""
+        feedbacks, todo = self._pending_judgements(pitches)
+
+        async def judge(chunk: List[str]) -> None:
+            async def compute() -> BatchJudgement:
+                async with semaphore:
+                    if self.async_batch_evaluator is not None:
+                        result = await self.async_batch_evaluator(chunk)
+                    elif self.batch_evaluator is llm_as_batch_judge:
+                        result = await llm_as_batch_judge_async(chunk)
+                    else:
+                        result = await asyncio.to_thread(self.batch_evaluator, chunk)
+                return _unwrap_batch(result, len(chunk))
+
+            judgement = await self._acached("evaluate", ("batch", *chunk), compute)
+            self._record_judgements(feedbacks, todo, chunk, judgement)
+
+        await asyncio.gather(*(judge(c) for c in self._judge_batches(todo)))
+        return feedbacks
+
+    def _offspring_fn(self) -> Optional[OffspringFn]:
+        if self.offspring_mutator is not None or self.async_offspring_mutator is not None:
+            return self.offspring_mutator
+        if self.mutator is llm_as_judge_mutator and self.async_mutator is None:
+            return llm_as_judge_offspring
+        return None
+
+    def _crossover_fn(self) -> Optional[CrossoverFn]:
+        if self.crossover is not None or self.async_crossover is not None:
+            return self.crossover
+        if self.mutator is llm_as_judge_mutator and self.async_mutator is None:
+            return llm_as_crossover
+        return None
+
+    def _bulk(self) -> bool:
+        return (self._offspring_fn() is not None
+                or self.async_offspring_mutator is not None)
+
+    def _offspring_for(self, k: int) -> bool:
+        """Whether ``k`` children of one parent come from one offspring request.
+
+        A lone child of the built-in mutator still comes from the
+        single-child mutator agent.
+        """
+        if k == 1 and self._offspring_fn() is llm_as_judge_offspring:
+            return False
+        return self._bulk()
+
+    def _fill(self, entry: PlanEntry, children: List[str], k: int) -> List[str]:
+        """Top ``children`` up to ``k`` with single mutations of the (first) parent."""
+        parent = entry[0] if _is_crossover(entry) else entry
+        return children + [self._cached("mutate", parent, lambda: self.mutator(*parent))
+                           for _ in range(k - len(children))]
+
+    async def _fill_async(self, entry: PlanEntry, children: List[str], k: int) -> List[str]:
+        """Async :meth:`_fill`."""
+        parent = entry[0] if _is_crossover(entry) else entry
+        return children + [await self._mutate_async(*parent)
+                           for _ in range(k - len(children))]
+
+    def _offspring_requests(self, plan: List[PlanEntry]) -> List[Tuple[PlanEntry, List[int]]]:
+        """Group the pending operations in ``plan`` into mutator requests.
+
+        Returns ``(entry, slots)`` pairs: one request per distinct crossover
+        pair and, with a multi-offspring mutator, per distinct parent, each
+        producing ``len(slots)`` children. Single-child mutations get one
+        request per slot.
+        """
+        requests: List[Tuple[PlanEntry, List[int]]] = []
+        bulk = self._bulk()
+        for j, entry in enumerate(plan):
+            if isinstance(entry, str):
+                continue
+            if bulk or _is_crossover(entry) or isinstance(entry, Compaction):
+                for existing, slots in requests:
+                    if existing == entry:
+                        slots.append(j)
+                        break
                 else:
-                    new_population.append(parent_prompt)
-
-            while len(new_population) < len(self.population):
-                parent, _, _, suggestion = random.choice(survivors)
-                if suggestion and random.random() < self.mutation_rate:
-                    new_population.append(
-                        llm_as_judge_mutator(
-                            parent_feedback, parent_pitch, parent_prompt)
-                    )
+                    requests.append((entry, [j]))
+            else:
+                requests.append((entry, [j]))
+        return requests
+
+    def _realise(self, entry: PlanEntry, k: int) -> List[str]:
+        """Produce ``k`` children for a crossover pair or a mutation entry."""
+        if isinstance(entry, Compaction):
+            compactor = self.compactor or llm_as_prompt_compactor
+            child = self._cached("compact", entry.parent,
+                                 lambda: compactor(*entry.parent))
+            return [child] * k
+        if _is_crossover(entry):
+            crossover = self._crossover_fn()
+            children = self._cached("crossover", (*entry[0], *entry[1], k),
+                                    lambda: crossover(list(entry), k))
+            return self._fill(entry, fit_offspring(children, k), k)
+        offspring = self._offspring_fn()
+        if offspring is not None and self._offspring_for(k):
+            children = self._cached("offspring", (*entry, k),
+                                    lambda: offspring(*entry, k))
+            return self._fill(entry, fit_offspring(children, k), k)
+        return [self._cached("mutate", entry, lambda: self.mutator(*entry))
+                for _ in range(k)]
+
+    async def _realise_async(self, entry: PlanEntry, k: int) -> List[str]:
+        """Async :meth:`_realise`."""
+        if isinstance(entry, Compaction):
+            async def compact() -> str:
+                if self.async_compactor is not None:
+                    return await self.async_compactor(*entry.parent)
+                if self.compactor is None:
+                    return await llm_as_prompt_compactor_async(*entry.parent)
+                return await asyncio.to_thread(self.compactor, *entry.parent)
+            return [await self._acached("compact", entry.parent, compact)] * k
+        if _is_crossover(entry):
+            async def cross() -> List[str]:
+                if self.async_crossover is not None:
+                    return await self.async_crossover(list(entry), k)
+                if self._crossover_fn() is llm_as_crossover:
+                    return await llm_as_crossover_async(list(entry), k)
+                return await asyncio.to_thread(self.crossover, list(entry), k)
+            children = await self._acached(
+                "crossover", (*entry[0], *entry[1], k), cross)
+            return await self._fill_async(entry, fit_offspring(children, k), k)
+        if self._offspring_for(k):
+            async def offspring() -> List[str]:
+                if self.async_offspring_mutator is not None:
+                    return await self.async_offspring_mutator(*entry, k)
+                if self._offspring_fn() is llm_as_judge_offspring:
+                    return await llm_as_judge_offspring_async(*entry, k)
+                return await asyncio.to_thread(self.offspring_mutator, *entry, k)
+            children = await self._acached("offspring", (*entry, k), offspring)
+            return await self._fill_async(entry, fit_offspring(children, k), k)
+        return [await self._mutate_async(*entry) for _ in range(k)]
+
+    async def _generate_async(self, prompt: str, sample: int = 0) -> str:
+        async def compute() -> Dict[str, Any]:
+            with usage.meter() as records:
+                start = time.perf_counter()
+                if self.stream_generator is not None:
+                    pitch = await self._stream(prompt)
+                elif self.async_generator is not None:
+                    pitch = await self._within_time(self.async_generator(prompt))
                 else:
-                    new_population.append(parent)
+                    pitch = await self._within_time(asyncio.to_thread(self.generator, prompt))
+            return _generation(pitch, time.perf_counter() - start, records)
+        try:
+            return self._generated(prompt, await self._acached(
+                "generate", _generate_parts(prompt, sample), compute))
+        except GenerationAborted as exc:
+            return self._abort(prompt, str(exc))
 
-            self.history.append(new_population)
-            self.population = new_population
+    def _generate(self, prompt: str, sample: int = 0) -> str:
+        try:
+            return self._generated(prompt, self._cached(
+                "generate", _generate_parts(prompt, sample),
+                lambda: self._measure(prompt, self.generator)))
+        except GenerationAborted as exc:
+            return self._abort(prompt, str(exc))
 
-            # write best prompt (after mutation) and best pitch
-            prompt_path = os.path.join(
-                self.output_dir, f"generation_{i + 1}_prompt.txt"
-            )
-            pitch_path = os.path.join(
-                self.output_dir, f"generation_{i + 1}_pitch.txt"
+    def _measure(self, prompt: str, generator: GeneratorFn) -> Dict[str, Any]:
+        """Generate a pitch from ``prompt`` along with what it cost."""
+        with usage.meter() as records:
+            start = time.perf_counter()
+            if self.stream_generator is not None:
+                pitch = asyncio.run(self._stream(prompt))
+            else:
+                pitch = self._within_length(generator(prompt))
+        return _generation(pitch, time.perf_counter() - start, records)
+
+    def _generated(self, prompt: str, value: Any) -> str:
+        """The pitch of a fresh, cached or replayed generation.
+
+        Its measured cost is cached with it and recorded on every use, so
+        hits cost what generating did. Plain pitches cached before costs were
+        stored have an unknown cost.
+        """
+        if isinstance(value, dict):
+            self._observe(prompt, value["latency_s"], value["writer_tokens"])
+            return value["pitch"]
+        return value
+
+    async def _stream(self, prompt: str) -> str:
+        """Consume ``stream_generator``, cancelling it once over budget."""
+        async def consume() -> str:
+            stream = self.stream_generator(prompt)
+            pitch = ""
+            try:
+                async for pitch in stream:
+                    if self.max_pitch_chars is not None and len(pitch) > self.max_pitch_chars:
+                        raise GenerationAborted(
+                            f"longer than {self.max_pitch_chars} characters")
+            finally:
+                await stream.aclose()
+            return pitch
+        return await self._within_time(consume())
+
+    async def _within_time(self, generation: Awaitable[str]) -> str:
+        try:
+            pitch = await asyncio.wait_for(generation, self.generation_timeout)
+        except asyncio.TimeoutError:
+            raise GenerationAborted(
+                f"still running after {self.generation_timeout}s") from None
+        return self._within_length(pitch)
+
+    def _within_length(self, pitch: str) -> str:
+        if self.max_pitch_chars is not None and len(pitch) > self.max_pitch_chars:
+            raise GenerationAborted(f"longer than {self.max_pitch_chars} characters")
+        return pitch
+
+    def _abort(self, prompt: str, reason: str) -> str:
+        """Record an aborted generation; its empty pitch fails unjudged.
+
+        Aborts propagate out of the cached call, so they are never cached or
+        journaled and a later draw of the prompt generates afresh.
+        """
+        self.aborted_generations.append({
+            "generation": usage.usage_scope.get().get("generation"),
+            "prompt": prompt,
+            "reason": reason,
+        })
+        print(f"aborted generation ({reason}): {prompt[:60]!r}")
+        return ""
+
+    def _judge(self, pitch: str) -> Any:
+        if not pitch:
+            return JudgeFeedback()
+        return self._cached("evaluate", (pitch,), lambda: _unwrap(self.evaluator(pitch)))
+
+    def _observe(self, prompt: str, elapsed: float, tokens: float) -> None:
+        cost = self.generation_costs.setdefault(
+            prompt, {"generations": 0, "latency_s": 0.0, "writer_tokens": 0.0})
+        cost["generations"] += 1
+        n = cost["generations"]
+        cost["latency_s"] += (elapsed - cost["latency_s"]) / n
+        cost["writer_tokens"] += (tokens - cost["writer_tokens"]) / n
+
+    async def _evaluate_async(self, pitch: str) -> Any:
+        if not pitch:
+            return JudgeFeedback()
+
+        async def compute() -> Any:
+            if self.async_evaluator is not None:
+                return _unwrap(await self.async_evaluator(pitch))
+            if self.evaluator is llm_as_judge:
+                return _unwrap(await llm_as_judge_async(pitch))
+            return _unwrap(await asyncio.to_thread(self.evaluator, pitch))
+        return await self._acached("evaluate", (pitch,), compute)
+
+    async def _mutate_async(self, feedback: Any, pitch: str, prompt: str) -> str:
+        async def compute() -> str:
+            if self.async_mutator is not None:
+                return await self.async_mutator(feedback, pitch, prompt)
+            if self.mutator is llm_as_judge_mutator:
+                return await llm_as_judge_mutator_async(feedback, pitch, prompt)
+            return await asyncio.to_thread(self.mutator, feedback, pitch, prompt)
+        return await self._acached("mutate", (feedback, pitch, prompt), compute)
+
+    @staticmethod
+    def _score(prompt: str, pitch: str, feedback_result: Any) -> Scored:
+        feedback = _unwrap(feedback_result)
+        score = (
+            feedback.scores.average() if getattr(feedback, "scores", None) else 0.0
+        )
+        return (prompt, score, pitch, feedback)
+
+    def _select(self, scored: List[Scored],
+                allow_mutation: bool = True) -> Tuple[List[PlanEntry], str]:
+        """Record scores and plan the next population from ``scored``.
+
+        Returns the plan for the next population, where each entry is either
+        a prompt to keep, the arguments for a mutator call or, with
+        ``crossover_rate`` / ``compaction_rate``, a pair of survivors to
+        cross or a survivor to compact, along with the best pitch of the
+        generation. With ``allow_mutation`` off, parents that would have
+        been mutated are carried over unchanged.
+        """
+        avg_score = sum(s for _, s, _, _ in scored) / \
+            len(scored) if scored else 0.0
+        self.score_history.append(avg_score)
+
+        # log all of the scores for this generation:
+        for z in scored:
+            print(f"score:{z[1]}, prompt:{z[0]}\n")
+        if self.cache is not None:
+            print(f"cache: {self.cache.stats()}")
+
+        self._record_objectives(scored)
+        self._archive(scored)
+        if self.selection == "pareto":
+            scored = self._pareto_order(scored)
+        else:
+            # The batch ranking breaks ties, where cross-batch drift in
+            # absolute scores matters most.
+            scored.sort(key=lambda x: (x[1], self.batch_ranks.get(x[2], 0.0)), reverse=True)
+        best_prompt, _, best_pitch, _ = scored[0]
+        survivors = scored[: self.tournament_size]
+        plan: List[PlanEntry] = [best_prompt]  # include best prompt
+
+        # TODO: implement elitism
+        for parent_prompt, _, parent_pitch, parent_feedback in survivors:
+            if self.rng.random() < self.mutation_rate:
+                plan.append((parent_feedback, parent_pitch, parent_prompt))
+            else:
+                plan.append(parent_prompt)
+
+        can_cross = (self.crossover_rate > 0 and len(survivors) >= 2
+                     and (self._crossover_fn() is not None
+                          or self.async_crossover is not None))
+        compacted = set()
+        while len(plan) < len(self.population):
+            if can_cross and self.rng.random() < self.crossover_rate:
+                # Keep pairs in rank order so repeats share one request.
+                pair = sorted(self.rng.sample(range(len(survivors)), 2))
+                plan.append(tuple(
+                    (survivors[n][3], survivors[n][2], survivors[n][0]) for n in pair))
+                continue
+            parent_prompt, _, parent_pitch, parent_feedback = self.rng.choice(survivors)
+            if (self.compaction_rate > 0 and parent_feedback
+                    and self.rng.random() < self.compaction_rate
+                    and parent_prompt not in compacted):
+                # One compaction per parent: it would return the same prompt.
+                compacted.add(parent_prompt)
+                plan.append(Compaction((parent_feedback, parent_pitch, parent_prompt)))
+                continue
+            if parent_feedback and self.rng.random() < self.mutation_rate:
+                plan.append((parent_feedback, parent_pitch, parent_prompt))
+            else:
+                plan.append(parent_prompt)
+        # The best prompt and survivors alone can outnumber a population the
+        # budget governor has shrunk; never let the plan grow it back.
+        plan = plan[:len(self.population)]
+        if not allow_mutation:
+            plan = [_parent_prompt(e) for e in plan]
+        elif self.min_diversity > 0:
+            plan = self._diversify(plan, scored)
+        return plan, best_pitch
+
+    def _record_objectives(self, scored: List[Scored]) -> None:
+        for prompt, score, _, _ in scored:
+            cost = self.generation_costs.get(prompt)
+            self.objectives[prompt] = {
+                "prompt": prompt,
+                "score": score,
+                "prompt_tokens": count_tokens(prompt),
+                # None when no generation of the prompt was measured.
+                "latency_s": round(cost["latency_s"], 4) if cost else None,
+                "writer_tokens": round(cost["writer_tokens"], 1) if cost else None,
+            }
+
+    def _archive(self, scored: List[Scored]) -> None:
+        if self.archive is None:
+            return
+        generation = len(self.history) + 1
+        seen = set()
+        for prompt, score, pitch, feedback in scored:
+            if prompt in seen:
+                continue
+            seen.add(prompt)
+            origin = self.lineage.get(prompt, {})
+            self.archive.record(
+                self.run_id, generation, prompt, pitch, score, feedback,
+                sources=self.pitch_sources.get(pitch),
+                parents=origin.get("parents", ()), operator=origin.get("operator"))
+
+    def _note_lineage(self, entry: PlanEntry, children: List[str]) -> None:
+        if isinstance(entry, Compaction):
+            parents, operator = [entry.parent[2]], "compact"
+        elif _is_crossover(entry):
+            parents, operator = [p[2] for p in entry], "crossover"
+        else:
+            parents, operator = [entry[2]], "mutate"
+        for child in children:
+            if child not in parents:
+                self.lineage.setdefault(child, {"parents": parents, "operator": operator})
+
+    def _pareto_order(self, scored: List[Scored]) -> List[Scored]:
+        """Rank ``scored`` by non-dominated front, then crowding distance."""
+        points = _objective_points([self.objectives[z[0]] for z in scored])
+        fronts = non_dominated_fronts(points)
+        print(f"pareto: {len(fronts)} fronts, sizes {[len(f) for f in fronts]}")
+        return [scored[n] for n in nsga2_order(points)]
+
+    def pareto_front(self) -> List[Dict[str, Any]]:
+        """Non-dominated prompts over every evaluation so far, best score first.
+
+        Objectives are the latest judge score (maximised) and the prompt's
+        token length, mean generation latency and mean writer tokens
+        (minimised). Costs of prompts without a measured generation are
+        ``None``.
+        """
+        records = list(self.objectives.values())
+        if not records:
+            return []
+        front = non_dominated_fronts(_objective_points(records))[0]
+        return sorted((records[n] for n in front), key=lambda r: -r["score"])
+
+    def _collapse(self, i: int, candidates: List[Tuple[int, str]]
+                  ) -> Tuple[List[Tuple[int, str]], Dict[int, int]]:
+        """Drop exact and near-duplicate prompts before evaluation.
+
+        Returns the representative candidates and a map from each dropped
+        candidate's index to its representative's; see :meth:`_expand`.
+        """
+        if self.similarity_threshold is None or len(candidates) < 2:
+            return candidates, {}
+        prompts = [p for _, p in candidates]
+        reps = SimilarityIndex(prompts).groups(self.similarity_threshold)
+        kept = [c for n, c in enumerate(candidates) if reps[n] == n]
+        duplicates = {candidates[n][0]: candidates[r][0]
+                      for n, r in enumerate(reps) if r != n}
+        exact = sum(prompts[r] == prompts[n] for n, r in enumerate(reps) if r != n)
+        report = {
+            "generation": i + 1,
+            "threshold": self.similarity_threshold,
+            "population": len(candidates),
+            "distinct": len(kept),
+            "exact_duplicates": exact,
+            "near_duplicates": len(duplicates) - exact,
+            "injected": 0,
+        }
+        self.dedup_history.append(report)
+        print(f"dedup: generation {i + 1} {len(kept)}/{len(candidates)} distinct prompts "
+              f"({exact} exact, {len(duplicates) - exact} near duplicates at "
+              f">= {self.similarity_threshold} cosine); skipped {len(duplicates)} evaluations")
+        return kept, duplicates
+
+    def _expand(self, candidates: List[Tuple[int, str]], scored: List[Scored],
+                duplicates: Dict[int, int]) -> List[Scored]:
+        """Give each collapsed duplicate its representative's evaluation.
+
+        Duplicates of candidates that were not fully evaluated (e.g. dropped
+        at a low-fidelity rung) are dropped with them.
+        """
+        if not duplicates:
+            return scored
+        by_index = {j: z for (j, _), z in zip(candidates, scored)}
+        for j, rep_j in sorted(duplicates.items()):
+            if rep_j in by_index:
+                rep_prompt, score, pitch, feedback = by_index[rep_j]
+                by_index[j] = (self.population[j], score, pitch, feedback)
+                # The duplicate would cost about what its representative did.
+                if rep_prompt in self.generation_costs:
+                    self.generation_costs.setdefault(
+                        self.population[j], dict(self.generation_costs[rep_prompt]))
+        return [by_index[j] for j in sorted(by_index)]
+
+    def _diversify(self, plan: List[PlanEntry], scored: List[Scored]) -> List[PlanEntry]:
+        """Turn duplicate carry-overs into mutations when the plan collapses.
+
+        If fewer than ``min_diversity`` of the planned prompts are distinct
+        (pending mutations count as distinct), later copies of a kept prompt
+        are mutated instead of copied until the floor is met.
+        """
+        prompts = [_parent_prompt(e) for e in plan]
+        reps = SimilarityIndex(prompts).groups(self.similarity_threshold or 1.0)
+        distinct = sum(1 for n, e in enumerate(plan)
+                       if not isinstance(e, str) or reps[n] == n)
+        needed = math.ceil(self.min_diversity * len(plan)) - distinct
+        parents = {prompt: (feedback, pitch) for prompt, _, pitch, feedback in scored}
+        plan = list(plan)
+        injected = 0
+        for n, entry in enumerate(plan):
+            if injected >= needed:
+                break
+            if isinstance(entry, str) and reps[n] != n and parents.get(entry, (None,))[0]:
+                feedback, pitch = parents[entry]
+                plan[n] = (feedback, pitch, entry)
+                injected += 1
+        if injected:
+            print(f"diversity: {distinct}/{len(plan)} distinct planned prompts; "
+                  f"mutating {injected} duplicates")
+            generation = len(self.history) + 1
+            if self.dedup_history and self.dedup_history[-1]["generation"] == generation:
+                self.dedup_history[-1]["injected"] = injected
+        return plan
+
+    def _advance(self, i: int, new_population: List[str], best_pitch: str) -> None:
+        self.history.append(new_population)
+        self.population = new_population
+        with get_metrics().span("output", generation=i + 1):
+            self._write_outputs(i, new_population, best_pitch)
+
+        if self.journal is not None:
+            self.journal.record_generation(
+                i + 1, new_population, self.score_history[-1], best_pitch,
+                rng_state_to_json(self.rng.getstate()),
             )
-            best_prompt_text = new_population[0]
-            with open(prompt_path, "w", encoding="utf-8") as f:
-                f.write(best_prompt_text)
-            with open(pitch_path, "w", encoding="utf-8") as f:
-                f.write(best_pitch)
-        return self.population
+
+    def _write_outputs(self, i: int, new_population: List[str], best_pitch: str) -> None:
+        # write best prompt (after mutation) and best pitch
+        prompt_path = os.path.join(
+            self.output_dir, f"generation_{i + 1}_prompt.txt"
+        )
+        pitch_path = os.path.join(
+            self.output_dir, f"generation_{i + 1}_pitch.txt"
+        )
+        best_prompt_text = new_population[0]
+        with open(prompt_path, "w", encoding="utf-8") as f:
+            f.write(best_prompt_text)
+        with open(pitch_path, "w", encoding="utf-8") as f:
+            f.write(best_pitch)
+
+        tracker = usage.get_usage_tracker()
+        tracker.write(os.path.join(self.output_dir, "usage.json"))
+        generation_usage = tracker.totals_by("generation").get(i + 1, {})
+        print(f"usage: generation {i + 1} tokens={generation_usage.get('tokens', 0)} "
+              f"cost=${generation_usage.get('cost', 0.0):.4f}; run total "
+              f"tokens={tracker.total_tokens} cost=${tracker.total_cost:.4f}")
+        get_metrics().write(os.path.join(self.output_dir, "metrics.json"))
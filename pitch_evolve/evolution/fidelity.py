@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from pitch_evolve.agents.usage import UsageTracker
+
+
+@dataclass
+class FidelityLevel:
+    """One low-fidelity rung of a successive-halving schedule.
+
+    Every candidate that reaches the rung is generated and judged with the
+    rung's (cheaper) callables; only the best ``keep`` fraction moves on to
+    the next rung and finally to the engine's full-fidelity evaluation.
+    Callables left as ``None`` fall back to the engine's own.
+    """
+
+    name: str
+    keep: float = 0.5
+    generator: Optional[Callable[[str], str]] = None
+    async_generator: Optional[Callable[[str], Awaitable[str]]] = None
+    evaluator: Optional[Callable[[str], Any]] = None
+    async_evaluator: Optional[Callable[[str], Awaitable[Any]]] = None
+
+
+def fidelity_report(tracker: UsageTracker, generation: int, population: int,
+                    rungs: List[int], promoted: int) -> Dict[str, Any]:
+    """Compare a raced generation with flat full-fidelity evaluation.
+
+    ``rungs`` holds the number of candidates evaluated at each low-fidelity
+    rung and ``promoted`` how many reached full fidelity. Flat cost is
+    extrapolated from the full-fidelity calls of the promoted candidates;
+    mutator calls are excluded on both sides.
+    """
+    records = [r for r in tracker.records
+               if r.generation == generation and r.agent != "mutator"]
+    full = [r for r in records if r.fidelity is None]
+    scale = population / promoted if promoted else 0.0
+    flat_calls = len(full) * scale
+    flat_tokens = sum(r.total_tokens for r in full) * scale
+    return {
+        "generation": generation,
+        "population": population,
+        "low_fidelity_evaluations": rungs,
+        "full_fidelity_evaluations": promoted,
+        "evaluations_saved": population - promoted,
+        "calls": len(records),
+        "calls_saved": round(flat_calls - len(records)),
+        "tokens_saved": round(flat_tokens - sum(r.total_tokens for r in records)),
+    }
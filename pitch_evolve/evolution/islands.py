@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+import glob
+import json
+import os
+import queue
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Protocol, Sequence
+
+# Builds the engine of one island from its index and initial population.
+# Must be picklable (e.g. a module-level function or functools.partial of
+# one) when islands run in worker processes.
+EngineFactory = Callable[[int, List[str]], Any]
+
+
+class MigrationTransport(Protocol):
+    """Anything that can carry migrants from one island to the next.
+
+    Islands form a ring: after every migration epoch, island ``k`` sends its
+    best prompts to island ``k + 1`` and receives those of island ``k - 1``.
+    """
+
+    def send(self, source: int, target: int, epoch: int, prompts: List[str]) -> None:
+        ...
+
+    def receive(self, target: int, epoch: int, timeout: float) -> List[str]:
+        """Migrants for ``target`` in ``epoch``, or ``[]`` after ``timeout`` seconds."""
+        ...
+
+
+class QueueTransport:
+    """One queue per island; pass a ``multiprocessing.Manager`` for processes."""
+
+    def __init__(self, islands: int, manager: Any = None) -> None:
+        make = manager.Queue if manager is not None else queue.Queue
+        self.queues = [make() for _ in range(islands)]
+
+    def send(self, source: int, target: int, epoch: int, prompts: List[str]) -> None:
+        self.queues[target].put((epoch, list(prompts)))
+
+    def receive(self, target: int, epoch: int, timeout: float) -> List[str]:
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return []
+            try:
+                sent_epoch, prompts = self.queues[target].get(timeout=remaining)
+            except queue.Empty:
+                return []
+            # Migrants of an epoch we gave up waiting for are stale.
+            if sent_epoch == epoch:
+                return prompts
+
+
+class DirectoryTransport:
+    """Exchange migrants as JSON files in a shared directory.
+
+    Any directory every island can reach (e.g. an NFS mount) works, so
+    islands can run on different machines. Files live under a ``run_id``
+    subdirectory, so a reused directory never mixes in another run's
+    migrants; every island of one ring must use the same ``run_id``.
+    """
+
+    def __init__(self, path: str, run_id: str, poll_interval: float = 0.2) -> None:
+        self.path = os.path.join(path, run_id)
+        self.poll_interval = poll_interval
+        os.makedirs(self.path, exist_ok=True)
+
+    def send(self, source: int, target: int, epoch: int, prompts: List[str]) -> None:
+        name = os.path.join(self.path, f"island-{target}-epoch-{epoch}-from-{source}.json")
+        with open(name + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(prompts, f)
+        os.replace(name + ".tmp", name)
+
+    def receive(self, target: int, epoch: int, timeout: float) -> List[str]:
+        deadline = time.monotonic() + timeout
+        pattern = os.path.join(self.path, f"island-{target}-epoch-{epoch}-from-*.json")
+        while True:
+            found = sorted(glob.glob(pattern))
+            if found:
+                with open(found[0], encoding="utf-8") as f:
+                    prompts = json.load(f)
+                os.remove(found[0])
+                self._drop_stale(target, epoch)
+                return prompts
+            if time.monotonic() >= deadline:
+                self._drop_stale(target, epoch)
+                return []
+            time.sleep(self.poll_interval)
+
+    def _drop_stale(self, target: int, epoch: int) -> None:
+        """Remove migrants for ``target`` that arrived after we gave up on them."""
+        for name in glob.glob(os.path.join(self.path, f"island-{target}-epoch-*-from-*.json")):
+            sent_epoch = int(os.path.basename(name).split("-")[3])
+            if sent_epoch <= epoch:
+                try:
+                    os.remove(name)
+                except FileNotFoundError:
+                    pass
+
+
+@dataclass
+class IslandRun:
+    """Merged result of an island-model run.
+
+    ``history`` holds, per generation, the populations of all islands
+    concatenated; ``score_history`` the mean of the islands' average scores;
+    ``diversity`` the share of distinct prompts in the merged population.
+    """
+
+    islands: List[Dict[str, Any]]
+    history: List[List[str]] = field(default_factory=list)
+    score_history: List[float] = field(default_factory=list)
+    diversity: List[float] = field(default_factory=list)
+    best_prompt: str = ""
+    best_score: float = 0.0
+
+
+def _evolve(engine: Any, generations: int) -> None:
+    if engine.concurrency > 1:
+        asyncio.run(engine.evolve_async(generations=generations))
+    else:
+        engine.evolve(generations=generations)
+
+
+def _elite(engine: Any, k: int) -> List[str]:
+    """The ``k`` best prompts by their latest score."""
+    ranked = sorted(engine.objectives.values(), key=lambda r: r["score"], reverse=True)
+    return [r["prompt"] for r in ranked[:k]]
+
+
+def _immigrate(engine: Any, migrants: Sequence[str]) -> int:
+    """Replace the tail of the population (never the elite first slot)."""
+    arriving = [p for p in dict.fromkeys(migrants) if p not in engine.population]
+    arriving = arriving[:max(0, len(engine.population) - 1)]
+    if arriving:
+        engine.population = engine.population[:len(engine.population) - len(arriving)] + arriving
+    return len(arriving)
+
+
+def run_island(factory: EngineFactory, island: int, islands: int, population: List[str],
+               generations: int, migration_interval: int, migrants: int,
+               transport: Optional[MigrationTransport], timeout: float) -> Dict[str, Any]:
+    """Evolve one island, exchanging ``migrants`` every ``migration_interval``."""
+    engine = factory(island, list(population))
+    done, epoch, migrations = 0, 0, []
+    interval = max(1, migration_interval)
+    while done < generations:
+        _evolve(engine, min(interval, generations - done))
+        if len(engine.history) <= done:  # stopped early, e.g. by its budget
+            break
+        done = len(engine.history)
+        if done >= generations or islands < 2 or transport is None:
+            continue
+        sent = _elite(engine, migrants)
+        transport.send(island, (island + 1) % islands, epoch, sent)
+        received = transport.receive(island, epoch, timeout)
+        migrations.append({"epoch": epoch, "generation": done, "sent": sent,
+                           "received": received, "accepted": _immigrate(engine, received)})
+        epoch += 1
+    best = max(engine.objectives.values(), key=lambda r: r["score"], default=None)
+    return {
+        "island": island,
+        "history": engine.history,
+        "score_history": engine.score_history,
+        "population": engine.population,
+        "migrations": migrations,
+        "best_prompt": best["prompt"] if best else engine.population[0],
+        "best_score": best["score"] if best else 0.0,
+    }
+
+
+def merge_islands(results: List[Dict[str, Any]]) -> IslandRun:
+    run = IslandRun(islands=sorted(results, key=lambda r: r["island"]))
+    for g in range(max((len(r["history"]) for r in results), default=0)):
+        present = [r for r in run.islands if len(r["history"]) > g]
+        merged = [p for r in present for p in r["history"][g]]
+        run.history.append(merged)
+        run.score_history.append(sum(r["score_history"][g] for r in present) / len(present))
+        run.diversity.append(len(set(merged)) / len(merged) if merged else 0.0)
+    best = max(results, key=lambda r: r["best_score"], default=None)
+    if best is not None:
+        run.best_prompt, run.best_score = best["best_prompt"], best["best_score"]
+    return run
+
+
+def run_islands(factory: EngineFactory, population: List[str], islands: int = 4,
+                generations: int = 6, migration_interval: int = 2, migrants: int = 1,
+                transport: Optional[MigrationTransport] = None,
+                island_ids: Optional[Sequence[int]] = None, executor: str = "process",
+                timeout: float = 600.0) -> IslandRun:
+    """Run ``islands`` populations in parallel with ring migration.
+
+    Each island runs in its own worker process (or thread with
+    ``executor="thread"``) and so gets its own event loop, connection pool
+    and rate limits. ``island_ids`` runs only some of the ring here, e.g.
+    one share per machine with a :class:`DirectoryTransport` on shared
+    storage; the result then merges the local islands only.
+    """
+    ids = list(island_ids) if island_ids is not None else list(range(islands))
+    if len(set(ids)) != len(ids) or any(not 0 <= k < islands for k in ids):
+        raise ValueError(f"island ids must be unique and in range({islands}), got {ids}")
+    if transport is None and len(ids) < islands:
+        # The missing islands run elsewhere and can only reach us through
+        # a shared transport; a local queue would wait for them forever.
+        raise ValueError("running a subset of the islands needs a shared transport")
+    manager = None
+    if transport is None and islands > 1:
+        if executor == "process":
+            import multiprocessing
+
+            manager = multiprocessing.Manager()
+        transport = QueueTransport(islands, manager)
+    pool = (ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor)(
+        max_workers=len(ids))
+    try:
+        futures = [pool.submit(run_island, factory, k, islands, population, generations,
+                               migration_interval, migrants, transport, timeout)
+                   for k in ids]
+        results = [f.result() for f in futures]
+    finally:
+        pool.shutdown()
+        if manager is not None:
+            manager.shutdown()
+    return merge_islands(results)
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import json
+import os
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Tuple
+
+from pitch_evolve.agents.llm_as_judge import BatchJudgement, JudgeFeedback
+
+
+class RunJournal:
+    """Append-only JSONL journal of an evolution run.
+
+    Every completed generation, judge and mutator call is written as soon as
+    it finishes, followed by a checkpoint record (population, score and RNG
+    state) at the end of each generation. Each line is flushed and fsynced,
+    so a crashed run loses at most the call that was in flight.
+
+    When opened with ``resume=True`` the journal is replayed: the last
+    checkpoint restores the engine and the calls recorded after it are
+    served back in order instead of being issued again.
+    """
+
+    def __init__(self, path: str, resume: bool = False) -> None:
+        self.path = path
+        self.checkpoints: List[Dict[str, Any]] = []
+        self._replay: Dict[str, Deque[Any]] = defaultdict(deque)
+        if resume and os.path.exists(path):
+            self._load()
+        else:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            open(path, "w", encoding="utf-8").close()
+        self._file = open(path, "a", encoding="utf-8")
+
+    @property
+    def completed_generations(self) -> int:
+        return len(self.checkpoints)
+
+    def replay(self, key: str) -> Tuple[bool, Any]:
+        """Pop the next recorded result for ``key`` if the journal has one."""
+        pending = self._replay.get(key)
+        if pending:
+            return True, pending.popleft()
+        return False, None
+
+    def record_call(self, kind: str, key: str, value: Any) -> None:
+        self._append({"type": "call", "kind": kind, "key": key,
+                      "value": _encode(value)})
+
+    def record_generation(self, generation: int, population: List[str],
+                          score: float, best_pitch: str, rng_state: Any) -> None:
+        record = {
+            "type": "generation",
+            "generation": generation,
+            "population": population,
+            "score": score,
+            "best_pitch": best_pitch,
+            "rng_state": rng_state,
+        }
+        self._append(record)
+        self.checkpoints.append(record)
+        self._replay.clear()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _load(self) -> None:
+        valid_bytes = 0
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break  # torn write from a crash; drop the tail
+                valid_bytes += len(line.encode("utf-8"))
+                if record["type"] == "generation":
+                    self.checkpoints.append(record)
+                    self._replay.clear()
+                elif record["type"] == "call":
+                    self._replay[record["key"]].append(
+                        _decode(record["kind"], record["value"]))
+        with open(self.path, "r+b") as f:
+            f.truncate(valid_bytes)
+
+
+def rng_state_to_json(state: Any) -> Any:
+    version, internal, gauss = state
+    return [version, list(internal), gauss]
+
+
+def rng_state_from_json(state: Any) -> Any:
+    version, internal, gauss = state
+    return (version, tuple(internal), gauss)
+
+
+def _encode(value: Any) -> Any:
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    return value
+
+
+def _decode(kind: str, value: Any) -> Any:
+    # Low-fidelity stages are recorded as e.g. "evaluate:low".
+    if kind.split(":", 1)[0] == "evaluate" and isinstance(value, dict):
+        if "feedback" in value:
+            return BatchJudgement.model_validate(value)
+        return JudgeFeedback.model_validate(value)
+    return value
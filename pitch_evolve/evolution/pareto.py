@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import math
+from typing import Dict, List, Sequence
+
+Point = Sequence[float]
+
+
+def dominates(a: Point, b: Point) -> bool:
+    """Whether ``a`` is at least as good as ``b`` everywhere and better somewhere.
+
+    All objectives are maximised; negate costs before comparing.
+    """
+    return all(x >= y for x, y in zip(a, b)) and any(x > y for x, y in zip(a, b))
+
+
+def non_dominated_fronts(points: List[Point]) -> List[List[int]]:
+    """Fast non-dominated sort (NSGA-II); returns fronts of point indices."""
+    dominated_by: List[List[int]] = [[] for _ in points]
+    counts = [0] * len(points)
+    for i, a in enumerate(points):
+        for j in range(i + 1, len(points)):
+            b = points[j]
+            if dominates(a, b):
+                dominated_by[i].append(j)
+                counts[j] += 1
+            elif dominates(b, a):
+                dominated_by[j].append(i)
+                counts[i] += 1
+    fronts = []
+    current = [i for i, c in enumerate(counts) if c == 0]
+    while current:
+        fronts.append(current)
+        following = []
+        for i in current:
+            for j in dominated_by[i]:
+                counts[j] -= 1
+                if counts[j] == 0:
+                    following.append(j)
+        current = sorted(following)
+    return fronts
+
+
+def crowding_distance(points: List[Point], front: List[int]) -> Dict[int, float]:
+    """NSGA-II crowding distance of each point in ``front``; extremes are infinite."""
+    distance = {i: 0.0 for i in front}
+    if len(front) <= 2:
+        return {i: math.inf for i in front}
+    for axis in range(len(points[front[0]])):
+        ordered = sorted(front, key=lambda i: points[i][axis])
+        low, high = points[ordered[0]][axis], points[ordered[-1]][axis]
+        distance[ordered[0]] = distance[ordered[-1]] = math.inf
+        if high == low:
+            continue
+        for before, i, after in zip(ordered, ordered[1:], ordered[2:]):
+            distance[i] += (points[after][axis] - points[before][axis]) / (high - low)
+    return distance
+
+
+def nsga2_order(points: List[Point]) -> List[int]:
+    """Order indices by front, then crowding distance, then first objective."""
+    order = []
+    for front in non_dominated_fronts(points):
+        crowding = crowding_distance(points, front)
+        order.extend(sorted(front, key=lambda i: (-crowding[i], -points[i][0], i)))
+    return order
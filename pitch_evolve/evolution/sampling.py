@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Any, List, Tuple
+
+
+@dataclass
+class FitnessStats:
+    """Running mean and variance (Welford) of a prompt's sampled scores.
+
+    Also keeps the best-scoring pitch and its feedback, which stand in for
+    the prompt during selection and mutation.
+    """
+
+    n: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    best_score: float = float("-inf")
+    pitch: str = ""
+    feedback: Any = None
+
+    def add(self, score: float, pitch: str, feedback: Any) -> None:
+        self.n += 1
+        delta = score - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (score - self.mean)
+        if score > self.best_score:
+            self.best_score, self.pitch, self.feedback = score, pitch, feedback
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.n - 1) if self.n > 1 else math.inf
+
+    def interval(self, z: float) -> Tuple[float, float]:
+        """Normal-approximation confidence interval for the mean."""
+        if self.n < 2:
+            return -math.inf, math.inf
+        half = z * math.sqrt(self.variance / self.n)
+        return self.mean - half, self.mean + half
+
+
+def z_score(confidence: float) -> float:
+    """Two-sided z value for ``confidence`` (e.g. 0.9 -> 1.645)."""
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def undecided(stats: List[FitnessStats], k: int, z: float) -> List[int]:
+    """Indices whose membership in the top ``k`` is not yet clear.
+
+    A candidate in the current top ``k`` is settled once its lower bound
+    clears the upper bound of everyone outside it; a candidate outside is
+    settled once its upper bound falls below the lower bound of everyone
+    inside.
+    """
+    if len(stats) <= k:
+        return []
+    order = sorted(range(len(stats)), key=lambda n: stats[n].mean, reverse=True)
+    top, rest = order[:k], order[k:]
+    bounds = [s.interval(z) for s in stats]
+    best_outside = max(bounds[n][1] for n in rest)
+    worst_inside = min(bounds[n][0] for n in top)
+    pending = [n for n in top if bounds[n][0] <= best_outside]
+    pending += [n for n in rest if bounds[n][1] >= worst_inside]
+    return sorted(pending)
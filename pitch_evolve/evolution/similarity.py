@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import re
+from collections import Counter
+from typing import Any, List
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+
+
+def _terms(text: str) -> List[str]:
+    """Word unigrams and bigrams of ``text``."""
+    words = _TOKEN.findall(text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class SimilarityIndex:
+    """TF-IDF cosine similarity between a set of prompts.
+
+    Prompts are embedded as L2-normalised TF-IDF vectors over word unigrams
+    and bigrams, so the full pairwise similarity matrix is one matrix
+    product. NumPy is imported on first use.
+    """
+
+    def __init__(self, texts: List[str]) -> None:
+        import numpy as np
+
+        self.texts = list(texts)
+        counts = [Counter(_terms(t)) for t in self.texts]
+        vocab: dict = {}
+        for c in counts:
+            for term in c:
+                vocab.setdefault(term, len(vocab))
+        tf = np.zeros((len(self.texts), max(len(vocab), 1)))
+        for row, c in enumerate(counts):
+            if c:
+                tf[row, [vocab[t] for t in c]] = list(c.values())
+        df = (tf > 0).sum(axis=0)
+        idf = np.log((1 + len(self.texts)) / (1 + df)) + 1
+        vectors = tf * idf
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        self.vectors = vectors / np.where(norms == 0, 1, norms)
+
+    def similarity(self) -> Any:
+        """Pairwise cosine similarity matrix."""
+        return self.vectors @ self.vectors.T
+
+    def groups(self, threshold: float) -> List[int]:
+        """Map each text to the index of its group's representative.
+
+        A text joins the first earlier representative that is identical to
+        it or at least ``threshold`` cosine-similar; otherwise it becomes a
+        representative itself.
+        """
+        import numpy as np
+
+        sim = self.similarity()
+        reps = list(range(len(self.texts)))
+        is_rep = np.ones(len(self.texts), dtype=bool)
+        for i in range(1, len(self.texts)):
+            close = (sim[i, :i] >= threshold) & is_rep[:i]
+            same = [j for j in range(i) if is_rep[j] and self.texts[j] == self.texts[i]]
+            matches = same or np.flatnonzero(close).tolist()
+            if matches:
+                reps[i] = matches[0]
+                is_rep[i] = False
+        return reps
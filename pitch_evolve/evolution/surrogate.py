@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import math
+import re
+import zlib
+from typing import Any, List, Sequence
+
+_WORD = re.compile(r"[a-z0-9']+")
+_SENTENCE = re.compile(r"[.!?]+(?:\s|$)")
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)?%?")
+_CITATION = re.compile(r"\[\d+\]|https?://|\bsources?\b|\bcit(?:e|es|ed|ation|ations)\b", re.I)
+_STATISTIC = re.compile(
+    r"%|\b(?:statistics?|data|percent(?:age)?|survey|study|studies|report|figures?)\b", re.I)
+
+# Dense features ahead of the hashed n-gram buckets.
+_DENSE = 6
+
+
+def text_features(text: str, dims: int = 256) -> Any:
+    """Feature vector for ``text``: bias, length, citation and statistic
+    counts, then L2-normalised hashed word unigrams and bigrams."""
+    import numpy as np
+
+    words = _WORD.findall(text.lower())
+    vector = np.zeros(_DENSE + dims)
+    vector[0] = 1.0
+    vector[1] = math.log1p(len(words))
+    vector[2] = math.log1p(len(_SENTENCE.findall(text)))
+    vector[3] = math.log1p(len(_CITATION.findall(text)))
+    vector[4] = math.log1p(len(_STATISTIC.findall(text)))
+    vector[5] = math.log1p(len(_NUMBER.findall(text)))
+    for term in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+        vector[_DENSE + zlib.crc32(term.encode("utf-8")) % dims] += 1.0
+    norm = np.linalg.norm(vector[_DENSE:])
+    if norm:
+        vector[_DENSE:] /= norm
+    return vector
+
+
+class SurrogateModel:
+    """Online ridge regression from prompt text features to judge score.
+
+    Keeps the sufficient statistics ``XᵀX`` and ``Xᵀy``, so training on a
+    generation's scores is one matrix update and a prediction is one small
+    linear solve. NumPy is imported on first use.
+    """
+
+    def __init__(self, dims: int = 256, l2: float = 1.0) -> None:
+        self.dims = dims
+        self.l2 = l2
+        self.n = 0
+        self.mean = 0.0
+        self._gram: Any = None
+        self._target: Any = None
+        self._column_sums: Any = None
+
+    def features(self, texts: Sequence[str]) -> Any:
+        import numpy as np
+
+        return np.array([text_features(t, self.dims) for t in texts]).reshape(
+            len(texts), _DENSE + self.dims)
+
+    def update(self, texts: Sequence[str], scores: Sequence[float]) -> None:
+        """Train on (text, judge score) pairs."""
+        import numpy as np
+
+        if not len(texts):
+            return
+        x = self.features(texts)
+        y = np.asarray(scores, dtype=float)
+        if self._gram is None:
+            self._gram = self.l2 * np.eye(x.shape[1])
+            self._target = np.zeros(x.shape[1])
+            self._column_sums = np.zeros(x.shape[1])
+        self._gram += x.T @ x
+        self._target += x.T @ y
+        self._column_sums += x.sum(axis=0)
+        self.mean = (self.mean * self.n + float(y.sum())) / (self.n + len(y))
+        self.n += len(y)
+
+    def predict(self, texts: Sequence[str]) -> List[float]:
+        """Predicted judge scores (the training mean until trained)."""
+        import numpy as np
+
+        if self._gram is None or not len(texts):
+            return [self.mean] * len(texts)
+        # Fit residuals around the mean so the penalty shrinks towards it
+        # rather than towards zero.
+        weights = np.linalg.solve(
+            self._gram, self._target - self.mean * self._column_sums)
+        return (self.mean + self.features(texts) @ weights).tolist()
+
+
+def spearman(a: Sequence[float], b: Sequence[float]) -> float:
+    """Spearman rank correlation (ties get average ranks); 0.0 if undefined."""
+    import numpy as np
+
+    if len(a) < 2:
+        return 0.0
+
+    def ranks(values: Sequence[float]) -> Any:
+        values = np.asarray(values, dtype=float)
+        order = values.argsort(kind="stable")
+        result = np.empty(len(values))
+        result[order] = np.arange(len(values), dtype=float)
+        for value in np.unique(values):
+            tied = values == value
+            result[tied] = result[tied].mean()
+        return result
+
+    ra, rb = ranks(a), ranks(b)
+    if ra.std() == 0 or rb.std() == 0:
+        return 0.0
+    return float(np.corrcoef(ra, rb)[0, 1])
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import bisect
+import collections
+import contextlib
+import contextvars
+import json
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from pitch_evolve.agents import usage
+
+# Histogram bucket upper bounds in seconds (Prometheus ``le`` labels).
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+@dataclass
+class Span:
+    stage: str
+    start: float
+    duration: float
+    generation: Optional[int] = None
+    candidate: Optional[int] = None
+    fidelity: Optional[str] = None
+
+
+class Histogram:
+    """Cumulative latency histogram that also keeps samples for percentiles.
+
+    Bucket counts, count, total and max cover every observation; percentiles
+    come from the newest ``max_samples`` samples.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS,
+                 max_samples: Optional[int] = 10_000) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.samples: Deque[float] = collections.deque(maxlen=max_samples)
+        self.total = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.samples.append(seconds)
+        self.total += seconds
+        self.count += 1
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """Nearest-rank ``q`` quantile of the kept samples."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))]
+
+
+class MetricsRegistry:
+    """Per-stage latency spans and histograms for a run.
+
+    Stages are e.g. ``search``, ``generate``, ``judge``, ``mutate``,
+    ``select`` and ``output``. Spans pick up the generation, candidate and
+    fidelity labels of the current :func:`usage.scope`. With ``max_spans``
+    only the newest spans are kept (histograms still count every span), and
+    spans are passed on to ``parent``, e.g. a server-wide registry above
+    per-job ones.
+    """
+
+    def __init__(self, max_spans: Optional[int] = None,
+                 parent: Optional["MetricsRegistry"] = None) -> None:
+        self.spans: Deque[Span] = collections.deque(maxlen=max_spans)
+        self.histograms: Dict[str, Histogram] = {}
+        self.parent = parent
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, stage: str, **labels: Any) -> Iterator[None]:
+        """Time the block as one ``stage`` span."""
+        start = time.time()
+        began = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - began, start=start, **labels)
+
+    def observe(self, stage: str, seconds: float, start: Optional[float] = None,
+                **labels: Any) -> None:
+        scope = {**usage.usage_scope.get(), **labels}
+        self.add(Span(stage, start if start is not None else time.time() - seconds, seconds,
+                      scope.get("generation"), scope.get("candidate"), scope.get("fidelity")))
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+            self.histograms.setdefault(span.stage, Histogram()).observe(span.duration)
+        if self.parent is not None:
+            self.parent.add(span)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Count, total, mean and tail latency per stage, slowest total first."""
+        with self._lock:
+            items = [(stage, h.count, h.total, h.quantile(0.5), h.quantile(0.95),
+                      h.quantile(0.99), h.max)
+                     for stage, h in self.histograms.items()]
+        overall = sum(item[2] for item in items) or 1.0
+        rows = [{
+            "stage": stage,
+            "count": count,
+            "total_s": round(total, 4),
+            "mean_s": round(total / count, 4) if count else 0.0,
+            "p50_s": round(p50, 4),
+            "p95_s": round(p95, 4),
+            "p99_s": round(p99, 4),
+            "max_s": round(slowest, 4),
+            "share": round(total / overall, 3),
+        } for stage, count, total, p50, p95, p99, slowest in items]
+        return sorted(rows, key=lambda r: -r["total_s"])
+
+    def format_summary(self) -> str:
+        """The :meth:`summary` as a plain-text table."""
+        columns = ("stage", "count", "total_s", "mean_s", "p50_s", "p95_s", "p99_s",
+                   "max_s", "share")
+        rows = [[str(r[c]) for c in columns] for r in self.summary()]
+        widths = [max(len(c), *(len(row[n]) for row in rows)) for n, c in enumerate(columns)]
+        lines = ["  ".join(c.ljust(w) for c, w in zip(columns, widths))]
+        lines += ["  ".join(v.ljust(w) for v, w in zip(row, widths)) for row in rows]
+        return "\n".join(lines)
+
+    def prometheus(self) -> str:
+        """Prometheus text exposition of stage latencies and model usage."""
+        lines = [
+            "# HELP pitch_evolve_stage_seconds Latency of each pipeline stage.",
+            "# TYPE pitch_evolve_stage_seconds histogram",
+        ]
+        with self._lock:
+            histograms = {s: (list(h.counts), h.total, h.count)
+                          for s, h in self.histograms.items()}
+            generation = max((s.generation for s in self.spans if s.generation), default=0)
+        for stage, (counts, total, count) in sorted(histograms.items()):
+            cumulative = 0
+            for bound, n in zip((*map(str, BUCKETS), "+Inf"), counts):
+                cumulative += n
+                lines.append(
+                    f'pitch_evolve_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} '
+                    f"{cumulative}")
+            lines.append(f'pitch_evolve_stage_seconds_sum{{stage="{stage}"}} {total}')
+            lines.append(f'pitch_evolve_stage_seconds_count{{stage="{stage}"}} {count}')
+        tracker = usage.get_usage_tracker()
+        lines += [
+            "# HELP pitch_evolve_generation Latest generation with recorded spans.",
+            "# TYPE pitch_evolve_generation gauge",
+            f"pitch_evolve_generation {generation}",
+            "# HELP pitch_evolve_model_tokens_total Model tokens used per agent.",
+            "# TYPE pitch_evolve_model_tokens_total counter",
+        ]
+        for agent, totals in sorted(tracker.totals_by("agent").items()):
+            lines.append(f'pitch_evolve_model_tokens_total{{agent="{agent}"}} {totals["tokens"]}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        with self._lock:
+            spans = [asdict(s) for s in self.spans]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"stages": self.summary(), "spans": spans}, f, indent=2)
+
+
+def serve_metrics(port: int, host: str = "127.0.0.1") -> Any:
+    """Serve ``/metrics`` for the process-wide registry from a daemon thread.
+
+    Returns the HTTP server; call ``shutdown()`` on it to stop serving.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = get_metrics().prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+_metrics = MetricsRegistry()
+_scoped_metrics: contextvars.ContextVar[Optional[MetricsRegistry]] = contextvars.ContextVar(
+    "scoped_metrics", default=None)
+
+
+def get_metrics() -> MetricsRegistry:
+    """Return the registry installed by :func:`recording`, else the process-wide one."""
+    return _scoped_metrics.get() or _metrics
+
+
+@contextlib.contextmanager
+def recording(registry: MetricsRegistry) -> Iterator[MetricsRegistry]:
+    """Record the spans inside the block (and its tasks) in ``registry``."""
+    token = _scoped_metrics.set(registry)
+    try:
+        yield registry
+    finally:
+        _scoped_metrics.reset(token)
+
+
+def configure_metrics(registry: MetricsRegistry) -> MetricsRegistry:
+    global _metrics
+    _metrics = registry
+    return _metrics
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import time
+import traceback
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from pitch_evolve.agents import usage
+from pitch_evolve.metrics import MetricsRegistry, get_metrics, recording
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+JobValidator = Callable[[str, Dict[str, Any]], Any]
+
+# Usage records and spans kept per job (and by ``serve`` server-wide).
+MAX_RECORDS = 10_000
+
+_REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+            405: "Method Not Allowed", 429: "Too Many Requests"}
+
+
+class QueueFull(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    params: Dict[str, Any]
+    status: str = "queued"
+    submitted: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    usage: Optional[Dict[str, Any]] = None
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "submitted": self.submitted,
+            "queued_s": round((self.started or time.time()) - self.submitted, 3),
+            "run_s": round((self.finished or time.time()) - self.started, 3)
+            if self.started else None,
+            "result": self.result,
+            "error": self.error,
+            "usage": self.usage,
+        }
+
+
+class PitchService:
+    """Bounded job queue served by a fixed pool of async workers.
+
+    Jobs run on one event loop, so agents and their HTTP clients stay warm
+    between jobs. ``handlers`` maps a job kind (``pitch``, ``evolve``) to an
+    async callable receiving the job's parameters plus its ``job_id``.
+    ``validate`` (kind, params) runs at submit time and raises ``ValueError``
+    for bad parameters, so they are rejected before they take a queue slot.
+    """
+
+    def __init__(self, handlers: Dict[str, JobHandler], workers: int = 2,
+                 max_queue: int = 100, keep_finished: int = 1000,
+                 validate: Optional[JobValidator] = None) -> None:
+        self.handlers = handlers
+        self.validate = validate
+        self.workers = max(1, workers)
+        self.max_queue = max_queue
+        self.keep_finished = keep_finished
+        self.jobs: Dict[str, Job] = {}
+        self.started = time.time()
+        self.completed = 0
+        self.failed = 0
+        self.running = 0
+        self._ids = itertools.count(1)
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: list = []
+        self._finish_times: list = []
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def submit(self, kind: str, params: Dict[str, Any]) -> Job:
+        """Queue a job; raises ``ValueError`` for unknown kinds or bad params and ``QueueFull``."""
+        if kind not in self.handlers:
+            raise ValueError(f"unknown job kind {kind!r}; expected one of {sorted(self.handlers)}")
+        if self.validate is not None:
+            self.validate(kind, params)
+        job = Job(id=f"job-{next(self._ids)}", kind=kind, params=params)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFull(f"queue is full ({self.max_queue} jobs)") from None
+        self.jobs[job.id] = job
+        return job
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            job.status, job.started = "running", time.time()
+            self.running += 1
+            # Each job records usage and spans on its own, so its labels and
+            # output files are not mixed with other jobs; the server-wide
+            # tracker and registry still see everything.
+            tracker = usage.UsageTracker(max_records=MAX_RECORDS,
+                                         parent=usage.get_usage_tracker())
+            registry = MetricsRegistry(max_spans=MAX_RECORDS, parent=get_metrics())
+            try:
+                with usage.tracking(tracker), recording(registry), \
+                        registry.span(f"job:{job.kind}"):
+                    job.result = await self.handlers[job.kind](
+                        {**job.params, "job_id": job.id})
+                job.status = "done"
+                self.completed += 1
+            except Exception as exc:  # reported to the client, not raised
+                job.status, job.error = "failed", f"{type(exc).__name__}: {exc}"
+                self.failed += 1
+                traceback.print_exc()
+            finally:
+                job.usage = {"tokens": tracker.total_tokens,
+                             "cost": round(tracker.total_cost, 6)}
+                job.finished = time.time()
+                self.running -= 1
+                self._finish_times.append(job.finished)
+                self._queue.task_done()
+                self._forget()
+
+    def _forget(self) -> None:
+        finished = [j for j in self.jobs.values() if j.finished is not None]
+        for job in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self.jobs[job.id]
+
+    def status(self) -> Dict[str, Any]:
+        now = time.time()
+        self._finish_times = [t for t in self._finish_times if now - t <= 60]
+        uptime = now - self.started
+        return {
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "max_queue": self.max_queue,
+            "workers": self.workers,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "jobs_last_minute": len(self._finish_times),
+            "jobs_per_minute": round((self.completed + self.failed) / uptime * 60, 3)
+            if uptime else 0.0,
+            "uptime_s": round(uptime, 1),
+        }
+
+    def prometheus(self) -> str:
+        status = self.status()
+        return get_metrics().prometheus() + "\n".join([
+            "# TYPE pitch_evolve_queue_depth gauge",
+            f"pitch_evolve_queue_depth {status['queue_depth']}",
+            "# TYPE pitch_evolve_jobs_running gauge",
+            f"pitch_evolve_jobs_running {status['running']}",
+            "# TYPE pitch_evolve_jobs_total counter",
+            f'pitch_evolve_jobs_total{{status="done"}} {status["completed"]}',
+            f'pitch_evolve_jobs_total{{status="failed"}} {status["failed"]}',
+        ]) + "\n"
+
+    # -- HTTP ----------------------------------------------------------------
+    def route(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        """Handle one request; returns the status code and a JSON body (or text)."""
+        path = path.split("?", 1)[0].rstrip("/") or "/"
+        if path == "/jobs":
+            if method != "POST":
+                return 405, {"error": "use POST to submit a job"}
+            try:
+                params = json.loads(body or b"{}")
+                if not params.get("prompt"):
+                    raise ValueError("a job needs a non-empty 'prompt'")
+                job = self.submit(params.pop("kind", "pitch"), params)
+            except QueueFull as exc:
+                return 429, {"error": str(exc)}
+            except (ValueError, AttributeError) as exc:
+                return 400, {"error": str(exc)}
+            return 202, {"id": job.id, "status": job.status, "queue_depth": self._queue.qsize()}
+        if method != "GET":
+            return 405, {"error": f"{method} not allowed on {path}"}
+        if path.startswith("/jobs/"):
+            job = self.jobs.get(path[len("/jobs/"):])
+            return (200, job.to_json()) if job else (404, {"error": "no such job"})
+        if path == "/status":
+            return 200, self.status()
+        if path == "/metrics":
+            return 200, self.prometheus()
+        return 404, {"error": f"no route for {path}"}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0) or 0))
+            if len(request_line) < 2:
+                code, payload = 400, {"error": "malformed request"}
+            else:
+                code, payload = self.route(request_line[0].upper(), request_line[1], body)
+            if isinstance(payload, str):
+                data, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4"
+            else:
+                data, content_type = json.dumps(payload, default=str).encode("utf-8"), \
+                    "application/json"
+            writer.write(
+                f"HTTP/1.1 {code} {_REASONS.get(code, '')}\r\n"
+                f"Content-Type: {content_type}\r\nContent-Length: {len(data)}\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1") + data)
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def listen(self, host: str = "127.0.0.1", port: int = 8765,
+                     socket_path: Optional[str] = None) -> asyncio.AbstractServer:
+        """Start the workers and accept HTTP on ``socket_path`` or ``host:port``."""
+        await self.start()
+        if socket_path:
+            return await asyncio.start_unix_server(self.handle, path=socket_path)
+        return await asyncio.start_server(self.handle, host, port)
@@ -0,0 +1,123 @@
+import functools
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+_WORD = re.compile(r"\w+")
+_PARAGRAPH = re.compile(r"\n\s*\n")
+
+
+@functools.lru_cache(maxsize=1)
+def _encoding() -> Any:
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:  # pragma: no cover - optional dependency
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens with tiktoken, or estimate ~4 characters per token."""
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def split_passages(text: str, max_words: int = 120) -> List[str]:
+    """Split a page into paragraphs, cutting long ones into ``max_words`` windows."""
+    passages = []
+    for paragraph in _PARAGRAPH.split(text):
+        words = paragraph.split()
+        for start in range(0, len(words), max_words):
+            passages.append(" ".join(words[start:start + max_words]))
+    return [p for p in passages if p]
+
+
+def bm25_scores(query: str, passages: List[str],
+                k1: float = 1.5, b: float = 0.75) -> List[float]:
+    """Score ``passages`` against ``query`` with Okapi BM25."""
+    docs = [Counter(_WORD.findall(p.lower())) for p in passages]
+    if not docs:
+        return []
+    lengths = [sum(d.values()) for d in docs]
+    avg_length = sum(lengths) / len(docs) or 1.0
+    terms = set(_WORD.findall(query.lower()))
+    scores = [0.0] * len(docs)
+    for term in terms:
+        df = sum(1 for d in docs if term in d)
+        if not df:
+            continue
+        idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+        for i, doc in enumerate(docs):
+            tf = doc.get(term, 0)
+            if tf:
+                norm = k1 * (1 - b + b * lengths[i] / avg_length)
+                scores[i] += idf * tf * (k1 + 1) / (tf + norm)
+    return scores
+
+
+@dataclass
+class CompactionStats:
+    """Size of the search results before and after compaction."""
+
+    bytes_before: int = 0
+    bytes_after: int = 0
+    tokens_before: int = 0
+    tokens_after: int = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+
+def compact_text(text: str, query: str, token_budget: int) -> str:
+    """Keep the passages of ``text`` most relevant to ``query`` within budget.
+
+    Selected passages are returned in their original page order so the
+    excerpt still reads naturally.
+    """
+    if count_tokens(text) <= token_budget:
+        return text
+    passages = split_passages(text)
+    scores = bm25_scores(query, passages)
+    ranked = sorted(range(len(passages)), key=lambda i: (-scores[i], i))
+    chosen, used = [], 0
+    for i in ranked:
+        cost = count_tokens(passages[i])
+        if used + cost > token_budget:
+            continue
+        chosen.append(i)
+        used += cost
+    if not chosen and ranked:
+        # Even the best passage is over budget; keep its leading words.
+        words = passages[ranked[0]].split()
+        return " ".join(words[: max(1, token_budget * 3 // 4)])
+    return "\n\n".join(passages[i] for i in sorted(chosen))
+
+
+def compact_results(
+    results: Optional[List[Dict[str, Any]]],
+    query: str,
+    token_budget: int = 400,
+) -> Tuple[Optional[List[Dict[str, Any]]], CompactionStats]:
+    """Replace each result's ``raw_content`` with its most relevant passages."""
+    stats = CompactionStats()
+    if not results:
+        return results, stats
+    compacted = []
+    for result in results:
+        raw = result.get("raw_content") or ""
+        short = compact_text(raw, query, token_budget) if raw else raw
+        stats.bytes_before += len(raw.encode("utf-8"))
+        stats.bytes_after += len(short.encode("utf-8"))
+        stats.tokens_before += count_tokens(raw)
+        stats.tokens_after += count_tokens(short)
+        compacted.append({**result, "raw_content": short or result.get("raw_content")})
+    return compacted, stats
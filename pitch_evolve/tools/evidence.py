@@ -0,0 +1,153 @@
+import asyncio
+import hashlib
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional
+
+from pitch_evolve.tools.compaction import split_passages
+from pitch_evolve.tools.web_search import web_search_async
+
+_WORD = re.compile(r"\w+")
+# Left out of the index so a hit means the passage shares a content word.
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the "
+    "their this to was were what when which who will with about how".split())
+
+
+def _terms(text: str) -> List[str]:
+    return [w for w in _WORD.findall(text.lower()) if w not in _STOPWORDS]
+
+
+class EvidenceCorpus:
+    """Shared, de-duplicated passages from prefetched search results.
+
+    Pages are split into passages and indexed in an in-memory inverted
+    index, so every pitch writer in a run can search the same evidence
+    with BM25 in milliseconds instead of hitting the network.
+    """
+
+    def __init__(self, max_words: int = 120, k1: float = 1.5, b: float = 0.75) -> None:
+        self.max_words = max_words
+        self.k1 = k1
+        self.b = b
+        self.passages: List[Dict[str, Any]] = []
+        self.hits = 0
+        self.misses = 0
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self._lengths: List[int] = []
+        self._seen: set = set()
+        self._sources: set = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.passages)
+
+    def add_results(self, results: Optional[List[Dict[str, Any]]]) -> int:
+        """Index the passages of search ``results``; returns how many were new."""
+        added = 0
+        with self._lock:
+            for result in results or []:
+                text = result.get("raw_content") or result.get("content") or ""
+                for passage in split_passages(text, self.max_words):
+                    digest = hashlib.sha1(
+                        " ".join(_terms(passage)).encode("utf-8")).hexdigest()
+                    if digest in self._seen:
+                        continue
+                    self._seen.add(digest)
+                    self._sources.add(result.get("url"))
+                    pid = len(self.passages)
+                    self.passages.append({
+                        "title": result.get("title"),
+                        "url": result.get("url"),
+                        "published_date": result.get("published_date"),
+                        "content": passage,
+                    })
+                    terms = _terms(passage)
+                    for term, tf in Counter(terms).items():
+                        self._postings[term][pid] = tf
+                    self._lengths.append(len(terms))
+                    added += 1
+        return added
+
+    def search(self, query: str, max_results: int = 5, min_score: float = 0.0,
+               min_coverage: float = 0.5) -> List[Dict[str, Any]]:
+        """Return the ``max_results`` passages that best match ``query``.
+
+        Only passages scoring above ``min_score`` and containing at least
+        ``min_coverage`` of the query's content terms are returned, so one
+        shared word (e.g. "go") is not a hit and an empty list means the
+        corpus has nothing relevant.
+        """
+        with self._lock:
+            count = len(self.passages)
+            if not count:
+                self.misses += 1
+                return []
+            avg_length = sum(self._lengths) / count or 1.0
+            scores: Dict[int, float] = defaultdict(float)
+            matched: Dict[int, int] = defaultdict(int)
+            query_terms = set(_terms(query))
+            for term in query_terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for pid, tf in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[pid] / avg_length)
+                    scores[pid] += idf * tf * (self.k1 + 1) / (tf + norm)
+                    matched[pid] += 1
+            needed = min_coverage * len(query_terms)
+            ranked = sorted((pid for pid, s in scores.items()
+                             if s > min_score and matched[pid] >= needed),
+                            key=lambda pid: (-scores[pid], pid))[:max_results]
+            if ranked:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return [{**self.passages[pid], "score": round(scores[pid], 3)}
+                    for pid in ranked]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "passages": len(self.passages),
+            "sources": len(self._sources),
+            "terms": len(self._postings),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def evidence_queries(prompt: str) -> List[str]:
+    """Default prefetch queries derived from the first sentence of ``prompt``."""
+    topic = re.split(r"(?<=[.!?])\s", prompt.strip(), maxsplit=1)[0][:120].rstrip(".!?")
+    return [topic, f"{topic} statistics", f"{topic} recent news"]
+
+
+async def prefetch_evidence(queries: List[str], recency: str = "m", max_results: int = 5,
+                            corpus: Optional[EvidenceCorpus] = None) -> EvidenceCorpus:
+    """Run ``queries`` concurrently through ``web_search_async`` into a corpus."""
+    corpus = corpus if corpus is not None else EvidenceCorpus()
+    results = await asyncio.gather(*(
+        web_search_async(query=q, recency=recency, max_results=max_results)
+        for q in queries
+    ))
+    for result in results:
+        corpus.add_results(result)
+    return corpus
+
+
+_corpus: Optional[EvidenceCorpus] = None
+
+
+def get_evidence_corpus() -> Optional[EvidenceCorpus]:
+    """Return the process-wide evidence corpus, if one has been prefetched."""
+    return _corpus
+
+
+def configure_evidence_corpus(corpus: Optional[EvidenceCorpus]) -> Optional[EvidenceCorpus]:
+    """Install (or with ``None`` remove) the process-wide evidence corpus."""
+    global _corpus
+    _corpus = corpus
+    return _corpus
@@ -0,0 +1,303 @@
+import asyncio
+import atexit
+import copy
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+# How long a result stays fresh for each Tavily ``time_range``. Narrow
+# windows move quickly, so their results expire sooner.
+RECENCY_TTL = {
+    "d": 60 * 60,
+    "day": 60 * 60,
+    "w": 6 * 60 * 60,
+    "week": 6 * 60 * 60,
+    "m": 24 * 60 * 60,
+    "month": 24 * 60 * 60,
+    "y": 7 * 24 * 60 * 60,
+    "year": 7 * 24 * 60 * 60,
+}
+DEFAULT_TTL = 60 * 60
+# A persisted cache rewrites its file at most this often; ``flush`` (also
+# run at exit) writes whatever is left.
+FLUSH_INTERVAL = 5.0
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Fold case, punctuation and whitespace so near-identical queries match."""
+    query = _PUNCTUATION.sub(" ", query.lower())
+    return _WHITESPACE.sub(" ", query).strip()
+
+
+class _Flight:
+    """A search currently running on behalf of every caller with its key.
+
+    Async searches also carry a future, so callers on the leader's loop can
+    await it; everybody else waits on ``done``.
+    """
+
+    def __init__(self, future: "Optional[asyncio.Future[Any]]" = None) -> None:
+        self.done = threading.Event()
+        self.future = future
+        self.thread = threading.get_ident()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.latency = 0.0
+
+
+class SearchCache:
+    """TTL-bounded cache of search results with in-flight de-duplication.
+
+    Entries are keyed on the normalised query, recency and ``max_results``.
+    When several callers ask for the same key at once only the first runs
+    the search; the others wait for and share its result ("singleflight").
+    Failed searches (``None``) are never cached. With a ``path`` the entries
+    are saved to it at most every ``flush_interval`` seconds and at exit.
+    """
+
+    def __init__(self, path: Optional[str] = None,
+                 ttl: Optional[Dict[str, float]] = None,
+                 flush_interval: float = FLUSH_INTERVAL) -> None:
+        self.path = path
+        self.ttl = dict(RECENCY_TTL, **(ttl or {}))
+        self.flush_interval = flush_interval
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.saved_latency = 0.0
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        # (normalised query, recency) -> {max_results: key}, for ``peek``.
+        self._by_query: Dict[Tuple[str, str], Dict[int, str]] = {}
+        self._inflight: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._flushed = 0.0
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+            for key in self._entries:
+                self._index(key)
+            self._drop_expired(time.time())
+        if path:
+            atexit.register(self.flush)
+
+    @staticmethod
+    def key(query: str, recency: str, max_results: int) -> str:
+        return json.dumps([normalize_query(query), recency, max_results])
+
+    def get_or_fetch(self, query: str, recency: str, max_results: int,
+                     fetch: Callable[[], Any]) -> Any:
+        """Return cached results for the search or run ``fetch`` once for them."""
+        key = self.key(query, recency, max_results)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry["expires"] > now:
+                self.hits += 1
+                self.saved_latency += entry["latency"]
+                return copy.deepcopy(entry["results"])
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                self.misses += 1
+            elif flight.thread == threading.get_ident():
+                # An async search on this thread's loop cannot finish while
+                # we block, so search without sharing.
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader and flight.thread == threading.get_ident():
+            return copy.deepcopy(fetch())
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            with self._lock:
+                self.saved_latency += flight.latency
+            return copy.deepcopy(flight.result)
+
+        start = time.perf_counter()
+        try:
+            flight.result = fetch()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            latency = time.perf_counter() - start
+            with self._lock:
+                self._inflight.pop(key, None)
+                if flight.error is None and flight.result is not None:
+                    self._store(key, recency, flight.result, latency)
+                flight.latency = latency
+            flight.done.set()
+        self._flush_if_due()
+        return copy.deepcopy(flight.result)
+
+    async def aget_or_fetch(self, query: str, recency: str, max_results: int,
+                            fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Async :meth:`get_or_fetch`; shares in-flight searches with it."""
+        key = self.key(query, recency, max_results)
+        now = time.time()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry["expires"] > now:
+                self.hits += 1
+                self.saved_latency += entry["latency"]
+                return copy.deepcopy(entry["results"])
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight(loop.create_future())
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            if flight.future is not None and flight.future.get_loop() is loop:
+                results, latency = await asyncio.shield(flight.future)
+            else:
+                # Led by another thread or loop: wait without blocking ours.
+                await asyncio.to_thread(flight.done.wait)
+                if flight.error is not None:
+                    raise flight.error
+                results, latency = flight.result, flight.latency
+            with self._lock:
+                self.saved_latency += latency
+            return copy.deepcopy(results)
+
+        future = flight.future
+        # Nobody may be waiting; retrieve the exception so it is not logged.
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        start = time.perf_counter()
+        try:
+            flight.result = await fetch()
+        except asyncio.CancelledError as exc:
+            flight.error = exc
+            future.cancel()
+            raise
+        except Exception as exc:
+            flight.error = exc
+            future.set_exception(exc)
+            raise
+        finally:
+            latency = time.perf_counter() - start
+            with self._lock:
+                self._inflight.pop(key, None)
+                if flight.error is None and flight.result is not None:
+                    self._store(key, recency, flight.result, latency)
+                flight.latency = latency
+            flight.done.set()
+        self._flush_if_due()
+        future.set_result((flight.result, latency))
+        return copy.deepcopy(flight.result)
+
+    def peek(self, query: str, recency: str, max_results: int) -> Optional[Any]:
+        """Return cached results without ever searching, or ``None``.
+
+        An entry cached with a larger ``max_results`` for the same query is
+        reused and truncated, so cheap lookups can ride on earlier searches.
+        """
+        now = time.time()
+        with self._lock:
+            keys = self._by_query.get((normalize_query(query), recency), {})
+            best = None
+            for cached_max in sorted(m for m in keys if m >= max_results):
+                entry = self._entries[keys[cached_max]]
+                if entry["expires"] > now:
+                    best = entry
+                    break
+            if best is None:
+                return None
+            self.hits += 1
+            self.saved_latency += best["latency"]
+            return copy.deepcopy(best["results"][:max_results])
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            "saved_latency_s": round(self.saved_latency, 3),
+            "entries": len(self._entries),
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_query.clear()
+            self.hits = self.misses = self.coalesced = 0
+            self.saved_latency = 0.0
+
+    def flush(self) -> None:
+        """Write unsaved entries to ``path`` (a no-op without one)."""
+        if not self.path:
+            return
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                data = json.dumps(self._entries)
+                self._dirty = False
+                self._flushed = time.monotonic()
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+
+    def _store(self, key: str, recency: str, results: Any, latency: float) -> None:
+        now = time.time()
+        self._entries[key] = {
+            "results": results,
+            "latency": latency,
+            "expires": now + self.ttl.get(recency, DEFAULT_TTL),
+        }
+        self._index(key)
+        self._drop_expired(now)
+        self._dirty = True
+
+    def _flush_if_due(self) -> None:
+        if self._dirty and time.monotonic() - self._flushed >= self.flush_interval:
+            self.flush()
+
+    def _drop_expired(self, now: float) -> None:
+        for key in [k for k, e in self._entries.items() if e["expires"] <= now]:
+            del self._entries[key]
+            query, recency, max_results = json.loads(key)
+            keys = self._by_query.get((query, recency), {})
+            keys.pop(max_results, None)
+            if not keys:
+                self._by_query.pop((query, recency), None)
+
+    def _index(self, key: str) -> None:
+        query, recency, max_results = json.loads(key)
+        self._by_query.setdefault((query, recency), {})[max_results] = key
+
+
+_search_cache = SearchCache()
+
+
+def get_search_cache() -> SearchCache:
+    """Return the process-wide search cache used by ``web_search``."""
+    return _search_cache
+
+
+def configure_search_cache(path: Optional[str] = None,
+                           ttl: Optional[Dict[str, float]] = None) -> SearchCache:
+    """Replace the process-wide search cache, e.g. to persist it to ``path``."""
+    global _search_cache
+    _search_cache.flush()
+    _search_cache = SearchCache(path=path, ttl=ttl)
+    return _search_cache
+
@@ -0,0 +1,107 @@
+import asyncio
+import os
+import random
+import weakref
+from typing import Any, AsyncGenerator, Dict, Optional, Protocol, Tuple
+
+import httpx
+
+RETRY_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+class AsyncSearchBackend(Protocol):
+    """Anything that can run a Tavily-style search without blocking the loop."""
+
+    async def search(self, query: str, *, max_results: int, time_range: str,
+                     include_raw_content: bool) -> Dict[str, Any]:
+        ...
+
+
+async def _close_on_shutdown(client: httpx.AsyncClient) -> AsyncGenerator[None, None]:
+    """Suspended once started; the loop's async-generator shutdown (run by
+    ``asyncio.run``) resumes it and closes ``client`` on its own loop."""
+    try:
+        yield
+    finally:
+        await client.aclose()
+
+
+class AsyncTavilySearch:
+    """Async Tavily client with a pooled connection, timeouts and retries.
+
+    One ``httpx.AsyncClient`` is kept per event loop so keep-alive connections
+    are reused across searches, and closed when that loop shuts down. Transport errors, timeouts and retryable
+    status codes are retried with jittered exponential backoff. Point
+    ``base_url`` at a local stub server to test without the network.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: str = "https://api.tavily.com",
+        timeout: float = 30.0,
+        retries: int = 3,
+        backoff: float = 0.5,
+        max_connections: int = 10,
+    ) -> None:
+        self.api_key = api_key if api_key is not None else os.getenv("TAVILY_API_KEY")
+        self.base_url = base_url
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_connections = max_connections
+        # Event loop -> (client, generator closing it when the loop shuts down).
+        self._clients: "weakref.WeakKeyDictionary[Any, Tuple[httpx.AsyncClient, Any]]" = \
+            weakref.WeakKeyDictionary()
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(loop)
+        if entry is not None and not entry[0].is_closed:
+            return entry[0]
+        client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=self.max_connections,
+                                max_keepalive_connections=self.max_connections),
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {self.api_key}",
+            },
+        )
+        closer = _close_on_shutdown(client)
+        await closer.__anext__()
+        self._clients[loop] = (client, closer)
+        return client
+
+    async def search(self, query: str, *, max_results: int, time_range: str,
+                     include_raw_content: bool = True) -> Dict[str, Any]:
+        payload = {
+            "query": query,
+            "max_results": max_results,
+            "time_range": time_range,
+            "include_raw_content": include_raw_content,
+        }
+        client = await self._get_client()
+        for attempt in range(self.retries + 1):
+            try:
+                response = await client.post("/search", json=payload)
+                if response.status_code not in RETRY_STATUS:
+                    response.raise_for_status()
+                    return response.json()
+                error: Exception = httpx.HTTPStatusError(
+                    f"retryable status {response.status_code}",
+                    request=response.request, response=response)
+            except (httpx.TransportError, httpx.TimeoutException) as exc:
+                error = exc
+            if attempt == self.retries:
+                raise error
+            delay = self.backoff * (2 ** attempt)
+            await asyncio.sleep(delay + random.uniform(0, delay))
+        raise RuntimeError("unreachable")  # pragma: no cover
+
+    async def aclose(self) -> None:
+        """Close the client of the running loop."""
+        entry = self._clients.pop(asyncio.get_running_loop(), None)
+        if entry is not None:
+            await entry[1].aclose()
@@ -1,10 +1,12 @@
 import logging
 import os
-from typing import Dict, Any, List, Optional
-try:
-    from tavily import TavilyClient
-except Exception:  # pragma: no cover - optional dependency
-    TavilyClient = None
+import threading
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
+
+from pitch_evolve.tools.search_cache import get_search_cache
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pitch_evolve.tools.search_client import AsyncSearchBackend
 
 log_formatter = logging.Formatter(
     '%(levelname)s::%(asctime)s::%(module)s::%(message)s',
@@ -17,12 +19,63 @@ logger.setLevel(logging.INFO)
 logger.addHandler(console_handler)
 
 
+_search_client: Any = None
+_async_search_client: Optional["AsyncSearchBackend"] = None
+_client_lock = threading.Lock()
+
+
+def get_search_client() -> Any:
+    """Return the shared search client, creating a ``TavilyClient`` on first use."""
+    global _search_client
+    with _client_lock:
+        if _search_client is None:
+            # Imported lazily: tavily pulls in requests and friends.
+            try:
+                from tavily import TavilyClient
+            except Exception:  # pragma: no cover - optional dependency
+                return None
+            TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")  # Tavily API key for search
+            _search_client = TavilyClient(api_key=TAVILY_API_KEY)
+        return _search_client
+
+
+def set_search_client(client: Any) -> None:
+    """Replace the shared search client.
+
+    ``client`` only needs a Tavily-compatible ``search`` method, which lets
+    tests and benchmarks plug in a local fake backend.
+    """
+    global _search_client
+    with _client_lock:
+        _search_client = client
+
+
+def get_async_search_client() -> "AsyncSearchBackend":
+    """Return the shared non-blocking search backend used by ``web_search_async``."""
+    global _async_search_client
+    with _client_lock:
+        if _async_search_client is None:
+            from pitch_evolve.tools.search_client import AsyncTavilySearch
+            _async_search_client = AsyncTavilySearch()
+        return _async_search_client
+
+
+def set_async_search_client(client: Optional["AsyncSearchBackend"]) -> None:
+    """Replace the shared async search backend (``None`` restores the default)."""
+    global _async_search_client
+    with _client_lock:
+        _async_search_client = client
+
+
 def web_search(query: str,
                recency: str,
                max_results: int = 5) -> Optional[List[Dict[str, Any]]]:
     """
     Retrieve information from the web using Tavily's search engine.
 
+    Results are served from the process-wide search cache when fresh, and
+    concurrent identical queries share a single request.
+
     Parameters:
         query: The information query to search for
         recency: Timeframe filter ('day'/'d', 'week'/'w', 'month'/'m', 'year'/'y')
@@ -31,13 +84,20 @@ def web_search(query: str,
     Returns:
         Collection of search results or None if search fails
     """
-    if TavilyClient is None:
+    return get_search_cache().get_or_fetch(
+        query, recency, max_results,
+        lambda: _uncached_web_search(query, recency, max_results),
+    )
+
+
+def _uncached_web_search(query: str,
+                         recency: str,
+                         max_results: int) -> Optional[List[Dict[str, Any]]]:
+    search_engine = get_search_client()
+    if search_engine is None:
         logger.warning("TavilyClient not available; web search disabled")
         return None
 
-    TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")  # Tavily API key for search
-    search_engine = TavilyClient(api_key=TAVILY_API_KEY)
-
     try:
         logger.info(
             f"Initiating web search for: {query}, limit: {max_results}")
@@ -49,31 +109,75 @@ def web_search(query: str,
             include_raw_content=True
         )
 
-        # Process the results
-        results = search_response.get("results", [])
-        processed_results = []
-        seen_urls = set()  # Track URLs we've already seen
+        return process_results(search_response.get("results", []))
+
+    except Exception as e:
+        logger.error(f"Web search error: {e}")
+        return None
+
+
+async def web_search_async(query: str,
+                           recency: str,
+                           max_results: int = 5) -> Optional[List[Dict[str, Any]]]:
+    """
+    Non-blocking :func:`web_search` backed by the shared async search client.
+
+    The event loop stays free during the HTTP round-trip, so several tool
+    calls from one agent run (or many candidates) can search in parallel.
+    Results share the process-wide search cache with :func:`web_search`.
+    """
+    return await get_search_cache().aget_or_fetch(
+        query, recency, max_results,
+        lambda: _uncached_web_search_async(query, recency, max_results),
+    )
 
-        for result in results:
-            url = result.get("url", "")
 
-            # Skip duplicate URLs
-            if url in seen_urls:
-                logger.info(f"Skipping duplicate search result URL: {url}")
-                continue
+def cached_web_search(query: str,
+                      recency: str,
+                      max_results: int = 5) -> Optional[List[Dict[str, Any]]]:
+    """Return results for the search only if they are already cached."""
+    return get_search_cache().peek(query, recency, max_results)
 
-            seen_urls.add(url)
-            processed_results.append({
-                "title": result.get("title", "Untitled"),
-                "content": result.get("content"),
-                "raw_content": result.get("raw_content"),
-                "url": url
-            })
 
+async def _uncached_web_search_async(query: str,
+                                     recency: str,
+                                     max_results: int) -> Optional[List[Dict[str, Any]]]:
+    try:
         logger.info(
-            f"Retrieved {len(processed_results)} unique web results")
-        return processed_results
-
+            f"Initiating web search for: {query}, limit: {max_results}")
+        search_response = await get_async_search_client().search(
+            query,
+            max_results=max_results,
+            time_range=recency,
+            include_raw_content=True,
+        )
+        return process_results(search_response.get("results", []))
     except Exception as e:
         logger.error(f"Web search error: {e}")
         return None
+
+
+def process_results(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop duplicate URLs and keep the fields the pitch writer uses."""
+    processed_results = []
+    seen_urls = set()  # Track URLs we've already seen
+
+    for result in results:
+        url = result.get("url", "")
+
+        # Skip duplicate URLs
+        if url in seen_urls:
+            logger.info(f"Skipping duplicate search result URL: {url}")
+            continue
+
+        seen_urls.add(url)
+        processed_results.append({
+            "title": result.get("title", "Untitled"),
+            "content": result.get("content"),
+            "raw_content": result.get("raw_content"),
+            "url": url
+        })
+
+    logger.info(
+        f"Retrieved {len(processed_results)} unique web results")
+    return processed_results
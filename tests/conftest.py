@@ -0,0 +1,5 @@
+import os
+
+# Agents are built lazily, but the OpenAI provider still wants a key; tests
+# never reach the network.
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
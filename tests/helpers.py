@@ -0,0 +1,16 @@
+from pitch_evolve.agents.llm_as_judge import JudgeFeedback, PitchScores
+
+
+def uniform_scores(value: float) -> dict:
+    """The same score, clamped to 0-100, on every judge dimension."""
+    value = int(max(0, min(100, value)))
+    return {d: value for d in PitchScores.model_fields}
+
+
+def uniform_feedback(value: float) -> JudgeFeedback:
+    return JudgeFeedback(scores=PitchScores(**uniform_scores(value)))
+
+
+def length_feedback(pitch: str) -> JudgeFeedback:
+    """Deterministic judge: longer pitches score higher (mod 101)."""
+    return uniform_feedback(len(pitch) % 101)
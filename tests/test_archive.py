@@ -0,0 +1,42 @@
+import random
+
+from pitch_evolve.evolution import CandidateArchive, PromptEvolutionEngine
+
+from helpers import uniform_feedback
+
+
+def _engine(archive, population, tmp_path):
+    return PromptEvolutionEngine(
+        population=population, generator=lambda p: p,
+        evaluator=lambda pitch: uniform_feedback(min(len(pitch), 100)),
+        mutator=lambda f, pitch, prompt: prompt + " More.", mutation_rate=1.0,
+        rng=random.Random(0), archive=archive,
+        run_id=archive.start_run("Pitch Go."), output_dir=str(tmp_path),
+    )
+
+
+def test_archive_records_runs_and_seeds_the_next_one(tmp_path):
+    path = str(tmp_path / "archive" / "runs.sqlite")
+    archive = CandidateArchive(path)
+    first = _engine(archive, ["Pitch Go."] * 4, tmp_path)
+    first.evolve(generations=2)
+
+    top = archive.top(3)
+    assert [r["prompt"] for r in top] == ["Pitch Go. More.", "Pitch Go."]
+    assert top[0]["scores"]["clarity"] == len("Pitch Go. More.")
+    assert top[0]["operator"] == "mutate"
+    assert [a["prompt"] for a in archive.lineage(top[0]["prompt"])] == \
+        ["Pitch Go. More.", "Pitch Go."]
+    archive.close()
+
+    # A fresh process sees the first run and starts from its best prompts.
+    archive = CandidateArchive(path)
+    assert archive.seed_population("Pitch Go.", 3) == \
+        ["Pitch Go. More.", "Pitch Go.", "Pitch Go."]
+    assert archive.seed_population("Pitch Rust.", 2) == ["Pitch Rust."] * 2
+    second = _engine(archive, archive.seed_population("Pitch Go.", 4), tmp_path)
+    second.evolve(generations=1)
+    runs = archive.runs()
+    assert len(runs) == 2 and runs[0]["run_id"] == second.run_id
+    assert [r["prompt"] for r in archive.top(5, run_id=second.run_id)] == \
+        ["Pitch Go. More.", "Pitch Go."]
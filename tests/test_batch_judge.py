@@ -0,0 +1,149 @@
+import random
+import re
+
+import pytest
+from pydantic_ai.messages import ModelResponse, ToolCallPart, UserPromptPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from pitch_evolve.agents.llm_as_judge import (
+    BatchJudgement,
+    get_batch_judge_agent,
+    llm_as_batch_judge,
+    llm_as_batch_judge_async,
+)
+from pitch_evolve.evolution import FitnessCache, PromptEvolutionEngine
+
+from helpers import length_feedback, uniform_feedback, uniform_scores
+
+
+def _batch_model(requests: list) -> FunctionModel:
+    """Scores each pitch by its length; drops pitches containing 'skip'."""
+
+    def batch_judge(messages, info: AgentInfo) -> ModelResponse:
+        payload = next(p.content for m in messages for p in m.parts
+                       if isinstance(p, UserPromptPart))
+        pitches = re.split(r"### PITCH \d+\n", payload)[1:]
+        pitches = [p.strip() for p in pitches]
+        requests.append(pitches)
+        evaluations = [{"index": i, "scores": uniform_scores(len(p) % 101)}
+                       for i, p in enumerate(pitches) if "skip" not in p]
+        ranking = sorted(range(len(pitches)), key=lambda i: -len(pitches[i]))
+        return ModelResponse(parts=[ToolCallPart(info.output_tools[0].name, {
+            "evaluations": evaluations, "ranking": ranking + [99]})])
+
+    return FunctionModel(batch_judge)
+
+
+def test_batch_judge_maps_scores_and_ranking():
+    requests = []
+    with get_batch_judge_agent().override(model=_batch_model(requests)):
+        result = llm_as_batch_judge(["aa", "a", "skip me", "aaaa"])
+
+    assert len(requests) == 1
+    assert [f.scores.creativity if f.scores else None for f in result.feedback] == \
+        [2, 1, None, 4]
+    # Unscored pitches rank last and out-of-range indices are dropped.
+    assert result.ranking == [3, 0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_batch_judge_splits_into_batches():
+    requests = []
+    pitches = ["a" * n for n in range(1, 8)]
+    with get_batch_judge_agent().override(model=_batch_model(requests)):
+        result = await llm_as_batch_judge_async(pitches, batch_size=3)
+
+    assert sorted(len(r) for r in requests) == [1, 3, 3]
+    assert [f.scores.flow for f in result.feedback] == list(range(1, 8))
+    assert result.ranking == list(range(6, -1, -1))
+
+
+def _engine(tmp_path, name, calls, **kwargs):
+    def judge_batch(pitches):
+        calls.append(list(pitches))
+        return BatchJudgement(feedback=[length_feedback(p) for p in pitches],
+                              ranking=list(range(len(pitches))))
+
+    return PromptEvolutionEngine(
+        population=["a", "bb", "ccc", "dddd", "eeeee", "ffffff"],
+        generator=lambda p: p, rng=random.Random(7),
+        mutator=lambda f, pitch, prompt: prompt + "!",
+        batch_evaluator=judge_batch, judge_batch_size=4,
+        output_dir=str(tmp_path / name), **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_engine_batched_matches_per_pitch(tmp_path):
+    single = PromptEvolutionEngine(
+        population=["a", "bb", "ccc", "dddd", "eeeee", "ffffff"],
+        generator=lambda p: p, rng=random.Random(7), evaluator=length_feedback,
+        mutator=lambda f, pitch, prompt: prompt + "!",
+        output_dir=str(tmp_path / "single"),
+    )
+    single.evolve(generations=3)
+
+    sync_calls, async_calls = [], []
+    batched = _engine(tmp_path, "sync", sync_calls)
+    batched.evolve(generations=3)
+    async_batched = _engine(tmp_path, "async", async_calls, concurrency=3)
+    await async_batched.evolve_async(generations=3)
+
+    assert batched.history == single.history
+    assert async_batched.history == single.history
+    assert batched.score_history == single.score_history
+    # Six unique pitches in the first generation -> two judge calls.
+    assert [len(c) for c in sync_calls[:2]] == [4, 2]
+    assert all(len(set(c)) == len(c) for c in sync_calls)
+
+
+def test_sync_evolve_uses_async_only_batch_evaluator(tmp_path):
+    calls = []
+
+    async def judge_batch(pitches):
+        calls.append(list(pitches))
+        return [length_feedback(p) for p in pitches]
+
+    engine = PromptEvolutionEngine(
+        population=["a", "bb", "ccc"], generator=lambda p: p, rng=random.Random(7),
+        evaluator=lambda pitch: pytest.fail("per-pitch judge used"),
+        mutator=lambda f, pitch, prompt: prompt + "!",
+        async_batch_evaluator=judge_batch, judge_batch_size=4,
+        output_dir=str(tmp_path),
+    )
+    engine.evolve(generations=1)
+
+    assert calls[0] == ["a", "bb", "ccc"]
+
+
+def test_engine_batched_caches_whole_batches(tmp_path):
+    cache = FitnessCache()
+    calls = []
+    _engine(tmp_path, "first", calls, cache=cache).evolve(generations=2)
+    # Survivors are judged again alongside the new generation's pitches.
+    judged = [p for c in calls for p in c]
+    assert len(judged) > len(set(judged))
+
+    # The same batches recur in a repeat run and are all served from cache.
+    repeat = []
+    _engine(tmp_path, "repeat", repeat, cache=cache).evolve(generations=2)
+    assert repeat == []
+
+
+def test_engine_batch_ranking_breaks_score_ties(tmp_path):
+    def judge_batch(pitches):
+        # Equal scores; the judge prefers later pitches.
+        return BatchJudgement(feedback=[uniform_feedback(50)
+                                        for _ in pitches],
+                              ranking=list(range(len(pitches)))[::-1])
+
+    engine = PromptEvolutionEngine(
+        population=["w", "x", "y", "z"], generator=lambda p: p, rng=random.Random(7),
+        mutator=lambda f, pitch, prompt: prompt + "!", mutation_rate=0.0,
+        batch_evaluator=judge_batch, judge_batch_size=4,
+        output_dir=str(tmp_path / "ties"),
+    )
+    engine.evolve(generations=1)
+
+    assert engine.batch_ranks == {"z": 1.0, "y": 0.75, "x": 0.5, "w": 0.25}
+    assert engine.population[0] == "z"
@@ -0,0 +1,50 @@
+import os
+from types import SimpleNamespace
+
+from pitch_evolve.agents import usage
+from pitch_evolve.agents.llm_as_judge import JudgeFeedback
+from pitch_evolve.agents.usage import UsageTracker, get_usage_tracker
+from pitch_evolve.evolution import PromptEvolutionEngine
+from pitch_evolve.evolution.budget import BudgetGovernor
+
+
+def test_governor_shrinks_population_then_stops(tmp_path, monkeypatch):
+    tracker = UsageTracker()
+    monkeypatch.setattr(usage, "_tracker", tracker)
+
+    def generate(prompt):
+        get_usage_tracker().record(
+            "writer", "openai:gpt-4.1",
+            SimpleNamespace(request_tokens=80, response_tokens=20))
+        return prompt
+
+    engine = PromptEvolutionEngine(
+        population=["p"] * 4, generator=generate,
+        evaluator=lambda pitch: JudgeFeedback(), mutator=lambda f, pi, pr: pr,
+        budget=BudgetGovernor(max_tokens=700, tracker=tracker),
+        output_dir=str(tmp_path),
+    )
+    engine.evolve(generations=5)
+
+    # 400 tokens for generation 1, 300 left covers 3 candidates, then stop.
+    assert [len(p) for p in engine.history] == [4, 3]
+    assert tracker.total_tokens == 700
+    assert tracker.totals_by("generation")[2]["calls"] == 3
+    assert os.path.exists(tmp_path / "usage.json")
+
+
+class _ShrinkOnce(BudgetGovernor):
+    def plan(self, generation, population_size):
+        return (2 if generation == 1 else population_size), True
+
+
+def test_shrunk_population_does_not_grow_back(tmp_path):
+    engine = PromptEvolutionEngine(
+        population=["a", "bb", "ccc", "dddd"], generator=lambda p: p,
+        evaluator=lambda pitch: JudgeFeedback(), mutator=lambda f, pi, pr: pr + "!",
+        tournament_size=4, budget=_ShrinkOnce(max_tokens=10**6),
+        output_dir=str(tmp_path),
+    )
+    engine.evolve(generations=3)
+
+    assert [len(p) for p in engine.history] == [2, 2, 2]
@@ -0,0 +1,18 @@
+from pitch_evolve.tools.compaction import compact_results, count_tokens
+
+
+def test_compaction_keeps_relevant_passages_within_budget():
+    filler = "\n\n".join(
+        f"Paragraph {i} talks about gardening, weather and cooking recipes." for i in range(50)
+    )
+    relevant = "Go has over three million developers and a thriving community."
+    raw = filler + "\n\n" + relevant + "\n\n" + filler
+    results = [{"title": "t", "content": "c", "raw_content": raw, "url": "u"}]
+
+    compacted, stats = compact_results(results, "Go community developers", token_budget=40)
+
+    text = compacted[0]["raw_content"]
+    assert relevant in text
+    assert count_tokens(text) <= 40
+    assert stats.tokens_saved > 0 and stats.bytes_saved > 0
+    assert results[0]["raw_content"] == raw
@@ -0,0 +1,123 @@
+import asyncio
+import os
+import random
+
+import pytest
+
+from pitch_evolve.agents.llm_as_judge import JudgeFeedback
+from pitch_evolve.evolution import PromptEvolutionEngine, RunJournal
+
+from helpers import length_feedback
+
+
+def _mutate(feedback, pitch, prompt):
+    return prompt + "!"
+
+
+@pytest.mark.asyncio
+async def test_evolve_async_matches_sync(tmp_path):
+    in_flight = 0
+    peak = 0
+
+    async def generate(prompt: str) -> str:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return prompt
+
+    async def evaluate(pitch: str) -> JudgeFeedback:
+        return length_feedback(pitch)
+
+    async def mutate(feedback, pitch, prompt):
+        return _mutate(feedback, pitch, prompt)
+
+    population = ["a", "bb", "ccc", "dddd", "eeeee", "ffffff"]
+
+    sync_engine = PromptEvolutionEngine(
+        population=list(population), generator=lambda p: p, rng=random.Random(7),
+        evaluator=length_feedback, mutator=_mutate, output_dir=str(tmp_path / "sync"),
+    )
+    sync_engine.evolve(generations=3)
+
+    async_engine = PromptEvolutionEngine(
+        population=list(population), generator=lambda p: p, rng=random.Random(7),
+        async_generator=generate, async_evaluator=evaluate,
+        async_mutator=mutate, concurrency=3,
+        output_dir=str(tmp_path / "async"),
+    )
+    await async_engine.evolve_async(generations=3)
+
+    assert async_engine.history == sync_engine.history
+    assert async_engine.score_history == sync_engine.score_history
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_steady_state_keeps_workers_busy_past_a_slow_candidate(tmp_path):
+    finished = []
+
+    async def generate(prompt: str) -> str:
+        await asyncio.sleep(0.3 if prompt == "slow" else 0.01)
+        finished.append(prompt)
+        return prompt
+
+    async def evaluate(pitch: str) -> JudgeFeedback:
+        return length_feedback(pitch)
+
+    async def mutate(feedback, pitch, prompt):
+        return _mutate(feedback, pitch, prompt)
+
+    engine = PromptEvolutionEngine(
+        population=["slow", "bb", "ccc", "dddd"], generator=lambda p: p,
+        rng=random.Random(3), async_generator=generate, async_evaluator=evaluate,
+        async_mutator=mutate, concurrency=2, output_dir=str(tmp_path),
+    )
+    await engine.evolve_steady_state(evaluations=12)
+
+    # The other worker kept evaluating mutants while "slow" was in flight.
+    assert finished.index("slow") >= 5
+    assert len(finished) == 12
+    assert len(engine.score_history) == len(engine.history) == 3
+    assert all(len(h) <= 4 for h in engine.history)
+    assert [r["evaluations"] for r in engine.throughput_history] == [4, 8, 12]
+    assert all(r["evals_per_s"] > 0 for r in engine.throughput_history)
+    assert os.path.exists(tmp_path / "generation_3_prompt.txt")
+
+
+@pytest.mark.asyncio
+async def test_steady_state_checkpoints_windows_for_resume(tmp_path):
+    async def generate(prompt: str) -> str:
+        return prompt
+
+    async def evaluate(pitch: str) -> JudgeFeedback:
+        return length_feedback(pitch)
+
+    async def mutate(feedback, pitch, prompt):
+        return _mutate(feedback, pitch, prompt)
+
+    def engine(journal):
+        return PromptEvolutionEngine(
+            population=["a", "bb", "ccc", "dddd"], generator=lambda p: p,
+            rng=random.Random(3), async_generator=generate, async_evaluator=evaluate,
+            async_mutator=mutate, concurrency=2, output_dir=str(tmp_path), journal=journal)
+
+    path = str(tmp_path / "journal.jsonl")
+    first = engine(RunJournal(path))
+    await first.evolve_steady_state(evaluations=8)
+    first.journal.close()
+
+    resumed = engine(RunJournal(path, resume=True))
+    assert resumed.resume() == 2
+    assert resumed.history == first.history
+    assert resumed.population == first.population
+
+
+def test_steady_state_rejects_generation_only_options(tmp_path):
+    engine = PromptEvolutionEngine(
+        population=["a", "bb"], generator=lambda p: p, evaluator=length_feedback,
+        selection="pareto", min_diversity=0.5, output_dir=str(tmp_path))
+
+    with pytest.raises(ValueError, match="min_diversity, selection"):
+        asyncio.run(engine.evolve_steady_state(evaluations=4))
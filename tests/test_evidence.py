@@ -0,0 +1,79 @@
+import pytest
+
+from pitch_evolve.agents.pitch_writer import PitchWriterDeps
+from pitch_evolve.tools import web_search as web_search_module
+from pitch_evolve.tools.evidence import (
+    EvidenceCorpus,
+    configure_evidence_corpus,
+    evidence_queries,
+    prefetch_evidence,
+)
+from pitch_evolve.tools.search_cache import configure_search_cache
+
+PAGES = {
+    "go": "Go adoption grew 20% among backend teams in 2024.\n\n"
+          "The Go developer survey reports 93% satisfaction.",
+    "rust": "Rust topped the most admired language list again.\n\n"
+            "Go adoption grew 20% among backend teams in 2024.",
+}
+
+
+class FakeAsyncBackend:
+    def __init__(self):
+        self.queries = []
+
+    async def search(self, query, *, max_results, time_range, include_raw_content=True):
+        self.queries.append(query)
+        key = "rust" if "rust" in query.lower() else "go"
+        return {"results": [{"title": key, "url": f"https://example.com/{key}",
+                             "content": "", "raw_content": PAGES[key]}]}
+
+
+@pytest.fixture
+def backend():
+    fake = FakeAsyncBackend()
+    web_search_module.set_async_search_client(fake)
+    configure_search_cache()
+    yield fake
+    web_search_module.set_async_search_client(None)
+    configure_search_cache()
+    configure_evidence_corpus(None)
+
+
+def test_corpus_deduplicates_and_ranks_passages():
+    corpus = EvidenceCorpus()
+    assert corpus.add_results([{"url": "a", "raw_content": PAGES["go"]}]) == 2
+    assert corpus.add_results([{"url": "b", "raw_content": PAGES["rust"]}]) == 1
+
+    hits = corpus.search("developer survey satisfaction", max_results=2)
+    assert [h["content"] for h in hits] == \
+        ["The Go developer survey reports 93% satisfaction."]
+    assert corpus.search("the of and") == []
+    # Sharing one word of a longer query is not evidence.
+    assert corpus.search("go meetup sponsors venue") == []
+    assert [h["content"] for h in corpus.search("go adoption sponsors")] == \
+        ["Go adoption grew 20% among backend teams in 2024."]
+    assert corpus.stats()["passages"] == 3
+
+
+@pytest.mark.asyncio
+async def test_search_tool_prefers_local_evidence(backend):
+    corpus = await prefetch_evidence(["Go community", "Rust community"])
+    configure_evidence_corpus(corpus)
+    assert len(backend.queries) == 2
+
+    deps = PitchWriterDeps(use_evidence=True, query_budget=5)
+    local = await deps.search("Go adoption backend", recency="m", max_results=2)
+    assert backend.queries == ["Go community", "Rust community"]
+    assert local["results"][0]["content"].startswith("Go adoption grew 20%")
+
+    # Nothing relevant locally: fall back to the network and index the result.
+    await deps.search("zig compiler", recency="m", max_results=1)
+    assert backend.queries[-1] == "zig compiler"
+    assert corpus.stats()["misses"] == 1
+
+
+def test_evidence_queries_use_first_sentence():
+    queries = evidence_queries("Pitch the Go meetup! Mention our sponsors.")
+    assert queries == ["Pitch the Go meetup", "Pitch the Go meetup statistics",
+                       "Pitch the Go meetup recent news"]
@@ -0,0 +1,132 @@
+import argparse
+import random
+from types import SimpleNamespace
+
+import pytest
+from pydantic_ai.messages import ModelResponse, ToolCallPart, ToolReturnPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from pitch_evolve.agents import usage
+from pitch_evolve.agents.pitch_writer import PitchWriterDeps, get_pitch_writer_agent
+from pitch_evolve.cli import build_fidelity_schedule, parse_fidelity
+from pitch_evolve.evolution import PromptEvolutionEngine
+from pitch_evolve.evolution.fidelity import FidelityLevel, fidelity_report
+from pitch_evolve.tools.search_cache import SearchCache, configure_search_cache
+
+from helpers import uniform_feedback
+
+
+POPULATION = ["a", "bb", "ccc", "dddd", "eeeee", "ffffff", "g", "hh"]
+
+
+def _engine(tmp_path, name, full_calls, low_calls):
+    def judge(pitch):
+        full_calls.append(pitch)
+        return uniform_feedback(len(pitch) % 101)
+
+    def cheap_judge(pitch):
+        low_calls.append(pitch)
+        return uniform_feedback(len(pitch) % 101)
+
+    return PromptEvolutionEngine(
+        population=list(POPULATION), generator=lambda p: p, evaluator=judge,
+        mutator=lambda f, pitch, prompt: prompt + "!", rng=random.Random(1),
+        fidelity_schedule=[FidelityLevel("low", keep=0.5, generator=lambda p: p,
+                                         evaluator=cheap_judge)],
+        output_dir=str(tmp_path / name),
+    )
+
+
+@pytest.mark.asyncio
+async def test_only_promoted_candidates_reach_full_fidelity(tmp_path):
+    full, low = [], []
+    engine = _engine(tmp_path, "sync", full, low)
+    engine.evolve(generations=2)
+
+    assert len(low) == 2 * len(POPULATION)
+    assert len(full) == 2 * len(POPULATION) // 2
+    # The longest (best-scoring) pitches are the ones promoted.
+    assert sorted(full[:4]) == sorted(["dddd", "eeeee", "ffffff", "ccc"])
+    assert [r["evaluations_saved"] for r in engine.fidelity_history] == [4, 4]
+
+    async_engine = _engine(tmp_path, "async", [], [])
+    async_engine.concurrency = 3
+    await async_engine.evolve_async(generations=2)
+    assert async_engine.history == engine.history
+
+
+def test_fidelity_report_extrapolates_flat_cost():
+    tracker = usage.UsageTracker()
+    tokens = SimpleNamespace(request_tokens=10, response_tokens=0)
+    for j in range(4):
+        with usage.scope(generation=1, candidate=j, fidelity="low"):
+            tracker.record("writer", "gpt-4.1-mini", tokens)
+    for j in range(2):
+        with usage.scope(generation=1, candidate=j):
+            tracker.record("writer", "gpt-4.1", SimpleNamespace(
+                request_tokens=100, response_tokens=0))
+            tracker.record("judge", "gpt-4.1", tokens)
+
+    report = fidelity_report(tracker, 1, population=4, rungs=[4], promoted=2)
+
+    assert report["calls"] == 8
+    assert report["calls_saved"] == 0
+    assert report["tokens_saved"] == (4 * 110) - (40 + 220)
+
+
+def test_fidelity_rung_limits_search_results():
+    cache = configure_search_cache()
+    cache.get_or_fetch("go users", "m", 5, lambda: [
+        {"title": str(n), "url": f"https://x/{n}", "content": "c"} for n in range(5)])
+
+    def writer(messages, info: AgentInfo) -> ModelResponse:
+        returns = [p for m in messages for p in m.parts if isinstance(p, ToolReturnPart)]
+        if not returns:
+            # The model asks for more results than the rung allows.
+            return ModelResponse(parts=[ToolCallPart(
+                "search", {"query": "go users", "recency": "m", "max_results": 5})])
+        count = len(returns[0].content["results"])
+        return ModelResponse(parts=[ToolCallPart(
+            info.output_tools[0].name, {"topic": "go", "output": str(count)})])
+
+    (level,) = build_fidelity_schedule(
+        [{"query_budget": 3, "max_results": 2, "keep": 0.5, "model": None}],
+        PitchWriterDeps(max_results=5, raw_content_budget=None))
+    try:
+        with get_pitch_writer_agent().override(model=FunctionModel(writer)):
+            assert level.generator("pitch go") == "2"
+    finally:
+        configure_search_cache()
+
+
+def test_parse_fidelity():
+    assert parse_fidelity("1:2:0.5:openai:gpt-4.1-mini") == {
+        "query_budget": 1, "max_results": 2, "keep": 0.5,
+        "model": "openai:gpt-4.1-mini"}
+    assert parse_fidelity("2:1:0.25")["model"] is None
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_fidelity("2:1")
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_fidelity("2:1:1.5")
+
+
+def test_search_cache_peek_reuses_larger_results():
+    cache = SearchCache()
+    cache.get_or_fetch("Go  Users", "m", 3, lambda: [1, 2, 3])
+
+    assert cache.peek("go users", "m", 2) == [1, 2]
+    assert cache.peek("go users", "m", 5) is None
+    assert cache.peek("go users", "w", 2) is None
+
+
+def test_search_cache_peek_prefers_smallest_entry_and_survives_reload(tmp_path):
+    path = str(tmp_path / "search.json")
+    cache = SearchCache(path=path, ttl={"d": 0})
+    cache.get_or_fetch("go users", "m", 5, lambda: [1, 2, 3, 4, 5])
+    cache.get_or_fetch("go users", "m", 3, lambda: ["a", "b", "c"])
+    cache.get_or_fetch("go users", "d", 3, lambda: [9, 9, 9])
+
+    assert cache.peek("Go users!", "m", 2) == ["a", "b"]
+    assert cache.peek("go users", "d", 2) is None  # expired at once
+    cache.flush()
+    assert SearchCache(path=path).peek("go users", "m", 4) == [1, 2, 3, 4]
@@ -0,0 +1,59 @@
+from pitch_evolve.agents.llm_as_judge import JudgeFeedback
+from pitch_evolve.evolution import FitnessCache, PromptEvolutionEngine
+from pitch_evolve.evolution.cache import make_key
+
+
+def test_cache_persists_and_evicts(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = FitnessCache(path=path, max_entries=1)
+    cache.put(make_key("generate", "a"), "pitch a")
+    cache.put(make_key("generate", "b"), "pitch b")
+    assert cache.evictions == 1
+    cache.close()
+
+    reopened = FitnessCache(path=path)
+    assert reopened.get(make_key("generate", "a")) == ["pitch a"]
+    assert make_key("generate", "a") != make_key("generate", "a", context="m2")
+
+
+def test_cache_resamples_up_to_limit():
+    cache = FitnessCache(max_samples=2)
+    values = iter(range(10))
+    drawn = [cache.get_or_compute("k", lambda: next(values)) for _ in range(4)]
+    assert drawn == [0, 1, 0, 1]
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_engine_reuses_duplicate_candidates(tmp_path):
+    calls = {"generate": 0, "evaluate": 0}
+
+    def generate(prompt):
+        calls["generate"] += 1
+        return prompt.upper()
+
+    def evaluate(pitch):
+        calls["evaluate"] += 1
+        return JudgeFeedback()
+
+    engine = PromptEvolutionEngine(
+        population=["same"] * 4, generator=generate, evaluator=evaluate,
+        mutation_rate=0.0, cache=FitnessCache(), output_dir=str(tmp_path),
+    )
+    engine.evolve(generations=3)
+    assert calls == {"generate": 1, "evaluate": 1}
+
+
+def test_mutations_bypass_the_cache_by_default(tmp_path):
+    children = iter(range(100))
+
+    def run(**kwargs):
+        engine = PromptEvolutionEngine(
+            population=["same"] * 2, generator=lambda p: p, evaluator=lambda p: JudgeFeedback(),
+            mutator=lambda f, pitch, prompt: f"child {next(children)}", mutation_rate=1.0,
+            tournament_size=1, cache=FitnessCache(), output_dir=str(tmp_path), **kwargs)
+        engine.evolve(generations=3)
+        return {p for h in engine.history for p in h if p.startswith("child")}
+
+    # The surviving parent's mutation inputs repeat; each draw is still fresh.
+    assert len(run()) > 1
+    assert len(run(cache_variation=True)) == 1
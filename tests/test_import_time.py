@@ -0,0 +1,37 @@
+"""Import-time regression budget for the CLI and engine entry points."""
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+# Modules that must only be imported once a command actually needs them.
+HEAVY_MODULES = ("pydantic_ai", "matplotlib", "logfire", "tavily", "httpx", "openai")
+BUDGET_MS = float(os.getenv("PITCH_EVOLVE_IMPORT_BUDGET_MS", "1000"))
+_LINE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \| *(\S+)")
+
+
+def _importtime(module):
+    env = dict(os.environ)
+    # Installed pydantic plugins (e.g. logfire's) load on first model
+    # definition; they are environment-specific, so keep them out of the budget.
+    env["PYDANTIC_DISABLE_PLUGINS"] = "__all__"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    imported, total_us = set(), 0
+    for match in _LINE.finditer(proc.stderr):
+        cumulative, name = match.groups()
+        imported.add(name.split(".")[0])
+        if name == module:
+            total_us = int(cumulative)
+    return imported, total_us / 1000
+
+
+@pytest.mark.parametrize("module", ["pitch_evolve", "pitch_evolve.cli", "pitch_evolve.evolution"])
+def test_import_stays_light(module):
+    imported, total_ms = _importtime(module)
+    assert not imported.intersection(HEAVY_MODULES)
+    assert total_ms < BUDGET_MS, f"{module} took {total_ms:.0f}ms to import"
@@ -0,0 +1,112 @@
+import functools
+import os
+import random
+import sys
+
+import pytest
+
+from pitch_evolve import cli
+from pitch_evolve.evolution import CandidateArchive, PromptEvolutionEngine
+from pitch_evolve.evolution.islands import DirectoryTransport, run_islands
+
+from helpers import length_feedback
+
+
+def _mutate(island, feedback, pitch, prompt):
+    return prompt + str(island)
+
+
+def _engine(output_dir, island, population, archive_path=None, run_id=None):
+    return PromptEvolutionEngine(
+        population=population, generator=lambda p: p, evaluator=length_feedback,
+        mutator=functools.partial(_mutate, island), rng=random.Random(island),
+        concurrency=1, output_dir=os.path.join(output_dir, f"island-{island}"),
+        archive=CandidateArchive(archive_path) if archive_path else None, run_id=run_id,
+    )
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_islands_exchange_migrants_and_merge_history(tmp_path, executor):
+    run = run_islands(functools.partial(_engine, str(tmp_path)), ["a", "b", "c", "d"],
+                      islands=3, generations=4, migration_interval=2, migrants=1,
+                      executor=executor, timeout=30)
+
+    assert [r["island"] for r in run.islands] == [0, 1, 2]
+    assert len(run.history) == len(run.score_history) == len(run.diversity) == 4
+    assert all(len(h) == 12 for h in run.history)
+    for result in run.islands:
+        (migration,) = result["migrations"]
+        assert migration["generation"] == 2
+        # Ring topology: each island receives the elite of its predecessor.
+        source = run.islands[(result["island"] - 1) % 3]["migrations"][0]["sent"]
+        assert migration["received"] == source
+        assert migration["accepted"] == 1
+    assert run.best_score == max(r["best_score"] for r in run.islands)
+
+
+def test_directory_transport_round_trip_and_timeout(tmp_path):
+    transport = DirectoryTransport(str(tmp_path), "run-a", poll_interval=0.01)
+    transport.send(0, 1, 0, ["best prompt"])
+
+    assert transport.receive(1, 0, timeout=1) == ["best prompt"]
+    assert transport.receive(1, 0, timeout=0.05) == []
+    assert transport.receive(0, 1, timeout=0.05) == []
+
+
+def test_directory_transport_isolates_runs_and_drops_stale_migrants(tmp_path):
+    old = DirectoryTransport(str(tmp_path), "old", poll_interval=0.01)
+    old.send(0, 1, 0, ["stale"])
+    new = DirectoryTransport(str(tmp_path), "new", poll_interval=0.01)
+    assert new.receive(1, 0, timeout=0.05) == []
+
+    # A migrant arriving after its epoch timed out is dropped, not delivered later.
+    new.send(0, 1, 0, ["late"])
+    new.send(0, 1, 1, ["fresh"])
+    assert new.receive(1, 1, timeout=1) == ["fresh"]
+    assert os.listdir(tmp_path / "new") == []
+
+
+def test_island_subset_needs_valid_ids_and_a_shared_transport(tmp_path):
+    factory = functools.partial(_engine, str(tmp_path))
+    with pytest.raises(ValueError, match="unique"):
+        run_islands(factory, ["a"], islands=2, island_ids=[0, 2], executor="thread")
+    with pytest.raises(ValueError, match="shared transport"):
+        run_islands(factory, ["a"], islands=2, island_ids=[0], executor="thread")
+
+
+@pytest.mark.parametrize("extra, message", [
+    (["--island-ids", "0"], "--island-ids needs --migration-dir"),
+    (["--island-ids", "0,0", "--migration-dir", "m", "--migration-run", "r"], "unique"),
+    (["--island-ids", "2", "--migration-dir", "m", "--migration-run", "r"], "unique"),
+])
+def test_cli_validates_island_ids(monkeypatch, capsys, extra, message):
+    monkeypatch.setattr(cli, "configure_telemetry", lambda: None)
+    monkeypatch.setattr(sys, "argv", ["pitch-evolve", "evolve", "--prompt", "x",
+                                      "--islands", "2", *extra])
+    with pytest.raises(SystemExit):
+        cli.main()
+    assert message in capsys.readouterr().err
+
+
+def test_islands_record_to_one_archive_run(tmp_path):
+    path = str(tmp_path / "archive.sqlite")
+    archive = CandidateArchive(path)
+    run_id = archive.start_run("a", {"islands": 2})
+    run_islands(functools.partial(_engine, str(tmp_path), archive_path=path, run_id=run_id),
+                ["a", "b"], islands=2, generations=2, migration_interval=1,
+                executor="thread", timeout=30)
+
+    rows = archive.top(100, run_id=run_id)
+    assert {r["run_id"] for r in rows} == {run_id}
+    # Both islands start from "a" and "b", so each is recorded at least twice.
+    evaluations = {r["prompt"]: r["evaluations"] for r in rows}
+    assert evaluations["a"] >= 2 and evaluations["b"] >= 2
+
+
+def test_islands_reject_single_engine_options(monkeypatch, capsys):
+    monkeypatch.setattr(cli, "configure_telemetry", lambda: None)
+    monkeypatch.setattr(sys, "argv", ["pitch-evolve", "evolve", "--prompt", "x",
+                                      "--islands", "2", "--cache", "c.sqlite", "--resume"])
+    with pytest.raises(SystemExit):
+        cli.main()
+    assert "--islands cannot be combined with --cache, --resume" in capsys.readouterr().err
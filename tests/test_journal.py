@@ -0,0 +1,52 @@
+import random
+
+import pytest
+
+from pitch_evolve.evolution import PromptEvolutionEngine
+from pitch_evolve.evolution.journal import RunJournal
+
+from helpers import uniform_feedback
+
+
+def _evaluate(pitch):
+    return uniform_feedback((len(pitch) * 7) % 101)
+
+
+def _engine(tmp_path, generator, journal):
+    return PromptEvolutionEngine(
+        population=["a", "bb", "ccc", "dddd"], generator=generator,
+        evaluator=_evaluate, mutator=lambda f, pitch, prompt: prompt + "+",
+        mutation_rate=0.7, rng=random.Random(3), journal=journal,
+        output_dir=str(tmp_path),
+    )
+
+
+def test_resume_replays_completed_calls(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    reference = _engine(tmp_path / "ref", lambda p: p * 2, None)
+    reference.evolve(generations=3)
+
+    calls = []
+
+    def crashing(prompt):
+        if len(calls) == 6:
+            raise RuntimeError("worker died")
+        calls.append(prompt)
+        return prompt * 2
+
+    with pytest.raises(RuntimeError):
+        _engine(tmp_path, crashing, RunJournal(path)).evolve(generations=3)
+
+    resumed_calls = []
+
+    def counting(prompt):
+        resumed_calls.append(prompt)
+        return prompt * 2
+
+    engine = _engine(tmp_path, counting, RunJournal(path, resume=True))
+    assert engine.resume() == 1
+    engine.evolve(generations=2)
+
+    assert engine.history == reference.history
+    assert engine.score_history == reference.score_history
+    assert len(calls) + len(resumed_calls) == 12
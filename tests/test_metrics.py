@@ -0,0 +1,73 @@
+import os
+import random
+import urllib.request
+
+from pitch_evolve.agents import usage
+from pitch_evolve.evolution import PromptEvolutionEngine
+from pitch_evolve.metrics import MetricsRegistry, configure_metrics, get_metrics, serve_metrics
+
+from helpers import length_feedback
+
+
+def test_spans_are_tagged_and_summarised():
+    registry = MetricsRegistry()
+    with usage.scope(generation=2, candidate=1):
+        with registry.span("judge"):
+            pass
+    registry.observe("generate", 0.2)
+    registry.observe("generate", 3.0)
+
+    assert (registry.spans[0].generation, registry.spans[0].candidate) == (2, 1)
+    rows = {r["stage"]: r for r in registry.summary()}
+    assert rows["generate"]["count"] == 2 and rows["generate"]["p95_s"] == 3.0
+    assert registry.summary()[0]["stage"] == "generate"
+    assert "p95_s" in registry.format_summary().splitlines()[0]
+    text = registry.prometheus()
+    assert 'pitch_evolve_stage_seconds_bucket{stage="generate",le="0.25"} 1' in text
+    assert 'pitch_evolve_stage_seconds_count{stage="generate"} 2' in text
+
+
+def test_engine_stages_are_served(tmp_path):
+    registry = configure_metrics(MetricsRegistry())
+    engine = PromptEvolutionEngine(
+        population=["Pitch Go."] * 3, generator=lambda p: p, evaluator=length_feedback,
+        mutator=lambda f, pitch, prompt: prompt + " More.", mutation_rate=1.0,
+        rng=random.Random(0), output_dir=str(tmp_path),
+    )
+    engine.evolve(generations=2)
+
+    stages = {s.stage for s in registry.spans}
+    assert {"generate", "judge", "mutate", "select", "output"} <= stages
+    assert {s.generation for s in registry.spans if s.stage == "judge"} == {1, 2}
+    assert os.path.exists(tmp_path / "metrics.json")
+
+    server = serve_metrics(0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        body = urllib.request.urlopen(url).read().decode()
+    finally:
+        server.shutdown()
+        configure_metrics(MetricsRegistry())
+    assert get_metrics() is not registry
+    assert 'pitch_evolve_stage_seconds_count{stage="select"} 2' in body
+    assert "pitch_evolve_generation 2" in body
+
+
+def test_capped_tracker_and_registry_keep_totals():
+    server = usage.UsageTracker(max_records=3)
+    job = usage.UsageTracker(parent=server)
+    with usage.tracking(job):
+        for _ in range(5):
+            usage.get_usage_tracker().record(
+                "writer", "gpt-4.1", type("U", (), {"request_tokens": 10, "response_tokens": 5}))
+
+    assert len(job.records) == 5 and len(server.records) == 3
+    assert server.total_tokens == job.total_tokens == 75
+    assert server.totals_by("agent")["writer"]["calls"] == 5
+
+    registry = MetricsRegistry(max_spans=2)
+    for seconds in (1.0, 2.0, 3.0):
+        registry.observe("judge", seconds)
+    (row,) = registry.summary()
+    assert len(registry.spans) == 2
+    assert (row["count"], row["total_s"], row["max_s"]) == (3, 6.0, 3.0)
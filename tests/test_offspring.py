@@ -0,0 +1,122 @@
+import random
+
+import pytest
+from pydantic_ai.messages import ModelResponse, ToolCallPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from pitch_evolve.agents.llm_as_judge_mutator import (
+    get_mutator_agent,
+    get_offspring_agent,
+    llm_as_judge_offspring,
+)
+from pitch_evolve.evolution import PromptEvolutionEngine
+
+from helpers import length_feedback
+
+
+POPULATION = ["a", "bb", "ccc", "dddd", "eeeee", "ffffff", "g", "hh"]
+
+
+def _engine(tmp_path, name, calls, **kwargs):
+    def offspring(feedback, pitch, prompt, k):
+        calls.append(("offspring", prompt, k))
+        return [f"{prompt}+{n}" for n in range(k)]
+
+    def crossover(parents, k):
+        calls.append(("crossover", tuple(p[2] for p in parents), k))
+        return [f"{parents[0][2]}x{parents[1][2]}+{n}" for n in range(k)]
+
+    return PromptEvolutionEngine(
+        population=list(POPULATION), generator=lambda p: p, evaluator=length_feedback,
+        mutator=lambda f, pitch, prompt: pytest.fail("single mutator used"),
+        offspring_mutator=offspring, crossover=crossover,
+        mutation_rate=1.0, rng=random.Random(5),
+        output_dir=str(tmp_path / name), **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_offspring_requested_in_bulk(tmp_path):
+    sync_calls, async_calls = [], []
+    engine = _engine(tmp_path, "sync", sync_calls, crossover_rate=0.5)
+    engine.evolve(generations=3)
+    async_engine = _engine(tmp_path, "async", async_calls, crossover_rate=0.5,
+                           concurrency=4)
+    await async_engine.evolve_async(generations=3)
+
+    assert async_engine.history == engine.history
+    assert sorted(async_calls) == sorted(sync_calls)
+    # At most one offspring request per survivor and one crossover request
+    # per generation, instead of one call per refilled slot.
+    assert len(sync_calls) <= 3 * 3
+    assert sum(k for _, _, k in sync_calls) == 3 * (len(POPULATION) - 1)
+    assert any(kind == "crossover" for kind, _, _ in sync_calls)
+    assert all(len(p) == len(POPULATION) for p in engine.history)
+
+
+def test_refill_mutates_the_chosen_parent(tmp_path):
+    seen = []
+
+    def mutate(feedback, pitch, prompt):
+        seen.append((feedback.scores.flow, pitch, prompt))
+        return prompt + "!"
+
+    engine = PromptEvolutionEngine(
+        population=list(POPULATION), generator=lambda p: p, evaluator=length_feedback,
+        mutator=mutate, mutation_rate=1.0, rng=random.Random(5),
+        output_dir=str(tmp_path),
+    )
+    engine.evolve(generations=2)
+
+    assert len(seen) > 2 * 2
+    assert all(pitch == prompt and flow == len(prompt) for flow, pitch, prompt in seen)
+
+
+def test_llm_offspring_drops_empty_and_duplicate_children():
+    def two_children(messages, info: AgentInfo) -> ModelResponse:
+        return ModelResponse(parts=[ToolCallPart(
+            info.output_tools[0].name, {"prompts": ["one", "", "two", "one"]})])
+
+    with get_offspring_agent().override(model=FunctionModel(two_children)):
+        children = llm_as_judge_offspring(length_feedback("p"), "p", "base", k=5)
+
+    assert children == ["one", "two"]
+
+
+@pytest.mark.asyncio
+async def test_short_offspring_answers_fall_back_to_parent_mutations(tmp_path):
+    def offspring(feedback, pitch, prompt, k):
+        return [f"{prompt}+0"] * k
+
+    mutations = []
+
+    def mutate(feedback, pitch, prompt):
+        mutations.append(prompt)
+        return f"{prompt}!{len(mutations)}"
+
+    engine = PromptEvolutionEngine(
+        population=["a", "bb", "ccc", "dddd"], generator=lambda p: p,
+        evaluator=length_feedback, mutator=mutate, offspring_mutator=offspring,
+        mutation_rate=1.0, rng=random.Random(5), output_dir=str(tmp_path),
+    )
+    await engine.evolve_async(generations=1)
+
+    # One child per parent from the offspring call; the rest are mutations.
+    children = [p for p in engine.population if "+0" in p]
+    assert len(children) == len(set(children))
+    assert mutations and len(engine.population) == 4
+
+
+def test_lone_child_uses_the_single_mutator_agent(tmp_path):
+    def single(messages, info: AgentInfo) -> ModelResponse:
+        return ModelResponse(parts=[ToolCallPart(
+            info.output_tools[0].name, {"prompt": "mutated"})])
+
+    def bulk(messages, info: AgentInfo) -> ModelResponse:
+        pytest.fail("offspring agent used for a single child")
+
+    engine = PromptEvolutionEngine(population=["p"], generator=lambda p: p,
+                                   evaluator=length_feedback, output_dir=str(tmp_path))
+    with get_mutator_agent().override(model=FunctionModel(single)), \
+            get_offspring_agent().override(model=FunctionModel(bulk)):
+        assert engine._realise((length_feedback("p"), "p", "base"), 1) == ["mutated"]
@@ -0,0 +1,76 @@
+import random
+
+from pitch_evolve.evolution import FitnessCache, PromptEvolutionEngine
+from pitch_evolve.evolution.cache import make_key
+from pitch_evolve.evolution.pareto import crowding_distance, non_dominated_fronts, nsga2_order
+
+from helpers import uniform_feedback
+
+
+def test_non_dominated_fronts_and_crowding():
+    # (score, -cost): 0 and 1 trade off, 2 is dominated by 1, 3 by everyone.
+    points = [(90, -100), (80, -10), (70, -20), (10, -500)]
+    assert non_dominated_fronts(points) == [[0, 1], [2], [3]]
+    assert nsga2_order(points) == [0, 1, 2, 3]
+
+    front = [(90, -100), (85, -50), (80, -10), (84, -49)]
+    crowding = crowding_distance(front, [0, 1, 2, 3])
+    assert crowding[0] == crowding[2] == float("inf")
+    assert crowding[1] > crowding[3]
+
+
+def test_pareto_selection_keeps_short_prompt_and_compacts(tmp_path, monkeypatch):
+    # Every generation takes the same (zero) time, so only score and tokens differ.
+    monkeypatch.setattr("pitch_evolve.evolution.engine.time.perf_counter", lambda: 0.0)
+    short, long_ = "Pitch Go.", "Pitch the Go meetup. " * 40
+    scores = {short: 60, long_: 70, "Pitch the Rust release.": 50, "Pitch Zig. " * 45: 40}
+    compacted = []
+
+    def compact(feedback, pitch, prompt):
+        compacted.append(prompt)
+        return prompt[:20]
+
+    engine = PromptEvolutionEngine(
+        population=list(scores), generator=lambda p: p,
+        evaluator=lambda pitch: uniform_feedback(scores.get(pitch, 50)),
+        mutator=lambda f, pitch, prompt: prompt, mutation_rate=0.0,
+        tournament_size=2, selection="pareto", compaction_rate=1.0,
+        compactor=compact, rng=random.Random(0), output_dir=str(tmp_path),
+    )
+    engine.evolve(generations=1)
+
+    # Best score first, then the cheapest prompt instead of the runner-up score.
+    assert engine.history[0][:3] == [long_, long_, short]
+    assert set(compacted) <= {long_, short} and len(compacted) == len(set(compacted))
+    front = engine.pareto_front()
+    assert [r["prompt"] for r in front] == [long_, short]
+    assert front[0]["prompt_tokens"] > front[1]["prompt_tokens"]
+    assert all(engine.generation_costs[p]["generations"] == 1 for p in scores)
+
+
+def test_cached_generations_keep_their_cost_and_unknown_costs_are_none(tmp_path):
+    def engine(cache):
+        return PromptEvolutionEngine(
+            population=["pitch a", "pitch b"], generator=lambda p: p,
+            evaluator=lambda pitch: uniform_feedback(50), mutator=lambda f, pitch, prompt: prompt,
+            mutation_rate=0.0, selection="pareto", cache=cache,
+            rng=random.Random(0), output_dir=str(tmp_path))
+
+    cache = FitnessCache()
+    first = engine(cache)
+    first.evolve(generations=1)
+    second = engine(cache)
+    second.evolve(generations=1)
+    assert cache.hits > 0
+    assert second.generation_costs == first.generation_costs
+    assert second.objectives["pitch a"]["latency_s"] is not None
+
+    # A pitch cached without its cost (e.g. by an older version) is unknown,
+    # not free, so it cannot dominate on the cost objectives.
+    legacy = FitnessCache()
+    legacy.put(make_key("generate", "pitch a", context=None), "pitch a")
+    third = engine(legacy)
+    third.evolve(generations=1)
+    assert third.objectives["pitch a"]["latency_s"] is None
+    assert third.objectives["pitch b"]["latency_s"] is not None
+    assert {r["prompt"] for r in third.pareto_front()} == {"pitch a", "pitch b"}
@@ -1,19 +1,42 @@
-from pitch_evolve.agents.pitch_writer import PitchWriterDeps
 import pytest
-import os
-os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+
+from pitch_evolve.agents.pitch_writer import PitchWriterDeps
+from pitch_evolve.tools import web_search as web_search_module
+from pitch_evolve.tools.search_cache import configure_search_cache
+
+
+class FakeAsyncBackend:
+    def __init__(self):
+        self.queries = []
+
+    async def search(self, query, *, max_results, time_range, include_raw_content=True):
+        self.queries.append(query)
+        return {"results": [{"title": query, "url": "https://example.com/go",
+                             "content": "Go 1.23 is out.", "raw_content": "Go 1.23 is out."}]}
+
+
+@pytest.fixture
+def backend():
+    fake = FakeAsyncBackend()
+    web_search_module.set_async_search_client(fake)
+    configure_search_cache()
+    yield fake
+    web_search_module.set_async_search_client(None)
+    configure_search_cache()
 
 
 @pytest.mark.asyncio
-async def test_search_stops_at_budget_one():
+async def test_search_stops_at_budget_one(backend):
     deps = PitchWriterDeps(query_budget=2, max_results=1)
 
     # First search should succeed and decrement budget
     res1 = await deps.search("go", recency="m")
     assert res1["query_budget_remaining"] == 1
     assert "budget_exhausted" not in res1
+    assert [r["url"] for r in res1["results"]] == ["https://example.com/go"]
 
     # Next search should not be executed and should signal exhaustion
     res2 = await deps.search("go", recency="m")
     assert res2["budget_exhausted"] is True
     assert res2["query_budget_remaining"] == 1
+    assert backend.queries == ["go"]
@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from pitch_evolve.evolution import PromptEvolutionEngine
+from pitch_evolve.evolution.sampling import FitnessStats, undecided, z_score
+
+from helpers import uniform_feedback
+
+
+def test_fitness_stats_running_moments():
+    stats = FitnessStats()
+    for score in [10, 20, 30, 40]:
+        stats.add(score, f"pitch {score}", None)
+
+    assert stats.mean == 25
+    assert stats.variance == pytest.approx(166.666, rel=1e-3)
+    assert stats.pitch == "pitch 40"
+    low, high = stats.interval(z_score(0.95))
+    assert low < 25 < high
+
+
+def test_undecided_only_keeps_overlapping_candidates():
+    def stats(*scores):
+        s = FitnessStats()
+        for x in scores:
+            s.add(x, "", None)
+        return s
+
+    candidates = [stats(90, 91), stats(50, 52), stats(49, 53), stats(10, 11)]
+    # Top two are {0, 1}; 1 and 2 overlap, 0 and 3 are settled.
+    assert undecided(candidates, k=2, z=z_score(0.9)) == [1, 2]
+    assert undecided(candidates[:2], k=2, z=1.0) == []
+
+
+def _engine(tmp_path, name, draws, **kwargs):
+    """Generator noise around a per-prompt true quality of len(prompt) * 10."""
+    noise = random.Random(0)
+
+    def generate(prompt):
+        draws.append(prompt)
+        return f"{prompt}|{noise.random()}"
+
+    def judge(pitch):
+        prompt, jitter = pitch.split("|")
+        return uniform_feedback(len(prompt) * 10 + (float(jitter) - 0.5) * 30)
+
+    return PromptEvolutionEngine(
+        population=["a", "bbbbbbbb", "cc", "ddddddd", "eeeeee"],
+        generator=generate, evaluator=judge, mutation_rate=0.0,
+        rng=random.Random(3), output_dir=str(tmp_path / name), **kwargs,
+    )
+
+
+def test_adaptive_sampling_spends_fewer_samples_than_fixed(tmp_path):
+    draws = []
+    engine = _engine(tmp_path, "adaptive", draws, max_fitness_samples=8)
+    engine.evolve(generations=1)
+
+    report = engine.sampling_history[0]
+    assert report["samples"] == len(draws)
+    assert 2 * 5 <= report["samples"] < report["fixed_samples"] == 5 * 8
+    # Clear losers stop at the minimum; the two best prompts survive.
+    assert engine.fitness_stats["a"].n == 2
+    assert set(engine.history[0]) == {"bbbbbbbb", "ddddddd"}
+
+
+@pytest.mark.asyncio
+async def test_adaptive_sampling_async_matches_sync(tmp_path):
+    sync_draws, async_draws = [], []
+    engine = _engine(tmp_path, "sync", sync_draws, max_fitness_samples=6)
+    engine.evolve(generations=2)
+    async_engine = _engine(tmp_path, "async", async_draws,
+                           max_fitness_samples=6, concurrency=1)
+    await async_engine.evolve_async(generations=2)
+
+    assert async_engine.history == engine.history
+    assert {p: s.n for p, s in async_engine.fitness_stats.items()} == \
+        {p: s.n for p, s in engine.fitness_stats.items()}
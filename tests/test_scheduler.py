@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+from pydantic_ai import Agent
+from pydantic_ai.exceptions import ModelHTTPError
+from pydantic_ai.messages import ModelMessage, ModelResponse, TextPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from pitch_evolve.agents.scheduled_model import ScheduledModel
+from pitch_evolve.agents.scheduler import (
+    PRIORITY_JUDGE,
+    ModelLimits,
+    RequestScheduler,
+    priority,
+)
+
+
+def throttling_model(capacity: int):
+    """Fake model that answers 429 whenever more than ``capacity`` calls overlap."""
+    state = {"active": 0, "throttled": 0}
+
+    async def fake_model(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        state["active"] += 1
+        try:
+            if state["active"] > capacity:
+                state["throttled"] += 1
+                raise ModelHTTPError(429, "fake")
+            await asyncio.sleep(0.01)
+            return ModelResponse(parts=[TextPart("ok")])
+        finally:
+            state["active"] -= 1
+
+    return FunctionModel(fake_model), state
+
+
+@pytest.mark.asyncio
+async def test_scheduler_backs_off_on_throttling():
+    model, fake = throttling_model(capacity=2)
+    scheduler = RequestScheduler(
+        default_limits=ModelLimits(rpm=None, tpm=None, initial_concurrency=8),
+        backoff=0.001,
+    )
+    agent = Agent(ScheduledModel(model, scheduler=scheduler))
+
+    results = await asyncio.gather(*(agent.run("hi") for _ in range(20)))
+
+    assert all(r.output == "ok" for r in results)
+    stats = scheduler.stats()[model.model_name]
+    assert stats["throttled"] == fake["throttled"] > 0
+    assert stats["concurrency_limit"] < 8
+
+
+@pytest.mark.asyncio
+async def test_scheduler_admits_judging_first():
+    scheduler = RequestScheduler(default_limits=ModelLimits(
+        rpm=None, tpm=None, initial_concurrency=1, max_concurrency=1))
+    order = []
+    gate = asyncio.Event()
+
+    async def call(name):
+        order.append(name)
+        await gate.wait()
+
+    blocker = asyncio.create_task(scheduler.run("m", lambda: call("first")))
+    await asyncio.sleep(0)
+    generate = asyncio.create_task(scheduler.run("m", lambda: call("generate")))
+    with priority(PRIORITY_JUDGE):
+        judge = asyncio.create_task(scheduler.run("m", lambda: call("judge")))
+    await asyncio.sleep(0)
+    gate.set()
+    await asyncio.gather(blocker, generate, judge)
+
+    assert order == ["first", "judge", "generate"]
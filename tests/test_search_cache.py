@@ -0,0 +1,109 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from pitch_evolve.tools import web_search as web_search_module
+from pitch_evolve.tools.search_cache import SearchCache, configure_search_cache
+
+
+class FakeSearchBackend:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+
+    def search(self, query, max_results, time_range, include_raw_content):
+        self.calls += 1
+        time.sleep(self.delay)
+        return {"results": [
+            {"title": query, "content": "c", "raw_content": "r", "url": f"https://x/{i}"}
+            for i in range(max_results)
+        ]}
+
+
+@pytest.fixture
+def backend():
+    fake = FakeSearchBackend(delay=0.05)
+    web_search_module.set_search_client(fake)
+    configure_search_cache()
+    yield fake
+    web_search_module.set_search_client(None)
+    configure_search_cache()
+
+
+def test_near_identical_queries_hit_cache(backend):
+    first = web_search_module.web_search("Go community statistics", "m", 2)
+    second = web_search_module.web_search("  go community, statistics? ", "m", 2)
+    assert first == second
+    assert backend.calls == 1
+    stats = web_search_module.get_search_cache().stats()
+    assert stats["hits"] == 1 and stats["saved_latency_s"] > 0
+
+
+def test_concurrent_queries_are_coalesced(backend):
+    threads = [
+        threading.Thread(target=web_search_module.web_search, args=("go", "w", 3))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert backend.calls == 1
+    assert web_search_module.get_search_cache().coalesced == 4
+
+
+def test_entries_expire_and_persist(tmp_path):
+    path = str(tmp_path / "search.json")
+    cache = SearchCache(path=path, ttl={"d": 0})
+    cache.get_or_fetch("go", "d", 1, lambda: ["stale"])
+    cache.get_or_fetch("go", "m", 1, lambda: ["fresh"])
+    assert cache.get_or_fetch("go", "d", 1, lambda: ["refetched"]) == ["refetched"]
+
+    cache.flush()
+    reloaded = SearchCache(path=path)
+    assert reloaded.get_or_fetch("go", "m", 1, lambda: ["missing"]) == ["fresh"]
+
+
+def test_persisted_cache_batches_writes(tmp_path):
+    path = tmp_path / "search.json"
+    cache = SearchCache(path=str(path), flush_interval=60)
+    for i in range(5):
+        cache.get_or_fetch(f"query {i}", "m", 1, lambda: [i])
+    # The first insert is written at once; the rest wait for a flush.
+    assert len(json.loads(path.read_text())) == 1
+    cache.flush()
+    assert len(json.loads(path.read_text())) == 5
+
+
+def test_async_lookups_share_a_search_running_in_a_thread():
+    cache = SearchCache()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow_fetch():
+        calls.append("sync")
+        started.set()
+        release.wait()
+        return ["shared"]
+
+    async def fetch():
+        calls.append("async")
+        return ["own"]
+
+    thread = threading.Thread(target=cache.get_or_fetch, args=("go", "m", 1, slow_fetch))
+    thread.start()
+    started.wait()
+
+    async def lookup():
+        pending = asyncio.ensure_future(cache.aget_or_fetch("Go!", "m", 1, fetch))
+        await asyncio.sleep(0.01)
+        release.set()
+        return await pending
+
+    assert asyncio.run(lookup()) == ["shared"]
+    thread.join()
+    assert calls == ["sync"]
+    assert (cache.misses, cache.coalesced) == (1, 1)
@@ -0,0 +1,82 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from pitch_evolve.tools import web_search as web_search_module
+from pitch_evolve.tools.search_cache import configure_search_cache
+from pitch_evolve.tools.search_client import AsyncTavilySearch
+
+
+class StubSearchHandler(BaseHTTPRequestHandler):
+    failures_left = 1
+    delay = 0.2
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if StubSearchHandler.failures_left > 0:
+            StubSearchHandler.failures_left -= 1
+            self.send_response(503)
+            self.end_headers()
+            return
+        time.sleep(self.delay)
+        payload = json.dumps({"results": [
+            {"title": body["query"], "content": "c", "raw_content": "r",
+             "url": f"https://example.com/{body['query']}"},
+        ]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_backend():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubSearchHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    StubSearchHandler.failures_left = 1
+    client = AsyncTavilySearch(
+        api_key="test", base_url=f"http://127.0.0.1:{server.server_port}",
+        backoff=0.01,
+    )
+    web_search_module.set_async_search_client(client)
+    configure_search_cache()
+    yield client
+    web_search_module.set_async_search_client(None)
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_async_search_retries_and_runs_in_parallel(stub_backend):
+    results = await web_search_module.web_search_async("warmup", "m", 1)
+    assert results[0]["title"] == "warmup"
+
+    start = time.perf_counter()
+    batches = await asyncio.gather(*(
+        web_search_module.web_search_async(q, "m", 1) for q in ("a", "b", "c")
+    ))
+    elapsed = time.perf_counter() - start
+    assert [b[0]["title"] for b in batches] == ["a", "b", "c"]
+    assert elapsed < 3 * StubSearchHandler.delay
+    await stub_backend.aclose()
+
+
+def test_client_closes_with_its_event_loop(stub_backend):
+    async def search():
+        await stub_backend.search("q", max_results=1, time_range="m")
+        return await stub_backend._get_client()
+
+    first = asyncio.run(search())
+    second = asyncio.run(search())
+
+    assert first is not second
+    assert first.is_closed and second.is_closed
@@ -0,0 +1,128 @@
+import asyncio
+import json
+import os
+from contextlib import ExitStack
+
+import pytest
+from pydantic_ai.models.test import TestModel
+
+from pitch_evolve.agents import usage
+from pitch_evolve.agents.llm_as_judge import get_judge_agent
+from pitch_evolve.agents.llm_as_judge_mutator import get_mutator_agent, get_offspring_agent
+from pitch_evolve.agents.pitch_writer import PitchWriterDeps, get_pitch_writer_agent
+from pitch_evolve.agents.scheduled_model import ScheduledModel
+from pitch_evolve.agents.scheduler import ModelLimits, RequestScheduler
+from pitch_evolve.cli import build_job_handlers, validate_job_params
+from pitch_evolve.service import PitchService
+
+
+async def _request(port, method, path, payload=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(body)}\r\n\r\n"
+                 .encode() + body)
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, data = raw.partition(b"\r\n\r\n")
+    code = int(head.split()[1])
+    return code, (json.loads(data) if b"application/json" in head else data.decode())
+
+
+@pytest.mark.asyncio
+async def test_service_queues_runs_and_reports_jobs():
+    release = asyncio.Event()
+    seen = []
+
+    async def pitch(params):
+        seen.append(params["job_id"])
+        await release.wait()
+        if params["prompt"] == "boom":
+            raise RuntimeError("writer failed")
+        return {"output": params["prompt"].upper()}
+
+    service = PitchService({"pitch": pitch}, workers=1, max_queue=2)
+    server = await service.listen(port=0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        code, first = await _request(port, "POST", "/jobs", {"prompt": "go"})
+        assert code == 202
+        await asyncio.sleep(0.01)  # the single worker picks up the first job
+        assert (await _request(port, "POST", "/jobs", {"prompt": "boom"}))[0] == 202
+        assert (await _request(port, "POST", "/jobs", {"prompt": "rust"}))[0] == 202
+        code, body = await _request(port, "POST", "/jobs", {"prompt": "zig"})
+        assert code == 429 and "queue is full" in body["error"]
+        assert (await _request(port, "POST", "/jobs", {"kind": "nope", "prompt": "x"}))[0] == 400
+        assert (await _request(port, "POST", "/jobs", {}))[0] == 400
+
+        code, status = await _request(port, "GET", "/status")
+        assert (status["queue_depth"], status["running"], status["workers"]) == (2, 1, 1)
+
+        release.set()
+        for _ in range(100):
+            if service.completed + service.failed == 3:
+                break
+            await asyncio.sleep(0.01)
+        code, job = await _request(port, "GET", f"/jobs/{first['id']}")
+        assert (code, job["status"], job["result"]) == (200, "done", {"output": "GO"})
+        failed = [j for j in service.jobs.values() if j.status == "failed"]
+        assert len(failed) == 1 and "writer failed" in failed[0].error
+        assert seen == ["job-1", "job-2", "job-3"]
+
+        code, status = await _request(port, "GET", "/status")
+        assert (status["completed"], status["failed"], status["queue_depth"]) == (2, 1, 0)
+        assert status["jobs_last_minute"] == 3
+        code, text = await _request(port, "GET", "/metrics")
+        assert 'pitch_evolve_jobs_total{status="done"} 2' in text
+        assert (await _request(port, "GET", "/jobs/job-99"))[0] == 404
+    finally:
+        server.close()
+        await service.stop()
+
+
+@pytest.mark.asyncio
+async def test_evolve_jobs_record_usage_separately(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    server_tracker = usage.UsageTracker()
+    monkeypatch.setattr(usage, "_tracker", server_tracker)
+    scheduler = RequestScheduler(default_limits=ModelLimits(rpm=None, tpm=None))
+    with ExitStack() as stack:
+        for name, agent in (("writer", get_pitch_writer_agent), ("judge", get_judge_agent),
+                            ("mutator", get_mutator_agent), ("offspring", get_offspring_agent)):
+            stack.enter_context(agent().override(model=ScheduledModel(
+                TestModel(call_tools=[]), scheduler=scheduler, name=name)))
+        service = PitchService(build_job_handlers(PitchWriterDeps()), workers=2)
+        await service.start()
+        jobs = [service.submit("evolve", {"prompt": "p", "population": 2, "generations": 2})
+                for _ in range(2)]
+        await service._queue.join()
+        await service.stop()
+
+    for job in jobs:
+        assert job.status == "done", job.error
+        assert job.result["output_dir"] == os.path.join("output", "jobs", job.id)
+        with open(os.path.join(job.result["output_dir"], "usage.json")) as f:
+            written = json.load(f)
+        # Only this job's calls, labelled with this job's generations.
+        assert written["total_tokens"] == job.usage["tokens"] > 0
+        assert set(written["by_generation"]) == {"1", "2"}
+    assert server_tracker.total_tokens == sum(j.usage["tokens"] for j in jobs)
+
+
+@pytest.mark.asyncio
+async def test_service_rejects_bad_job_params():
+    deps = PitchWriterDeps()
+    service = PitchService(build_job_handlers(deps), workers=1,
+                           validate=validate_job_params(deps))
+    server = await service.listen(port=0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        for params in ({"max_results": 0}, {"query_budget": "lots"},
+                       {"kind": "evolve", "population": 10_000},
+                       {"kind": "evolve", "generations": "3"}):
+            code, body = await _request(port, "POST", "/jobs", {"prompt": "p", **params})
+            assert code == 400, params
+        assert not service.jobs and service._queue.qsize() == 0
+    finally:
+        server.close()
+        await service.stop()
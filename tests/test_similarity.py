@@ -0,0 +1,61 @@
+import random
+
+from pitch_evolve.evolution import PromptEvolutionEngine
+from pitch_evolve.evolution.similarity import SimilarityIndex
+
+from helpers import length_feedback
+
+BASE = ("Write a persuasive pitch for the Go community meetup. Include one recent "
+        "statistic about Go adoption and end with a clear call to action.")
+
+
+def test_groups_exact_and_near_duplicates():
+    texts = [BASE, BASE, BASE + " Keep it short.", "Summarise the Rust release notes.", ""]
+    index = SimilarityIndex(texts)
+
+    assert index.similarity()[0, 1] > 0.999
+    assert index.groups(0.8) == [0, 0, 0, 3, 4]
+    assert index.groups(0.999) == [0, 0, 2, 3, 4]
+
+
+def test_engine_shares_evaluations_between_duplicates(tmp_path):
+    judged = []
+
+    def judge(pitch):
+        judged.append(pitch)
+        return length_feedback(pitch)
+
+    population = [BASE, BASE, BASE + " Keep it short.", "Summarise the Rust release notes."]
+    engine = PromptEvolutionEngine(
+        population=list(population), generator=lambda p: p, evaluator=judge,
+        mutator=lambda f, pitch, prompt: prompt + " v2", mutation_rate=0.0,
+        rng=random.Random(0), similarity_threshold=0.8,
+        output_dir=str(tmp_path),
+    )
+    engine.evolve(generations=1)
+
+    assert judged == [BASE, "Summarise the Rust release notes."]
+    report = engine.dedup_history[0]
+    assert (report["distinct"], report["exact_duplicates"], report["near_duplicates"]) == \
+        (2, 1, 1)
+    assert len(engine.history[0]) == len(population)
+
+
+def test_collapsed_population_gets_diversity_mutations(tmp_path):
+    mutated = []
+
+    def mutate(feedback, pitch, prompt):
+        mutated.append(prompt)
+        return f"{prompt} Variant {len(mutated)}."
+
+    engine = PromptEvolutionEngine(
+        population=[BASE] * 6, generator=lambda p: p, evaluator=length_feedback,
+        mutator=mutate, mutation_rate=0.0, rng=random.Random(0),
+        similarity_threshold=0.999, min_diversity=0.5, output_dir=str(tmp_path),
+    )
+    engine.evolve(generations=1)
+
+    assert engine.dedup_history[0]["distinct"] == 1
+    assert engine.dedup_history[0]["injected"] == 2
+    assert len(set(engine.history[0])) == 3
+    assert engine.history[0][0] == BASE
@@ -0,0 +1,162 @@
+import asyncio
+import random
+from contextlib import asynccontextmanager
+
+import pytest
+from pydantic_ai import Agent
+from pydantic_ai.models.function import DeltaToolCall, FunctionModel
+from pydantic_ai.usage import Usage
+
+from pitch_evolve.agents import usage
+from pitch_evolve.agents.llm_as_judge import JudgeFeedback
+from pitch_evolve.agents.pitch_writer import PitchWriterDeps, get_pitch_writer_agent, stream_pitch
+from pitch_evolve.agents.scheduled_model import ScheduledModel
+from pitch_evolve.agents.scheduler import ModelLimits, RequestScheduler
+from pitch_evolve.cli import stream_pitch_to_stdout
+from pitch_evolve.evolution import FitnessCache, PromptEvolutionEngine, RunJournal
+from pitch_evolve.evolution.cache import make_key
+
+from helpers import length_feedback
+
+
+def _engine(tmp_path, stream, judged, **kwargs):
+    def evaluate(pitch: str) -> JudgeFeedback:
+        judged.append(pitch)
+        return length_feedback(pitch)
+
+    return PromptEvolutionEngine(
+        population=["short", "runaway", "slow", "fine"], generator=lambda p: p,
+        evaluator=evaluate, mutator=lambda f, pitch, prompt: prompt,
+        rng=random.Random(0), stream_generator=stream, output_dir=str(tmp_path), **kwargs)
+
+
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_over_budget_generations_are_cancelled_and_fail(tmp_path, concurrency):
+    streamed = []
+    closed = []
+
+    async def stream(prompt: str):
+        try:
+            chunks = 50 if prompt == "runaway" else 3
+            for n in range(chunks):
+                await asyncio.sleep(1.0 if prompt == "slow" else 0.001)
+                streamed.append(prompt)
+                yield prompt * (n + 1)
+        finally:
+            closed.append(prompt)
+
+    judged = []
+    engine = _engine(tmp_path, stream, judged, max_pitch_chars=40,
+                     generation_timeout=0.5, concurrency=concurrency)
+    if concurrency > 1:
+        asyncio.run(engine.evolve_async(generations=1))
+    else:
+        engine.evolve(generations=1)
+
+    reasons = {r["prompt"]: r["reason"] for r in engine.aborted_generations}
+    assert set(reasons) == {"runaway", "slow"}
+    assert "characters" in reasons["runaway"] and "after 0.5s" in reasons["slow"]
+    # Cancelled streams stop early and are closed; failures are never judged.
+    assert streamed.count("runaway") == 6
+    assert sorted(closed) == ["fine", "runaway", "short", "slow"]
+    assert sorted(judged) == ["finefinefine", "shortshortshort"]
+    assert engine.objectives["runaway"]["score"] == 0.0
+    assert engine.objectives["slow"]["score"] == 0.0
+
+
+def test_length_budget_applies_without_streaming(tmp_path):
+    judged = []
+    engine = _engine(tmp_path, None, judged, max_pitch_chars=5, concurrency=1)
+    engine.evolve(generations=1)
+
+    assert [r["prompt"] for r in engine.aborted_generations] == ["runaway"]
+    assert "runaway" not in judged
+
+
+def _structured_stream(chunks):
+    async def stream(messages, info):
+        name = info.output_tools[0].name
+        for n, chunk in enumerate(chunks):
+            yield {0: DeltaToolCall(name=name if n == 0 else None, json_args=chunk)}
+    return FunctionModel(stream_function=stream)
+
+
+_PITCH_CHUNKS = ['{"topic": "t", "output": "Hel', 'lo wor', 'ld", "sources": {"1": "s"}}']
+
+
+@pytest.mark.asyncio
+async def test_stream_pitch_yields_growing_partial_output():
+    with get_pitch_writer_agent().override(model=_structured_stream(_PITCH_CHUNKS)):
+        outputs = [o.output async for o in stream_pitch("p", PitchWriterDeps(), debounce_by=None)]
+
+    assert outputs[:3] == ["Hel", "Hello wor", "Hello world"]
+    assert outputs[-1] == "Hello world"
+
+
+@pytest.mark.asyncio
+async def test_pitch_stream_prints_text_as_it_arrives(capsys):
+    with get_pitch_writer_agent().override(model=_structured_stream(_PITCH_CHUNKS)):
+        await stream_pitch_to_stdout("p", PitchWriterDeps())
+
+    out = capsys.readouterr().out
+    assert out.startswith("Hello world\n")
+    assert '"1": "s"' in out and "first token after" in out
+
+
+class _LateUsageModel(FunctionModel):
+    """Reports usage only with the final chunk, like OpenAI's ``include_usage``."""
+
+    @asynccontextmanager
+    async def request_stream(self, messages, model_settings, model_request_parameters):
+        async with super().request_stream(
+                messages, model_settings, model_request_parameters) as response:
+            response.usage = Usage
+            yield response
+
+
+@pytest.mark.asyncio
+async def test_cancelled_stream_records_estimated_usage(monkeypatch):
+    tracker = usage.UsageTracker()
+    monkeypatch.setattr(usage, "_tracker", tracker)
+
+    async def words(messages, info):
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            yield "word " * 10
+
+    scheduler = RequestScheduler(default_limits=ModelLimits(rpm=None, tpm=None))
+    agent = Agent(ScheduledModel(_LateUsageModel(stream_function=words),
+                                 scheduler=scheduler, name="writer"))
+
+    async def consume():
+        async with agent.run_stream("write a long pitch") as result:
+            async for _ in result.stream_text(delta=True, debounce_by=None):
+                pass
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(consume(), 0.1)
+
+    (record,) = tracker.records
+    assert record.agent == "writer"
+    assert record.request_tokens > 0
+    assert 0 < record.response_tokens < 100 * 10
+
+
+def test_aborted_generations_are_not_cached_or_journaled(tmp_path):
+    calls = []
+
+    async def stream(prompt: str):
+        calls.append(prompt)
+        yield prompt * 100
+
+    journal = RunJournal(str(tmp_path / "journal.jsonl"))
+    engine = _engine(tmp_path, stream, [], max_pitch_chars=40, cache=FitnessCache(),
+                     journal=journal)
+    assert asyncio.run(engine._generate_async("runaway")) == ""
+    assert engine._generate("runaway") == ""
+    journal.close()
+
+    assert calls == ["runaway", "runaway"]
+    assert len(engine.aborted_generations) == 2
+    assert RunJournal(str(tmp_path / "journal.jsonl"), resume=True).replay(
+        make_key("generate", "runaway", context=None)) == (False, None)
@@ -0,0 +1,55 @@
+import random
+
+from pitch_evolve.agents.llm_as_judge import JudgeFeedback
+from pitch_evolve.evolution import PromptEvolutionEngine
+from pitch_evolve.evolution.surrogate import SurrogateModel, spearman
+
+from helpers import uniform_feedback
+
+
+def _score(prompt: str) -> float:
+    return min(100, 40 + 15 * prompt.count("statistic"))
+
+
+def _feedback(pitch: str) -> JudgeFeedback:
+    return uniform_feedback(_score(pitch))
+
+
+def _prompt(rng: random.Random) -> str:
+    return ("Write a pitch." + " Cite one statistic." * rng.randint(0, 3)
+            + " Keep it warm." * rng.randint(0, 2))
+
+
+def test_spearman_and_surrogate_ranking():
+    assert spearman([1, 2, 3], [10, 20, 30]) == 1.0
+    assert spearman([1, 2, 3], [3, 2, 1]) == -1.0
+    assert spearman([1, 1], [1, 2]) == 0.0
+
+    rng = random.Random(0)
+    train = [_prompt(rng) for _ in range(30)]
+    test = [_prompt(rng) for _ in range(20)]
+    model = SurrogateModel()
+    assert model.predict(["anything"]) == [0.0]
+    model.update(train, [_score(p) for p in train])
+    assert model.n == 30
+    assert spearman(model.predict(test), [_score(p) for p in test]) > 0.8
+
+
+def test_engine_skips_mutants_the_surrogate_rates_low(tmp_path):
+    rng = random.Random(1)
+    engine = PromptEvolutionEngine(
+        population=[_prompt(rng) for _ in range(8)], generator=lambda p: p,
+        evaluator=_feedback, mutator=lambda f, pitch, prompt: _prompt(rng),
+        mutation_rate=1.0, tournament_size=2, rng=random.Random(2),
+        surrogate=SurrogateModel(), surrogate_min_samples=4,
+        surrogate_min_correlation=0.0, output_dir=str(tmp_path),
+    )
+    engine.evolve(generations=4)
+
+    history = engine.surrogate_history
+    assert [r["generation"] for r in history] == [1, 2, 3, 4]
+    assert history[0]["spearman"] is None and history[0]["skipped"] == 0
+    assert any(r["spearman"] is not None for r in history)
+    skipped = sum(r["skipped"] for r in history)
+    assert skipped > 0
+    assert all(r["evaluated"] >= engine.tournament_size for r in history)